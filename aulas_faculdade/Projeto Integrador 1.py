@@ -1,3 +1,12 @@
+from collections import Counter
+import unicodedata
+
+
+# Chave de comparação: sem acentos e com casefold ("Ação" -> "acao")
+def normalizar(texto):
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).casefold()
+
 # Classe Livro
 class Livro:
     def __init__(self, titulo, autor, ano, copias):
@@ -15,7 +24,7 @@ class Usuario:
         self.nome = nome
         self.id_usuario = id_usuario
         self.contato = contato
-        self.livros_emprestados = []
+        self.livros_emprestados = Counter()  # título -> cópias emprestadas
 
     def __str__(self):
         return f"{self.nome} (ID: {self.id_usuario})"
@@ -25,26 +34,35 @@ class Biblioteca:
     def __init__(self):
         self.livros = []
         self.usuarios = []
+        # Índices: título (casefold) -> livro e ID -> usuário; em caso de repetição vale
+        # o primeiro cadastrado, como na busca sequencial
+        self.livros_por_titulo = {}
+        self.usuarios_por_id = {}
+        # Chaves de busca (título, autor) normalizadas no cadastro, na ordem de self.livros
+        self.chaves_busca = []
 
     def cadastrar_livro(self, livro):
         self.livros.append(livro)
+        self.livros_por_titulo.setdefault(livro.titulo.casefold(), livro)
+        self.chaves_busca.append((normalizar(livro.titulo), normalizar(livro.autor)))
 
     def cadastrar_usuario(self, usuario):
         self.usuarios.append(usuario)
+        self.usuarios_por_id.setdefault(usuario.id_usuario, usuario)
 
     def encontrar_livro(self, titulo):
-        for livro in self.livros:
-            if livro.titulo.lower() == titulo.lower():
-                return livro
-        return None
+        return self.livros_por_titulo.get(titulo.casefold())
+
+    def encontrar_usuario(self, id_usuario):
+        return self.usuarios_por_id.get(id_usuario)
 
     def emprestar_livro(self, id_usuario, titulo):
-        usuario = next((u for u in self.usuarios if u.id_usuario == id_usuario), None)
+        usuario = self.encontrar_usuario(id_usuario)
         livro = self.encontrar_livro(titulo)
         if usuario and livro:
             if livro.copias > 0:
                 livro.copias -= 1
-                usuario.livros_emprestados.append(livro.titulo)
+                usuario.livros_emprestados[livro.titulo] += 1
                 print(f"{livro.titulo} emprestado com sucesso para {usuario.nome}.")
             else:
                 print("Livro indisponível para empréstimo.")
@@ -52,18 +70,22 @@ class Biblioteca:
             print("Usuário ou livro não encontrado.")
 
     def devolver_livro(self, id_usuario, titulo):
-        usuario = next((u for u in self.usuarios if u.id_usuario == id_usuario), None)
+        usuario = self.encontrar_usuario(id_usuario)
         livro = self.encontrar_livro(titulo)
-        if usuario and livro and titulo in usuario.livros_emprestados:
+        if usuario and livro and usuario.livros_emprestados[livro.titulo] > 0:
             livro.copias += 1
-            usuario.livros_emprestados.remove(titulo)
+            usuario.livros_emprestados[livro.titulo] -= 1
+            if not usuario.livros_emprestados[livro.titulo]:
+                del usuario.livros_emprestados[livro.titulo]
             print(f"{titulo} devolvido com sucesso.")
         else:
             print("Erro na devolução. Verifique os dados.")
 
     def consultar_livros(self, filtro=None):
-        for livro in self.livros:
-            if not filtro or filtro.lower() in livro.titulo.lower() or filtro.lower() in livro.autor.lower():
+        # Sem acentos e sem diferenciar maiúsculas: "acao" encontra "Ação"
+        chave = normalizar(filtro) if filtro else None
+        for livro, (titulo, autor) in zip(self.livros, self.chaves_busca):
+            if not chave or chave in titulo or chave in autor:
                 print(livro)
 
     def relatorios(self):
@@ -126,4 +148,5 @@ def menu():
         else:
             print("Opção inválida!")
 
-menu()
+if __name__ == '__main__':
+    menu()
@@ -17,10 +17,30 @@ Este módulo contém as classes e a interface de console para:
 - Empréstimo e devolução de livros
 - Consulta de livros
 - Geração de relatórios
+- Execução não interativa de scripts de operações (modo em lote)
+
+Uso:
+    python "Projeto Integrador 2.py"                          (menu interativo)
+    python "Projeto Integrador 2.py" --script operacoes.tsv   (modo em lote; '-' lê da entrada padrão)
 """
 
-from datetime import date
-from typing import Dict, List, Tuple
+import argparse
+import csv
+import gc
+import heapq
+import json
+import re
+import sys
+import time
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, timedelta
+from itertools import islice, repeat
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 
 # -----------------------------------------------------------
 # Definição de Exceções Customizadas
@@ -72,11 +92,16 @@ class Livro:
         isbn (str): código identificador único do livro
         total_copias (int): número total de cópias existentes
         copias_disponiveis (int): número de cópias disponíveis para empréstimo
+
+    Usa __slots__ para não alocar um __dict__ por instância; o nome do autor é
+    internado, pois se repete entre muitos livros do acervo.
     """
 
+    __slots__ = ('titulo', 'autor', 'ano', 'isbn', 'total_copias', 'copias_disponiveis')
+
     def __init__(self, titulo: str, autor: str, ano: int, isbn: str, total_copias: int):
         self.titulo = titulo
-        self.autor = autor
+        self.autor = sys.intern(autor)
         self.ano = ano
         self.isbn = isbn
         self.total_copias = total_copias
@@ -121,31 +146,62 @@ class Usuario:
         contato (str): informação de contato (telefone ou e-mail)
         emprestimos_ativos (Dict[str, date]): dicionário com ISBN do livro como chave
                                               e data do empréstimo como valor
+
+    Usa __slots__ e só aloca o dicionário de empréstimos no primeiro empréstimo (ou
+    no primeiro acesso a emprestimos_ativos); a partir daí o dicionário é sempre o
+    mesmo.
     """
 
+    __slots__ = ('nome', 'id_usuario', 'contato', '_emprestimos')
+
     def __init__(self, nome: str, id_usuario: str, contato: str):
         self.nome = nome
         self.id_usuario = id_usuario
         self.contato = contato
-        self.emprestimos_ativos: Dict[str, date] = {}
+        self._emprestimos: Optional[Dict[str, date]] = None
+
+    @property
+    def emprestimos_ativos(self) -> Dict[str, date]:
+        """
+        Empréstimos ativos do usuário (ISBN -> data do empréstimo).
+        """
+        emprestimos = self._emprestimos
+        if emprestimos is None:
+            emprestimos = self._emprestimos = {}
+        return emprestimos
+
+    @emprestimos_ativos.setter
+    def emprestimos_ativos(self, emprestimos: Dict[str, date]):
+        self._emprestimos = emprestimos
+
+    def possui_emprestimos(self) -> bool:
+        """
+        Indica se o usuário tem empréstimos ativos, sem alocar o dicionário.
+        """
+        return bool(self._emprestimos)
 
     def registrar_emprestimo(self, isbn: str, data_emprestimo: date):
         """
         Registra o empréstimo ativo de um livro para este usuário.
         Levanta EmprestimoDuplicadoError se o usuário já tiver o livro emprestado.
         """
-        if isbn in self.emprestimos_ativos:
+        emprestimos = self._emprestimos
+        if emprestimos is None:
+            self._emprestimos = {isbn: data_emprestimo}
+            return
+        if isbn in emprestimos:
             raise EmprestimoDuplicadoError(f"O usuário '{self.nome}' já possui o livro com ISBN {isbn}.")
-        self.emprestimos_ativos[isbn] = data_emprestimo
+        emprestimos[isbn] = data_emprestimo
 
     def registrar_devolucao(self, isbn: str):
         """
         Remove o registro de empréstimo ativo de um livro para este usuário.
         Levanta DevolucaoInvalidaError se o ISBN não constar nos empréstimos ativos.
         """
-        if isbn not in self.emprestimos_ativos:
+        emprestimos = self._emprestimos
+        if emprestimos is None or isbn not in emprestimos:
             raise DevolucaoInvalidaError(f"O usuário '{self.nome}' não possui o livro com ISBN {isbn} emprestado.")
-        del self.emprestimos_ativos[isbn]
+        del emprestimos[isbn]
 
     def __str__(self) -> str:
         """
@@ -154,6 +210,831 @@ class Usuario:
         return f"ID: {self.id_usuario} | Nome: {self.nome} | Contato: {self.contato}"
 
 
+# -----------------------------------------------------------
+# Índices Auxiliares de Busca
+# -----------------------------------------------------------
+_PALAVRA = re.compile(r"\w+")
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Forma de comparação de um texto: sem acentos e sem diferenciar maiúsculas de
+    minúsculas (casefold), de modo que "Ação" e "acao" sejam iguais.
+    """
+    if texto.isascii():
+        return texto.casefold()
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in decomposto if not unicodedata.combining(c)).casefold()
+
+
+def _distancia_ate_1(a: str, b: str) -> bool:
+    """
+    Indica se a distância de edição entre a e b (inserção, remoção, troca ou
+    transposição de letras vizinhas) é no máximo 1.
+    """
+    if a == b:
+        return True
+    na, nb = len(a), len(b)
+    if abs(na - nb) > 1:
+        return False
+    i = 0
+    while i < na and i < nb and a[i] == b[i]:
+        i += 1
+    if na == nb:
+        if a[i + 1:] == b[i + 1:]:
+            return True
+        return i + 1 < na and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+    if na > nb:
+        return a[i + 1:] == b[i:]
+    return a[i:] == b[i + 1:]
+
+
+class IndiceTrigramas:
+    """
+    Índice invertido de trigramas para busca por substring sem diferenciar
+    maiúsculas de minúsculas nem acentos.
+
+    Cada texto é guardado já normalizado (normalizar_texto) e recebe um identificador
+    sequencial; cada trigrama aponta para o conjunto de identificadores que o contêm.
+    Uma consulta intersecta as listas de postagem dos seus trigramas e confirma os
+    candidatos com o operador `in`, preservando a semântica de
+    `normalizar_texto(termo) in normalizar_texto(texto)` e a ordem de cadastro.
+
+    Atributos:
+        chaves (List[str]): chave (ISBN) de cada documento, indexada pelo identificador
+        textos (List[str]): texto normalizado de cada documento
+        postagens (Dict[str, Set[int]]): mapeamento de trigrama para identificadores
+    """
+
+    TAMANHO_GRAMA = 3
+
+    def __init__(self):
+        self.chaves: List[str] = []
+        self.textos: List[str] = []
+        self.postagens: Dict[str, Set[int]] = {}
+
+    @classmethod
+    def _gramas(cls, texto: str) -> Set[str]:
+        """
+        Retorna o conjunto de trigramas distintos de um texto já normalizado.
+        """
+        n = cls.TAMANHO_GRAMA
+        return {texto[i:i + n] for i in range(len(texto) - n + 1)}
+
+    def adicionar(self, chave: str, texto: str):
+        """
+        Indexa o texto associado à chave informada.
+        """
+        doc_id = len(self.chaves)
+        texto_normalizado = normalizar_texto(texto)
+        self.chaves.append(chave)
+        self.textos.append(texto_normalizado)
+        postagens = self.postagens
+        for grama in self._gramas(texto_normalizado):
+            lista = postagens.get(grama)
+            if lista is None:
+                postagens[grama] = {doc_id}
+            else:
+                lista.add(doc_id)
+
+    def buscar(self, termo: str) -> List[str]:
+        """
+        Retorna, na ordem de cadastro, as chaves cujo texto contém o termo informado.
+        """
+        termo_normalizado = normalizar_texto(termo)
+        textos = self.textos
+        if len(termo_normalizado) < self.TAMANHO_GRAMA:
+            # Termos curtos não formam trigramas: percorre os textos já normalizados
+            return [self.chaves[i] for i, texto in enumerate(textos) if termo_normalizado in texto]
+
+        listas = []
+        for grama in self._gramas(termo_normalizado):
+            lista = self.postagens.get(grama)
+            if not lista:
+                return []
+            listas.append(lista)
+        listas.sort(key=len)
+        candidatos = listas[0].intersection(*listas[1:])
+
+        # A interseção garante só a presença dos trigramas; confirma a substring
+        return [self.chaves[i] for i in sorted(candidatos) if termo_normalizado in textos[i]]
+
+
+class IndiceAproximado:
+    """
+    Índice de palavras para busca tolerante a erros de digitação, com relevância.
+
+    Cada texto (já normalizado) é quebrado em palavras, e cada palavra aponta para o
+    conjunto dos documentos que a contêm. As palavras com pelo menos TAMANHO_MINIMO
+    letras entram também em um dicionário de deleções simétricas: cada variante obtida
+    removendo uma letra aponta para as palavras que a geram. Assim, as palavras do
+    vocabulário a até uma edição da consultada (troca, inserção, remoção ou
+    transposição de letras vizinhas) são encontradas consultando apenas a própria
+    palavra e suas variantes, sem percorrer o vocabulário.
+
+    Atributos:
+        chaves (List[str]): chave (ISBN) de cada documento, indexada pelo identificador
+        palavras (List[Tuple[str, ...]]): palavras distintas de cada documento
+        postagens (Dict[str, Set[int]]): mapeamento de palavra para identificadores
+        delecoes (Dict[str, List[str]]): variante com uma letra a menos -> palavras de origem
+        por_tamanho (Dict[int, Set[int]]): identificadores por quantidade de palavras
+    """
+
+    TAMANHO_MINIMO = 4
+    QUALIDADE_EXATA = 1.0
+    QUALIDADE_APROXIMADA = 0.5
+    PESO_COBERTURA = 0.1
+    RAZAO_INTERSECAO = 8
+
+    def __init__(self):
+        self.chaves: List[str] = []
+        self.palavras: List[Tuple[str, ...]] = []
+        self.postagens: Dict[str, Set[int]] = {}
+        self.delecoes: Dict[str, List[str]] = {}
+        self.por_tamanho: Dict[int, Set[int]] = {}
+
+    @staticmethod
+    def _variantes(palavra: str) -> Set[str]:
+        return {palavra[:i] + palavra[i + 1:] for i in range(len(palavra))}
+
+    def adicionar(self, chave: str, texto_normalizado: str):
+        """
+        Indexa um documento cujo texto já passou por normalizar_texto.
+        """
+        identificador = len(self.chaves)
+        self.chaves.append(chave)
+        postagens = self.postagens
+        palavras = []
+        for palavra in dict.fromkeys(_PALAVRA.findall(texto_normalizado)):
+            # Internada, a mesma string é compartilhada por todos os documentos que a contêm
+            palavra = sys.intern(palavra)
+            conjunto = postagens.get(palavra)
+            if conjunto is None:
+                postagens[palavra] = {identificador}
+                if len(palavra) >= self.TAMANHO_MINIMO:
+                    for variante in self._variantes(palavra):
+                        self.delecoes.setdefault(variante, []).append(palavra)
+            else:
+                conjunto.add(identificador)
+            palavras.append(palavra)
+        self.palavras.append(tuple(palavras))
+        self.por_tamanho.setdefault(len(palavras), set()).add(identificador)
+
+    def expandir(self, palavra: str) -> Dict[str, float]:
+        """
+        Retorna as palavras do vocabulário a até uma edição de `palavra` (normalizada),
+        com a qualidade de cada correspondência.
+        """
+        postagens = self.postagens
+        encontradas: Dict[str, float] = {}
+        if palavra in postagens:
+            encontradas[palavra] = self.QUALIDADE_EXATA
+        if len(palavra) < self.TAMANHO_MINIMO:
+            return encontradas
+        variantes = self._variantes(palavra)
+        for variante in variantes:
+            # Vocabulário com uma letra a menos que a palavra consultada
+            if variante in postagens and variante not in encontradas:
+                encontradas[variante] = self.QUALIDADE_APROXIMADA
+        variantes.add(palavra)
+        for variante in variantes:
+            for candidata in self.delecoes.get(variante, ()):
+                # Duas deleções em posições distintas podem estar a duas edições: confirma
+                if candidata not in encontradas and _distancia_ate_1(palavra, candidata):
+                    encontradas[candidata] = self.QUALIDADE_APROXIMADA
+        return encontradas
+
+    def _documentos(self, expansao: Dict[str, float]) -> List[Tuple[float, Set[int]]]:
+        """
+        Retorna [(qualidade, documentos)] das correspondências exatas e das aproximadas.
+        Um documento com as duas fica só nas exatas. Os conjuntos podem ser os do
+        próprio índice e não devem ser alterados.
+        """
+        postagens = self.postagens
+        exatos: Set[int] = set()
+        aproximadas = []
+        for palavra, qualidade in expansao.items():
+            if qualidade == self.QUALIDADE_EXATA:
+                exatos = postagens[palavra]
+            else:
+                aproximadas.append(postagens[palavra])
+        if len(aproximadas) == 1 and not exatos:
+            aproximados = aproximadas[0]
+        else:
+            aproximados = set().union(*aproximadas)
+            aproximados -= exatos
+        return [(self.QUALIDADE_EXATA, exatos), (self.QUALIDADE_APROXIMADA, aproximados)]
+
+    def consultar(self, termo: str, limite: int) -> List[Tuple[int, float]]:
+        """
+        Retorna até `limite` pares (identificador, pontuação), do mais ao menos relevante,
+        dos documentos que contêm, para cada palavra do termo, a própria palavra ou uma a
+        até uma edição dela. A pontuação é a média das qualidades das correspondências
+        mais um bônus pela fração do texto coberta; empates seguem a ordem de cadastro.
+        """
+        termos = list(dict.fromkeys(_PALAVRA.findall(normalizar_texto(termo))))
+        if not termos:
+            return []
+        expansoes = []
+        for palavra in termos:
+            expansao = self.expandir(palavra)
+            if not expansao:
+                return []
+            expansoes.append(expansao)
+
+        # Os candidatos ficam agrupados em níveis pela soma das qualidades, de modo que
+        # as interseções são feitas entre conjuntos (em C). Começa pelo termo mais raro;
+        # um termo com postagens muito maiores que os candidatos restantes apenas os
+        # filtra pelas palavras de cada documento.
+        postagens = self.postagens
+        tamanhos = [sum(len(postagens[p]) for p in expansao) for expansao in expansoes]
+        ordem = sorted(range(len(expansoes)), key=tamanhos.__getitem__)
+        niveis: Dict[float, Set[int]] = {qualidade: documentos
+                                         for qualidade, documentos in self._documentos(expansoes[ordem[0]])
+                                         if documentos}
+        palavras = self.palavras
+        for posicao in ordem[1:]:
+            expansao = expansoes[posicao]
+            novos: Dict[float, Set[int]] = {}
+            if tamanhos[posicao] <= self.RAZAO_INTERSECAO * sum(map(len, niveis.values())):
+                documentos_termo = self._documentos(expansao)
+                for soma, candidatos in niveis.items():
+                    for qualidade, documentos in documentos_termo:
+                        parte = candidatos & documentos
+                        if not parte:
+                            continue
+                        nivel = novos.get(soma + qualidade)
+                        if nivel is None:
+                            novos[soma + qualidade] = parte
+                        else:
+                            nivel |= parte
+            else:
+                for soma, candidatos in niveis.items():
+                    for identificador in candidatos:
+                        melhor = 0.0
+                        for palavra in palavras[identificador]:
+                            qualidade = expansao.get(palavra, 0.0)
+                            if qualidade > melhor:
+                                melhor = qualidade
+                        if melhor:
+                            novos.setdefault(soma + melhor, set()).add(identificador)
+            niveis = novos
+            if not niveis:
+                return []
+        return self._melhores(niveis, len(termos), limite)
+
+    def _melhores(self, niveis: Dict[float, Set[int]], n_termos: int, limite: int) -> List[Tuple[int, float]]:
+        """
+        Escolhe os `limite` melhores documentos, nível por nível. O bônus de cobertura
+        só depende da quantidade de palavras do documento, então os candidatos de um
+        nível grande são tirados de `por_tamanho`, do texto mais curto para o mais longo,
+        até bastarem.
+        """
+        peso = self.PESO_COBERTURA
+        por_tamanho = self.por_tamanho
+        # Textos com até n_termos palavras recebem o bônus inteiro e formam um só grupo
+        grupos = [[tamanho for tamanho in por_tamanho if tamanho <= n_termos]]
+        grupos += [[tamanho] for tamanho in sorted(por_tamanho) if tamanho > n_termos]
+        escolhidos: List[Tuple[float, int]] = []
+        for soma in sorted(niveis, reverse=True):
+            base = soma / n_termos
+            if len(escolhidos) == limite and base + peso < escolhidos[-1][0]:
+                break
+            candidatos = niveis[soma]
+            if len(candidatos) > limite:
+                selecionados: List[int] = []
+                for grupo in grupos:
+                    parte = set().union(*(candidatos & por_tamanho[tamanho] for tamanho in grupo))
+                    faltam = limite - len(selecionados)
+                    selecionados += parte if len(parte) <= faltam else heapq.nsmallest(faltam, parte)
+                    if len(selecionados) == limite:
+                        break
+                candidatos = selecionados
+            for identificador in candidatos:
+                cobertura = len(self.palavras[identificador])
+                bonus = peso if cobertura <= n_termos else peso * n_termos / cobertura
+                escolhidos.append((base + bonus, -identificador))
+            escolhidos = heapq.nlargest(limite, escolhidos)
+        return [(-negativo, pontuacao) for pontuacao, negativo in escolhidos]
+
+
+def ranquear_busca(indices: Mapping[str, IndiceAproximado], pesos: Mapping[str, float],
+                   termo: str, limite: int, campos: Iterable[str]) -> List[Tuple[str, float]]:
+    """
+    Consulta os índices aproximados dos campos informados e retorna até `limite` pares
+    (chave, pontuação), do mais ao menos relevante. A pontuação de uma chave é a do
+    seu melhor campo, multiplicada pelo peso do campo.
+
+    Basta combinar os `limite` melhores de cada campo: uma chave fora dos `limite`
+    melhores do seu melhor campo é superada por outras `limite` chaves.
+    """
+    melhores: Dict[str, float] = {}
+    for campo in campos:
+        indice = indices[campo]
+        peso = pesos.get(campo, 1.0)
+        chaves = indice.chaves
+        for identificador, pontuacao in indice.consultar(termo, limite):
+            chave = chaves[identificador]
+            pontuacao *= peso
+            if melhores.get(chave, 0.0) < pontuacao:
+                melhores[chave] = pontuacao
+    return heapq.nlargest(limite, melhores.items(), key=itemgetter(1))
+
+
+class IndiceAno:
+    """
+    Índice secundário ordenado pelo ano de publicação.
+
+    Mantém duas listas paralelas ordenadas por ano (anos e chaves). Livros do mesmo
+    ano ficam na ordem de cadastro, de modo que consultas por intervalo custam
+    O(log n + k) via bisseção.
+
+    Livros fora de ordem (ano menor que o último indexado) vão para um buffer de
+    pendentes, consultado por varredura e intercalado nas listas ordenadas quando passa
+    de LIMITE_PENDENTES: só o buffer é ordenado, e a intercalação custa O(n).
+
+    Atributos:
+        anos (List[int]): anos de publicação em ordem crescente
+        chaves (List[str]): ISBN correspondente a cada posição de `anos`
+        pendentes (List[Tuple[int, str]]): pares (ano, chave) fora de ordem, ainda não intercalados
+    """
+
+    LIMITE_PENDENTES = 1024
+
+    def __init__(self):
+        self.anos: List[int] = []
+        self.chaves: List[str] = []
+        self.pendentes: List[Tuple[int, str]] = []
+
+    def adicionar(self, chave: str, ano: int):
+        """
+        Insere a chave na posição ordenada do ano informado.
+        """
+        if not self.anos or ano >= self.anos[-1]:
+            # Caso comum em cargas ordenadas: inserção no final
+            self.anos.append(ano)
+            self.chaves.append(chave)
+            return
+        self.pendentes.append((ano, chave))
+        if len(self.pendentes) > self.LIMITE_PENDENTES:
+            self._intercalar()
+
+    def adicionar_lote(self, pares: List[Tuple[int, str]]):
+        """
+        Insere vários pares (ano, chave) de uma vez, ordenando só o lote.
+        """
+        if not pares:
+            return
+        pares = sorted(pares, key=itemgetter(0))
+        if not self.anos or pares[0][0] >= self.anos[-1]:
+            self.anos.extend(ano for ano, _ in pares)
+            self.chaves.extend(chave for _, chave in pares)
+            return
+        self.pendentes.extend(pares)
+        if len(self.pendentes) > self.LIMITE_PENDENTES:
+            self._intercalar()
+
+    def _intercalar(self):
+        """
+        Intercala os pendentes (ordenados de forma estável) nas listas ordenadas. Uma
+        chave pendente nunca empata com uma indexada depois dela (que tem ano maior ou
+        igual ao último da lista no momento do seu cadastro), então a intercalação
+        estável preserva a ordem de cadastro dentro de cada ano.
+        """
+        pendentes = sorted(self.pendentes, key=itemgetter(0))
+        pares = list(heapq.merge(zip(self.anos, self.chaves), pendentes, key=itemgetter(0)))
+        self.anos = [ano for ano, _ in pares]
+        self.chaves = [chave for _, chave in pares]
+        self.pendentes = []
+
+    def intervalo(self, ano_inicio: int, ano_fim: int) -> List[str]:
+        """
+        Retorna as chaves com ano entre ano_inicio e ano_fim (inclusive), em ordem de ano.
+        """
+        inicio = bisect_left(self.anos, ano_inicio)
+        fim = bisect_right(self.anos, ano_fim, lo=inicio)
+        if not self.pendentes:
+            return self.chaves[inicio:fim]
+        extras = sorted((par for par in self.pendentes if ano_inicio <= par[0] <= ano_fim), key=itemgetter(0))
+        if not extras:
+            return self.chaves[inicio:fim]
+        pares = heapq.merge(zip(self.anos[inicio:fim], self.chaves[inicio:fim]), extras, key=itemgetter(0))
+        return [chave for _, chave in pares]
+
+
+class ChavesOrdenadas:
+    """
+    Chaves de um dicionário que só cresce (catálogo ou cadastro de usuários), em ordem
+    crescente, para a paginação por chave.
+
+    Como nada é removido do dicionário, as chaves ainda não ordenadas são sempre as
+    últimas na ordem de inserção: a sincronização lê só essas (com reversed) e as
+    intercala com as já ordenadas em uma lista nova, de modo que cursores abertos
+    continuam percorrendo a lista anterior.
+
+    Atributos:
+        origem (Mapping[str, object]): dicionário acompanhado
+        chaves (List[str]): chaves de `origem` em ordem crescente
+    """
+
+    def __init__(self, origem: Mapping[str, object]):
+        self.origem = origem
+        self.chaves: List[str] = []
+
+    def sincronizar(self) -> List[str]:
+        """
+        Inclui as chaves novas de `origem` e retorna a lista ordenada.
+        """
+        novas = len(self.origem) - len(self.chaves)
+        if novas:
+            # Duas sequências ordenadas: o Timsort as intercala em tempo linear
+            self.chaves = sorted(self.chaves + list(islice(reversed(self.origem), novas)))
+        return self.chaves
+
+
+def chaves_apos(chaves: List, apos) -> Iterator:
+    """
+    Gera as chaves da lista ordenada maiores que `apos` (todas, se apos for None).
+    """
+    inicio = 0 if apos is None else bisect_right(chaves, apos)
+    # Acesso por índice: começa direto na posição, sem percorrer as chaves anteriores
+    return map(chaves.__getitem__, range(inicio, len(chaves)))
+
+
+# -----------------------------------------------------------
+# Registro Central de Empréstimos
+# -----------------------------------------------------------
+class RegistroEmprestimos:
+    """
+    Livro-razão central dos empréstimos ativos, indexado por ISBN, por data e por vencimento.
+
+    O índice por usuário é o próprio `Usuario.emprestimos_ativos`; este registro
+    complementa-o para que as perguntas "quem está com o ISBN X", "empréstimos
+    feitos entre duas datas" e "empréstimos vencidos em uma data" não precisem
+    percorrer todos os usuários.
+
+    Os índices por data e por vencimento são calendários: um balde (dicionário
+    ordenado por inserção) por dia, mais a lista ordenada dos dias com empréstimos.
+    Uma consulta por intervalo custa O(log d + k) para d dias distintos e k resultados.
+
+    Atributos:
+        ativos (Dict[Tuple[str, str], date]): (id_usuario, isbn) -> data, na ordem dos empréstimos
+        por_isbn (Dict[str, Dict[str, date]]): isbn -> {id_usuario: data}
+        por_data (Dict[date, Dict[Tuple[str, str], None]]): data -> empréstimos feitos nessa data
+        datas (List[date]): datas presentes em por_data, em ordem crescente
+        vencimentos (Dict[Tuple[str, str], date]): (id_usuario, isbn) -> data de vencimento
+        por_vencimento (Dict[date, Dict[Tuple[str, str], None]]): vencimento -> empréstimos
+        datas_vencimento (List[date]): datas presentes em por_vencimento, em ordem crescente
+    """
+
+    def __init__(self):
+        self.ativos: Dict[Tuple[str, str], date] = {}
+        self.por_isbn: Dict[str, Dict[str, date]] = {}
+        self.por_data: Dict[date, Dict[Tuple[str, str], None]] = {}
+        self.datas: List[date] = []
+        self.vencimentos: Dict[Tuple[str, str], date] = {}
+        self.por_vencimento: Dict[date, Dict[Tuple[str, str], None]] = {}
+        self.datas_vencimento: List[date] = []
+
+    def __len__(self) -> int:
+        return len(self.ativos)
+
+    @staticmethod
+    def _balde(calendario: Dict[date, Dict[Tuple[str, str], None]], dias: List[date],
+               dia: date) -> Dict[Tuple[str, str], None]:
+        """
+        Retorna o balde do dia no calendário, criando-o (e inserindo o dia na lista ordenada) se preciso.
+        """
+        balde = calendario.get(dia)
+        if balde is None:
+            balde = calendario[dia] = {}
+            dias.insert(bisect_right(dias, dia), dia)
+        return balde
+
+    @staticmethod
+    def _retirar(calendario: Dict[date, Dict[Tuple[str, str], None]], dias: List[date],
+                 dia: date, chave: Tuple[str, str]):
+        """
+        Retira a chave do balde do dia, descartando o balde quando ele fica vazio.
+        """
+        balde = calendario[dia]
+        del balde[chave]
+        if not balde:
+            del calendario[dia]
+            del dias[bisect_left(dias, dia)]
+
+    def registrar(self, id_usuario: str, isbn: str, data_emprestimo: date,
+                  data_vencimento: Optional[date] = None):
+        """
+        Registra um empréstimo ativo em todos os índices.
+        Sem data_vencimento o empréstimo não entra no índice de vencimentos.
+        """
+        chave = (id_usuario, isbn)
+        self.ativos[chave] = data_emprestimo
+        self.por_isbn.setdefault(isbn, {})[id_usuario] = data_emprestimo
+        self._balde(self.por_data, self.datas, data_emprestimo)[chave] = None
+        if data_vencimento is not None:
+            self.vencimentos[chave] = data_vencimento
+            self._balde(self.por_vencimento, self.datas_vencimento, data_vencimento)[chave] = None
+
+    def remover(self, id_usuario: str, isbn: str):
+        """
+        Remove um empréstimo de todos os índices.
+        """
+        chave = (id_usuario, isbn)
+        data_emprestimo = self.ativos.pop(chave)
+        do_livro = self.por_isbn[isbn]
+        del do_livro[id_usuario]
+        if not do_livro:
+            del self.por_isbn[isbn]
+        self._retirar(self.por_data, self.datas, data_emprestimo, chave)
+        data_vencimento = self.vencimentos.pop(chave, None)
+        if data_vencimento is not None:
+            self._retirar(self.por_vencimento, self.datas_vencimento, data_vencimento, chave)
+
+    def registrar_lote(self, pares: List[Tuple[str, str]], data_emprestimo: date,
+                       data_vencimento: Optional[date] = None):
+        """
+        Registra vários empréstimos feitos na mesma data (e com o mesmo vencimento).
+        Os pares devem ser tuplas: os índices por chave são atualizados com um único
+        update cada.
+        """
+        self.ativos.update(zip(pares, repeat(data_emprestimo)))
+        por_isbn = self.por_isbn
+        for id_usuario, isbn in pares:
+            do_livro = por_isbn.get(isbn)
+            if do_livro is None:
+                por_isbn[isbn] = {id_usuario: data_emprestimo}
+            else:
+                do_livro[id_usuario] = data_emprestimo
+        self._balde(self.por_data, self.datas, data_emprestimo).update(dict.fromkeys(pares))
+        if data_vencimento is not None:
+            self.vencimentos.update(zip(pares, repeat(data_vencimento)))
+            self._balde(self.por_vencimento, self.datas_vencimento, data_vencimento).update(
+                dict.fromkeys(pares))
+
+    def remover_lote(self, pares: List[Tuple[str, str]]):
+        """
+        Remove vários empréstimos (pares em tuplas) de todos os índices, com o
+        trabalho de remover feito em um único laço.
+        """
+        ativos = self.ativos
+        por_isbn = self.por_isbn
+        por_data = self.por_data
+        vencimentos = self.vencimentos
+        por_vencimento = self.por_vencimento
+        for chave in pares:
+            id_usuario, isbn = chave
+            data_emprestimo = ativos.pop(chave)
+            do_livro = por_isbn[isbn]
+            del do_livro[id_usuario]
+            if not do_livro:
+                del por_isbn[isbn]
+            balde = por_data[data_emprestimo]
+            del balde[chave]
+            if not balde:
+                del por_data[data_emprestimo]
+                del self.datas[bisect_left(self.datas, data_emprestimo)]
+            data_vencimento = vencimentos.pop(chave, None)
+            if data_vencimento is not None:
+                balde = por_vencimento[data_vencimento]
+                del balde[chave]
+                if not balde:
+                    del por_vencimento[data_vencimento]
+                    del self.datas_vencimento[bisect_left(self.datas_vencimento, data_vencimento)]
+
+    def descartar(self, id_usuario: str, isbn: str):
+        """
+        Retira um empréstimo dos índices em que ele estiver, mesmo que o registro tenha
+        sido interrompido no meio (usado para desfazer lotes).
+        """
+        chave = (id_usuario, isbn)
+        do_livro = self.por_isbn.get(isbn)
+        if do_livro is not None:
+            do_livro.pop(id_usuario, None)
+            if not do_livro:
+                del self.por_isbn[isbn]
+        for calendario, dias, dia in ((self.por_data, self.datas, self.ativos.pop(chave, None)),
+                                      (self.por_vencimento, self.datas_vencimento,
+                                       self.vencimentos.pop(chave, None))):
+            if dia in calendario and chave in calendario[dia]:
+                self._retirar(calendario, dias, dia, chave)
+
+    def do_livro(self, isbn: str) -> Dict[str, date]:
+        """
+        Retorna {id_usuario: data} dos empréstimos ativos de um ISBN.
+        """
+        return self.por_isbn.get(isbn, {})
+
+    @staticmethod
+    def _intervalo(calendario: Dict[date, Dict[Tuple[str, str], None]], dias: List[date],
+                   inicio: int, fim: int) -> Iterator[Tuple[Tuple[str, str], date]]:
+        for dia in dias[inicio:fim]:
+            for chave in calendario[dia]:
+                yield chave, dia
+
+    def entre(self, data_inicio: date, data_fim: date) -> Iterator[Tuple[Tuple[str, str], date]]:
+        """
+        Gera ((id_usuario, isbn), data) dos empréstimos feitos entre as datas (inclusive),
+        em ordem de data.
+        """
+        inicio = bisect_left(self.datas, data_inicio)
+        fim = bisect_right(self.datas, data_fim, lo=inicio)
+        return self._intervalo(self.por_data, self.datas, inicio, fim)
+
+    def vencidos_entre(self, data_inicio: Optional[date], data_fim: date) -> Iterator[Tuple[Tuple[str, str], date]]:
+        """
+        Gera ((id_usuario, isbn), vencimento) dos empréstimos com vencimento em
+        [data_inicio, data_fim), em ordem de vencimento. Sem data_inicio, desde o primeiro.
+        """
+        dias = self.datas_vencimento
+        inicio = 0 if data_inicio is None else bisect_left(dias, data_inicio)
+        fim = bisect_left(dias, data_fim, lo=inicio)
+        return self._intervalo(self.por_vencimento, dias, inicio, fim)
+
+
+# -----------------------------------------------------------
+# Resultado de Operações em Lote
+# -----------------------------------------------------------
+class ResultadoLote:
+    """
+    Resultado de um empréstimo ou devolução em lote.
+
+    Atributos:
+        aplicado (bool): True se todas as operações foram aplicadas; False se nenhuma foi
+        erros (List[Optional[Exception]]): para cada par, None ou a exceção que o impediu
+    """
+
+    def __init__(self, aplicado: bool, erros: List[Optional[Exception]]):
+        self.aplicado = aplicado
+        self.erros = erros
+
+    def __bool__(self) -> bool:
+        return self.aplicado
+
+    def __str__(self) -> str:
+        falhas = sum(erro is not None for erro in self.erros)
+        return f"Aplicado: {'sim' if self.aplicado else 'não'} | Itens: {len(self.erros)} | Com erro: {falhas}"
+
+
+# -----------------------------------------------------------
+# Importação em Lote
+# -----------------------------------------------------------
+CAMPOS_LIVRO = ('titulo', 'autor', 'ano', 'isbn', 'total_copias')
+CAMPOS_USUARIO = ('nome', 'id_usuario', 'contato')
+TAMANHO_LOTE_IMPORTACAO = 50_000
+
+
+class RelatorioImportacao:
+    """
+    Resultado de uma importação em lote.
+
+    Atributos:
+        lidos (int): quantidade de linhas de dados lidas do arquivo
+        importados (int): quantidade de registros cadastrados
+        erros (List[Tuple[int, str]]): pares (número da linha, mensagem) das linhas rejeitadas
+    """
+
+    def __init__(self):
+        self.lidos = 0
+        self.importados = 0
+        self.erros: List[Tuple[int, str]] = []
+
+    def __str__(self) -> str:
+        return f"Lidos: {self.lidos} | Importados: {self.importados} | Erros: {len(self.erros)}"
+
+
+def _ler_registros(caminho, campos: Tuple[str, ...], formato: Optional[str] = None) -> Iterator[Tuple[int, object]]:
+    """
+    Lê um arquivo CSV (com cabeçalho) ou JSONL linha a linha, sem carregá-lo inteiro na memória.
+    Gera pares (número da linha, tupla de valores na ordem de `campos`); quando a linha
+    não pode ser lida, gera (número da linha, mensagem de erro).
+    """
+    caminho = Path(caminho)
+    formato = (formato or caminho.suffix.lstrip('.')).lower()
+    if formato == 'csv':
+        with open(caminho, newline='', encoding='utf-8') as arquivo:
+            leitor = csv.reader(arquivo)
+            cabecalho = [coluna.strip() for coluna in next(leitor, [])]
+            faltando = [campo for campo in campos if campo not in cabecalho]
+            if faltando:
+                raise ValueError(f"Colunas ausentes no cabeçalho de {caminho.name}: {', '.join(faltando)}")
+            seletor = itemgetter(*(cabecalho.index(campo) for campo in campos))
+            minimo = len(cabecalho)
+            for numero_linha, linha in enumerate(leitor, start=2):
+                if len(linha) < minimo:
+                    yield numero_linha, f"esperadas {minimo} colunas, encontradas {len(linha)}"
+                else:
+                    yield numero_linha, seletor(linha)
+    elif formato in ('jsonl', 'json', 'ndjson'):
+        with open(caminho, encoding='utf-8') as arquivo:
+            for numero_linha, linha in enumerate(arquivo, start=1):
+                if not linha.strip():
+                    continue
+                try:
+                    objeto = json.loads(linha)
+                    yield numero_linha, tuple(objeto[campo] for campo in campos)
+                except (ValueError, TypeError) as e:
+                    yield numero_linha, f"JSON inválido: {e}"
+                except KeyError as e:
+                    yield numero_linha, f"campo ausente: {e.args[0]}"
+    else:
+        raise ValueError(f"Formato de importação não suportado: {formato!r} (use csv ou jsonl)")
+
+
+def _validar_livros(lote: List[Tuple[int, object]], existentes, erros: List[Tuple[int, str]]) -> List[Livro]:
+    """
+    Valida um lote gerado por _ler_registros e retorna os livros novos, na ordem do arquivo.
+    Linhas inválidas ou com ISBN em `existentes` (ou repetido no lote) vão para `erros`.
+    """
+    novos: Dict[str, Livro] = {}
+    for numero_linha, valores in lote:
+        if isinstance(valores, str):
+            erros.append((numero_linha, valores))
+            continue
+        titulo, autor, ano, isbn, total_copias = valores
+        try:
+            isbn = isbn.strip()
+            total_copias = int(total_copias)
+            if total_copias < 0:
+                raise ValueError("'total_copias' não pode ser negativo")
+            livro = Livro(titulo.strip(), autor.strip(), int(ano), isbn, total_copias)
+        except (ValueError, TypeError, AttributeError) as e:
+            erros.append((numero_linha, f"valor inválido: {e}"))
+            continue
+        if isbn in existentes or isbn in novos:
+            erros.append((numero_linha, f"Já existe um livro cadastrado com ISBN {isbn}."))
+            continue
+        novos[isbn] = livro
+    return list(novos.values())
+
+
+def _validar_usuarios(lote: List[Tuple[int, object]], existentes, erros: List[Tuple[int, str]]) -> List[Usuario]:
+    """
+    Valida um lote de usuários gerado por _ler_registros (ver _validar_livros).
+    """
+    novos: Dict[str, Usuario] = {}
+    for numero_linha, valores in lote:
+        if isinstance(valores, str):
+            erros.append((numero_linha, valores))
+            continue
+        nome, id_usuario, contato = valores
+        try:
+            id_usuario = id_usuario.strip()
+            usuario = Usuario(nome.strip(), id_usuario, contato.strip())
+        except AttributeError as e:
+            erros.append((numero_linha, f"valor inválido: {e}"))
+            continue
+        if id_usuario in existentes or id_usuario in novos:
+            erros.append((numero_linha, f"Já existe um usuário cadastrado com ID {id_usuario}."))
+            continue
+        novos[id_usuario] = usuario
+    return list(novos.values())
+
+
+@contextmanager
+def _sem_coleta_de_lixo():
+    """
+    Suspende o coletor de lixo cíclico durante uma carga em lote. Criar milhões de
+    objetos dispara coletas repetidas que não liberam nada e dominam o tempo da carga.
+    """
+    estava_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if estava_ativo:
+            gc.enable()
+
+
+# -----------------------------------------------------------
+# Prazos, Atrasos e Multas
+# -----------------------------------------------------------
+PRAZO_EMPRESTIMO_DIAS = 14
+MULTA_DIARIA_CENTAVOS = 100
+
+
+class RelatorioAtrasos:
+    """
+    Resultado de uma execução do processamento noturno de atrasos.
+
+    Atributos:
+        data_referencia (date): dia processado (empréstimos com vencimento anterior estão atrasados)
+        avisos (List[Tuple[Usuario, Livro, date]]): empréstimos que venceram desde a execução anterior
+        multas (Dict[str, int]): multa lançada nesta execução por id_usuario, em centavos
+    """
+
+    def __init__(self, data_referencia: date):
+        self.data_referencia = data_referencia
+        self.avisos: List[Tuple[Usuario, Livro, date]] = []
+        self.multas: Dict[str, int] = {}
+
+    def __str__(self) -> str:
+        total = sum(self.multas.values())
+        return (f"Processamento de {self.data_referencia} | Novos atrasos: {len(self.avisos)} | "
+                f"Usuários multados: {len(self.multas)} | Total lançado: R$ {total / 100:.2f}")
+
+
 # -----------------------------------------------------------
 # Classe Biblioteca
 # -----------------------------------------------------------
@@ -165,11 +1046,63 @@ class Biblioteca:
     Atributos:
         catalogo (Dict[str, Livro]): mapeamento de ISBN para objeto Livro
         usuarios (Dict[str, Usuario]): mapeamento de id_usuario para objeto Usuario
+        indices_texto (Dict[str, IndiceTrigramas]): índices de trigramas por campo (titulo, autor)
+        indices_aproximados (Dict[str, IndiceAproximado]): índices de palavras por campo, para
+            a busca aproximada com relevância
+        indice_ano (IndiceAno): índice ordenado por ano de publicação
+        emprestimos (RegistroEmprestimos): registro central dos empréstimos ativos
+        prazo_emprestimo (int): prazo, em dias, dos novos empréstimos
+        multa_diaria (int): multa por dia de atraso, em centavos
+        multas (Dict[str, int]): multas acumuladas por id_usuario, em centavos
+        ultimo_processamento (Optional[date]): data da última execução de processar_atrasos
+
+    Os índices são atualizados de forma preguiçosa: livros cadastrados ficam em uma
+    fila de pendentes e são indexados de uma só vez na próxima consulta.
+
+    Os conjuntos de livros disponíveis e de livros com cópias emprestadas são mantidos
+    a cada empréstimo e devolução, de modo que os relatórios correspondentes custam
+    O(resultado) e as contagens custam O(1).
+
+    Relatórios e buscas aceitam paginação por chave (`limite` e `apos`, a última chave
+    da página anterior), servida pelos cursores cursor_*: geradores que percorrem os
+    resultados sob demanda, sem montar listas. Nos relatórios, as páginas seguem a ordem
+    das chaves (ISBN, id_usuario), que não muda quando livros ficam ou deixam de ficar
+    disponíveis; nas buscas, a mesma ordem de buscar_livros. O resultado de uma busca
+    paginada fica em cache (até LIMITE_RESULTADOS_BUSCA consultas) enquanto o catálogo
+    não cresce, e cada página retoma dele pela posição de `apos`.
     """
 
-    def __init__(self):
+    CAMPOS_TEXTO = ('titulo', 'autor')
+    # Peso de cada campo na relevância da busca aproximada
+    PESOS_BUSCA = {'titulo': 1.0, 'autor': 0.8}
+    # Um subconjunto com menos de 1/FATOR_ESPARSO dos elementos é paginado pelas suas
+    # próprias chaves ordenadas, em vez de filtrar o catálogo (ou os usuários) inteiro
+    FATOR_ESPARSO = 64
+    # Consultas de busca paginada cujo resultado fica em cache
+    LIMITE_RESULTADOS_BUSCA = 32
+
+    def __init__(self, prazo_emprestimo: int = PRAZO_EMPRESTIMO_DIAS,
+                 multa_diaria: int = MULTA_DIARIA_CENTAVOS):
         self.catalogo: Dict[str, Livro] = {}
         self.usuarios: Dict[str, Usuario] = {}
+        self.indices_texto: Dict[str, IndiceTrigramas] = {
+            campo: IndiceTrigramas() for campo in self.CAMPOS_TEXTO
+        }
+        self.indices_aproximados: Dict[str, IndiceAproximado] = {
+            campo: IndiceAproximado() for campo in self.CAMPOS_TEXTO
+        }
+        self.indice_ano = IndiceAno()
+        self._pendentes_indice: List[Livro] = []
+        self._disponiveis: Dict[str, Livro] = {}
+        self._emprestados: Dict[str, Livro] = {}
+        self.emprestimos = RegistroEmprestimos()
+        self.prazo_emprestimo = prazo_emprestimo
+        self.multa_diaria = multa_diaria
+        self.multas: Dict[str, int] = {}
+        self.ultimo_processamento: Optional[date] = None
+        self._isbns_ordenados = ChavesOrdenadas(self.catalogo)
+        self._ids_ordenados = ChavesOrdenadas(self.usuarios)
+        self._resultados_busca: Dict[Tuple[str, str], Tuple[int, List[str], Dict[str, int]]] = {}
 
     def cadastrar_livro(self, titulo: str, autor: str, ano: int, isbn: str, total_copias: int):
         """
@@ -180,6 +1113,62 @@ class Biblioteca:
             raise DuplicidadeLivroError(f"Já existe um livro cadastrado com ISBN {isbn}.")
         novo_livro = Livro(titulo, autor, ano, isbn, total_copias)
         self.catalogo[isbn] = novo_livro
+        self._indexar_livro(novo_livro)
+
+    def _indexar_livro(self, livro: Livro):
+        """
+        Enfileira um livro recém-cadastrado para os índices auxiliares de busca.
+        """
+        self._pendentes_indice.append(livro)
+        self._atualizar_disponibilidade(livro)
+
+    def _atualizar_disponibilidade(self, livro: Livro):
+        """
+        Atualiza os conjuntos de livros disponíveis e emprestados após uma mudança nas cópias.
+        Um livro que permanece no mesmo estado mantém sua posição nos relatórios.
+        """
+        isbn = livro.isbn
+        if livro.copias_disponiveis > 0:
+            if isbn not in self._disponiveis:
+                self._disponiveis[isbn] = livro
+        else:
+            self._disponiveis.pop(isbn, None)
+        if livro.copias_disponiveis < livro.total_copias:
+            if isbn not in self._emprestados:
+                self._emprestados[isbn] = livro
+        else:
+            self._emprestados.pop(isbn, None)
+
+    def _atualizar_indices(self):
+        """
+        Indexa, na ordem de cadastro, os livros pendentes nos índices de busca.
+        """
+        pendentes = self._pendentes_indice
+        if not pendentes:
+            return
+        with _sem_coleta_de_lixo():
+            for campo, indice in self.indices_texto.items():
+                for livro in pendentes:
+                    indice.adicionar(livro.isbn, getattr(livro, campo))
+            self.indice_ano.adicionar_lote([(livro.ano, livro.isbn) for livro in pendentes])
+        self._pendentes_indice = []
+
+    def _atualizar_indices_aproximados(self):
+        """
+        Leva aos índices aproximados os documentos já presentes nos índices de trigramas,
+        reaproveitando o texto normalizado que eles guardam. Só a busca aproximada paga
+        por esses índices, e apenas na primeira consulta após novos cadastros.
+        """
+        self._atualizar_indices()
+        for campo, indice in self.indices_aproximados.items():
+            trigramas = self.indices_texto[campo]
+            inicio = len(indice.chaves)
+            if inicio == len(trigramas.chaves):
+                continue
+            with _sem_coleta_de_lixo():
+                for chave, texto in zip(islice(trigramas.chaves, inicio, None),
+                                        islice(trigramas.textos, inicio, None)):
+                    indice.adicionar(chave, texto)
 
     def cadastrar_usuario(self, nome: str, id_usuario: str, contato: str):
         """
@@ -191,10 +1180,76 @@ class Biblioteca:
         novo_usuario = Usuario(nome, id_usuario, contato)
         self.usuarios[id_usuario] = novo_usuario
 
-    def emprestar_livro(self, id_usuario: str, isbn: str):
+    def importar_livros(self, caminho, formato: Optional[str] = None,
+                        tamanho_lote: int = TAMANHO_LOTE_IMPORTACAO) -> RelatorioImportacao:
+        """
+        Importa livros de um arquivo CSV ou JSONL com os campos titulo, autor, ano,
+        isbn e total_copias. O arquivo é lido em lotes, sem carregá-lo inteiro na memória.
+        Linhas inválidas ou com ISBN duplicado (no catálogo ou no próprio arquivo) não
+        interrompem a importação: são registradas no relatório retornado.
+        """
+        relatorio = RelatorioImportacao()
+        erros = relatorio.erros
+        catalogo = self.catalogo
+        registros = _ler_registros(caminho, CAMPOS_LIVRO, formato)
+        with _sem_coleta_de_lixo():
+            while True:
+                lote = list(islice(registros, tamanho_lote))
+                if not lote:
+                    break
+                relatorio.lidos += len(lote)
+                novos = _validar_livros(lote, catalogo, erros)
+                self._adicionar_livros(novos)
+                relatorio.importados += len(novos)
+        return relatorio
+
+    def importar_usuarios(self, caminho, formato: Optional[str] = None,
+                          tamanho_lote: int = TAMANHO_LOTE_IMPORTACAO) -> RelatorioImportacao:
+        """
+        Importa usuários de um arquivo CSV ou JSONL com os campos nome, id_usuario e contato.
+        Funciona como importar_livros: leitura em lotes e relatório de erros por linha.
+        """
+        relatorio = RelatorioImportacao()
+        erros = relatorio.erros
+        usuarios = self.usuarios
+        registros = _ler_registros(caminho, CAMPOS_USUARIO, formato)
+        with _sem_coleta_de_lixo():
+            while True:
+                lote = list(islice(registros, tamanho_lote))
+                if not lote:
+                    break
+                relatorio.lidos += len(lote)
+                novos = _validar_usuarios(lote, usuarios, erros)
+                self._adicionar_usuarios(novos)
+                relatorio.importados += len(novos)
+        return relatorio
+
+    def _adicionar_livros(self, livros: List[Livro]):
+        """
+        Adiciona ao catálogo livros já validados (sem duplicidades) por uma importação em lote.
+        """
+        catalogo = self.catalogo
+        for livro in livros:
+            catalogo[livro.isbn] = livro
+        self._pendentes_indice.extend(livros)
+        disponiveis = self._disponiveis
+        for livro in livros:
+            if livro.total_copias > 0:
+                disponiveis[livro.isbn] = livro
+
+    def _adicionar_usuarios(self, usuarios: List[Usuario]):
+        """
+        Adiciona ao cadastro usuários já validados (sem duplicidades) por uma importação em lote.
+        """
+        cadastro = self.usuarios
+        for usuario in usuarios:
+            cadastro[usuario.id_usuario] = usuario
+
+    def emprestar_livro(self, id_usuario: str, isbn: str, data_emprestimo: Optional[date] = None):
         """
         Realiza o empréstimo de um livro para um usuário.
         Verifica existência de usuário e livro, disponibilidade e registra o empréstimo.
+        Se data_emprestimo não for informada, utiliza a data de hoje.
         """
         if id_usuario not in self.usuarios:
             raise UsuarioNaoEncontradoError(f"Usuário com ID {id_usuario} não encontrado.")
@@ -208,8 +1263,17 @@ class Biblioteca:
         livro.emprestar()
 
         # Registra o empréstimo ativo no objeto Usuario
-        data_hoje = date.today()
-        usuario.registrar_emprestimo(isbn, data_hoje)
+        if data_emprestimo is None:
+            data_emprestimo = date.today()
+        try:
+            usuario.registrar_emprestimo(isbn, data_emprestimo)
+        except EmprestimoDuplicadoError:
+            # Devolve a cópia retirada para que livro e usuário não fiquem dessincronizados
+            livro.copias_disponiveis += 1
+            raise
+        self._atualizar_disponibilidade(livro)
+        self.emprestimos.registrar(id_usuario, isbn, data_emprestimo,
+                                   data_emprestimo + timedelta(days=self.prazo_emprestimo))
 
     def devolver_livro(self, id_usuario: str, isbn: str):
         """
@@ -225,66 +1289,551 @@ class Biblioteca:
         livro = self.catalogo[isbn]
 
         # Remove o registro de empréstimo ativo do usuário
+        data_emprestimo = usuario.emprestimos_ativos.get(isbn)
         usuario.registrar_devolucao(isbn)
 
         # Atualiza as cópias disponíveis do livro
-        livro.devolver()
-
-    def buscar_livros(self, campo: str, valor_busca: str) -> List[Livro]:
+        try:
+            livro.devolver()
+        except ExcecaoDevolucaoInvalida:
+            # Restaura o empréstimo removido para manter livro e usuário sincronizados
+            usuario.registrar_emprestimo(isbn, data_emprestimo)
+            raise
+        self.emprestimos.remover(id_usuario, isbn)
+        self._atualizar_disponibilidade(livro)
+
+    def emprestar_lote(self, pares: Iterable[Tuple[str, str]],
+                       data_emprestimo: Optional[date] = None) -> ResultadoLote:
+        """
+        Empresta vários livros de uma vez a partir de pares (id_usuario, isbn).
+
+        O lote é verificado inteiro com operações que percorrem os pares em C (map, set,
+        Counter): usuários e livros existentes, pares repetidos, empréstimos já ativos
+        (pelo registro central) e cópias suficientes para cada ISBN. Só quando alguma
+        verificação falha os pares são examinados um a um, para montar o resultado por
+        par. Se algum par for inválido, nada é alterado; caso contrário todos são
+        aplicados: as cópias e a disponibilidade mudam uma vez por ISBN, e o registro
+        central recebe o lote de uma vez.
+        O resultado traz, para cada par, None ou a exceção que o empréstimo isolado levantaria.
+        """
+        pares = list(map(tuple, pares))
+        if data_emprestimo is None:
+            data_emprestimo = date.today()
+        usuarios_lote = list(map(self.usuarios.get, map(itemgetter(0), pares)))
+        isbns = list(map(itemgetter(1), pares))
+        copias = Counter(isbns)
+        livros = list(map(self.catalogo.get, copias))
+        if (None in usuarios_lote or None in livros or len(set(pares)) < len(pares)
+                or any(map(self.emprestimos.ativos.__contains__, pares))
+                or any(livro.copias_disponiveis < copias[livro.isbn] for livro in livros)):
+            erros = self._verificar_emprestimos(pares)
+            if any(erros):
+                return ResultadoLote(False, erros)
+
+        disponiveis = [livro.copias_disponiveis for livro in livros]
+        try:
+            for usuario, isbn in zip(usuarios_lote, isbns):
+                usuario.emprestimos_ativos[isbn] = data_emprestimo
+            for livro in livros:
+                livro.copias_disponiveis -= copias[livro.isbn]
+            self.emprestimos.registrar_lote(pares, data_emprestimo,
+                                            data_emprestimo + timedelta(days=self.prazo_emprestimo))
+        except BaseException:
+            # Rollback: nenhum par do lote estava emprestado, então tudo o que houver é do lote
+            for usuario, isbn in zip(usuarios_lote, isbns):
+                usuario.emprestimos_ativos.pop(isbn, None)
+            for livro, quantidade in zip(livros, disponiveis):
+                livro.copias_disponiveis = quantidade
+            for id_usuario, isbn in pares:
+                self.emprestimos.descartar(id_usuario, isbn)
+            raise
+        # Disponibilidade (como em _atualizar_disponibilidade), uma vez por ISBN
+        disponiveis = self._disponiveis
+        emprestados = self._emprestados
+        for livro in livros:
+            if livro.copias_disponiveis <= 0:
+                disponiveis.pop(livro.isbn, None)
+            emprestados.setdefault(livro.isbn, livro)
+        return ResultadoLote(True, [None] * len(pares))
+
+    def _verificar_emprestimos(self, pares: List[Tuple[str, str]]) -> List[Optional[Exception]]:
+        """
+        Verifica os pares um a um, considerando os pares anteriores do mesmo lote (cópias
+        já reservadas, empréstimos repetidos), e retorna o erro de cada par (ou None).
+        """
+        usuarios = self.usuarios
+        catalogo = self.catalogo
+        reservadas: Dict[str, int] = {}
+        no_lote: Set[Tuple[str, str]] = set()
+        erros: List[Optional[Exception]] = [None] * len(pares)
+        for posicao, par in enumerate(pares):
+            id_usuario, isbn = par
+            usuario = usuarios.get(id_usuario)
+            livro = catalogo.get(isbn)
+            if usuario is None:
+                erros[posicao] = UsuarioNaoEncontradoError(f"Usuário com ID {id_usuario} não encontrado.")
+            elif livro is None:
+                erros[posicao] = LivroNaoEncontradoError(f"Livro com ISBN {isbn} não encontrado no catálogo.")
+            elif livro.copias_disponiveis - reservadas.get(isbn, 0) <= 0:
+                erros[posicao] = LivroIndisponivelError(f"O livro '{livro.titulo}' não possui cópias disponíveis.")
+            elif isbn in usuario.emprestimos_ativos or par in no_lote:
+                erros[posicao] = EmprestimoDuplicadoError(
+                    f"O usuário '{usuario.nome}' já possui o livro com ISBN {isbn}.")
+            else:
+                reservadas[isbn] = reservadas.get(isbn, 0) + 1
+                no_lote.add(par)
+        return erros
+
+    def devolver_lote(self, pares: Iterable[Tuple[str, str]]) -> ResultadoLote:
+        """
+        Devolve vários livros de uma vez a partir de pares (id_usuario, isbn).
+        Funciona como emprestar_lote: verificação do lote inteiro, aplicação
+        tudo-ou-nada (desfeita por completo, inclusive no registro central, se for
+        interrompida) e resultado por par.
+        """
+        pares = list(map(tuple, pares))
+        usuarios_lote = list(map(self.usuarios.get, map(itemgetter(0), pares)))
+        isbns = list(map(itemgetter(1), pares))
+        copias = Counter(isbns)
+        livros = list(map(self.catalogo.get, copias))
+        registro = self.emprestimos
+        if (None in usuarios_lote or None in livros or len(set(pares)) < len(pares)
+                or not all(map(registro.ativos.__contains__, pares))
+                or any(livro.copias_disponiveis + copias[livro.isbn] > livro.total_copias for livro in livros)):
+            erros = self._verificar_devolucoes(pares)
+            if any(erros):
+                return ResultadoLote(False, erros)
+
+        # Guardados antes de qualquer alteração, para o rollback
+        datas = list(map(registro.ativos.__getitem__, pares))
+        vencimentos = list(map(registro.vencimentos.get, pares))
+        disponiveis = [livro.copias_disponiveis for livro in livros]
+        try:
+            for usuario, isbn in zip(usuarios_lote, isbns):
+                del usuario.emprestimos_ativos[isbn]
+            for livro in livros:
+                livro.copias_disponiveis += copias[livro.isbn]
+            registro.remover_lote(pares)
+        except BaseException:
+            # Rollback: registrar de novo um empréstimo ainda presente não o altera
+            for usuario, isbn, data_emp in zip(usuarios_lote, isbns, datas):
+                usuario.emprestimos_ativos[isbn] = data_emp
+            for livro, quantidade in zip(livros, disponiveis):
+                livro.copias_disponiveis = quantidade
+            for (id_usuario, isbn), data_emp, vencimento in zip(pares, datas, vencimentos):
+                registro.registrar(id_usuario, isbn, data_emp, vencimento)
+            raise
+        disponiveis = self._disponiveis
+        emprestados = self._emprestados
+        for livro in livros:
+            disponiveis.setdefault(livro.isbn, livro)
+            if livro.copias_disponiveis >= livro.total_copias:
+                emprestados.pop(livro.isbn, None)
+        return ResultadoLote(True, [None] * len(pares))
+
+    def _verificar_devolucoes(self, pares: List[Tuple[str, str]]) -> List[Optional[Exception]]:
+        """
+        Verifica os pares de devolução um a um (ver _verificar_emprestimos).
+        """
+        usuarios = self.usuarios
+        catalogo = self.catalogo
+        devolvidas: Dict[str, int] = {}
+        no_lote: Set[Tuple[str, str]] = set()
+        erros: List[Optional[Exception]] = [None] * len(pares)
+        for posicao, par in enumerate(pares):
+            id_usuario, isbn = par
+            usuario = usuarios.get(id_usuario)
+            livro = catalogo.get(isbn)
+            if usuario is None:
+                erros[posicao] = UsuarioNaoEncontradoError(f"Usuário com ID {id_usuario} não encontrado.")
+            elif livro is None:
+                erros[posicao] = LivroNaoEncontradoError(f"Livro com ISBN {isbn} não encontrado no catálogo.")
+            elif isbn not in usuario.emprestimos_ativos or par in no_lote:
+                erros[posicao] = DevolucaoInvalidaError(
+                    f"O usuário '{usuario.nome}' não possui o livro com ISBN {isbn} emprestado.")
+            elif livro.copias_disponiveis + devolvidas.get(isbn, 0) >= livro.total_copias:
+                erros[posicao] = ExcecaoDevolucaoInvalida(
+                    f"Tentativa de devolver '{livro.titulo}', mas todas as cópias já estão disponíveis.")
+            else:
+                devolvidas[isbn] = devolvidas.get(isbn, 0) + 1
+                no_lote.add(par)
+        return erros
+
+    def buscar_livros(self, campo: str, valor_busca: str, limite: Optional[int] = None,
+                      apos: Optional[str] = None) -> List[Livro]:
         """
         Busca livros conforme o campo informado (titulo, autor ou ano).
-        Retorna lista de objetos Livro que correspondem ao critério de busca.
-        """
-        resultados: List[Livro] = []
-        for livro in self.catalogo.values():
-            if campo == 'titulo' and valor_busca.lower() in livro.titulo.lower():
-                resultados.append(livro)
-            elif campo == 'autor' and valor_busca.lower() in livro.autor.lower():
-                resultados.append(livro)
-            elif campo == 'ano':
-                try:
-                    ano_int = int(valor_busca)
-                    if livro.ano == ano_int:
-                        resultados.append(livro)
-                except ValueError:
-                    # Se não for um ano válido, ignora
-                    pass
-        return resultados
+        Retorna lista de objetos Livro que correspondem ao critério de busca; com
+        `limite` e/ou `apos`, retorna só a página correspondente (ver cursor_busca).
+        """
+        if limite is not None or apos is not None:
+            return list(islice(self.cursor_busca(campo, valor_busca, apos), limite))
+        return [self.catalogo[isbn] for isbn in self._isbns_busca(campo, valor_busca)]
+
+    def _isbns_busca(self, campo: str, valor_busca: str) -> List[str]:
+        """
+        ISBNs encontrados por buscar_livros, na ordem do resultado.
+        """
+        self._atualizar_indices()
+        indice = self.indices_texto.get(campo)
+        if indice is not None:
+            return indice.buscar(valor_busca)
+
+        if campo == 'ano':
+            try:
+                ano_int = int(valor_busca)
+            except ValueError:
+                # Se não for um ano válido, ignora
+                return []
+            return self.indice_ano.intervalo(ano_int, ano_int)
+        return []
+
+    def buscar_livros_pontuados(self, termo: str, limite: int = 10,
+                                campos: Iterable[str] = CAMPOS_TEXTO) -> List[Tuple[float, Livro]]:
+        """
+        Busca aproximada: retorna até `limite` pares (pontuação, Livro), do mais ao
+        menos relevante, com os livros cujo campo contém todas as palavras do termo,
+        cada uma exatamente ou com até um erro de digitação. Acentos e maiúsculas são
+        ignorados. A pontuação de um livro é a do seu melhor campo, ponderada por PESOS_BUSCA.
+        """
+        self._atualizar_indices_aproximados()
+        catalogo = self.catalogo
+        return [(pontuacao, catalogo[isbn]) for isbn, pontuacao
+                in ranquear_busca(self.indices_aproximados, self.PESOS_BUSCA, termo, limite, campos)]
+
+    def buscar_livros_ranqueado(self, termo: str, limite: int = 10,
+                                campos: Iterable[str] = CAMPOS_TEXTO) -> List[Livro]:
+        """
+        Retorna os livros de buscar_livros_pontuados, do mais ao menos relevante.
+        """
+        return [livro for _, livro in self.buscar_livros_pontuados(termo, limite, campos)]
+
+    def buscar_livros_por_periodo(self, ano_inicio: int, ano_fim: int) -> List[Livro]:
+        """
+        Retorna os livros publicados entre ano_inicio e ano_fim (inclusive),
+        ordenados por ano e, dentro do mesmo ano, pela ordem de cadastro.
+        """
+        self._atualizar_indices()
+        return [self.catalogo[isbn] for isbn in self.indice_ano.intervalo(ano_inicio, ano_fim)]
 
-    def gerar_relatorio_livros_disponiveis(self) -> List[Livro]:
+    def gerar_relatorio_livros_disponiveis(self, limite: Optional[int] = None,
+                                           apos: Optional[str] = None) -> List[Livro]:
         """
-        Retorna lista de livros com cópias disponíveis para empréstimo.
+        Retorna lista de livros com cópias disponíveis para empréstimo, na ordem em que
+        passaram a ter cópias disponíveis. Com `limite` e/ou `apos`, retorna a página
+        em ordem de ISBN (ver cursor_livros_disponiveis).
         """
-        return [livro for livro in self.catalogo.values() if livro.copias_disponiveis > 0]
+        if limite is not None or apos is not None:
+            return list(islice(self.cursor_livros_disponiveis(apos), limite))
+        return list(self._disponiveis.values())
 
-    def gerar_relatorio_livros_emprestados(self) -> List[Livro]:
+    def gerar_relatorio_livros_emprestados(self, limite: Optional[int] = None,
+                                           apos: Optional[str] = None) -> List[Livro]:
         """
-        Retorna lista de livros que estão com alguma cópia emprestada.
+        Retorna lista de livros que estão com alguma cópia emprestada, na ordem em que
+        tiveram a primeira cópia emprestada. Com `limite` e/ou `apos`, retorna a página
+        em ordem de ISBN (ver cursor_livros_emprestados).
         """
-        return [livro for livro in self.catalogo.values() if livro.copias_disponiveis < livro.total_copias]
+        if limite is not None or apos is not None:
+            return list(islice(self.cursor_livros_emprestados(apos), limite))
+        return list(self._emprestados.values())
 
-    def gerar_relatorio_usuarios(self) -> List[Usuario]:
+    def contar_livros_disponiveis(self) -> int:
+        """
+        Retorna a quantidade de livros com cópias disponíveis, sem montar a lista.
         """
-        Retorna lista de todos os usuários cadastrados.
+        return len(self._disponiveis)
+
+    def contar_livros_emprestados(self) -> int:
         """
+        Retorna a quantidade de livros com alguma cópia emprestada, sem montar a lista.
+        """
+        return len(self._emprestados)
+
+    def gerar_relatorio_usuarios(self, limite: Optional[int] = None,
+                                 apos: Optional[str] = None) -> List[Usuario]:
+        """
+        Retorna lista de todos os usuários cadastrados. Com `limite` e/ou `apos`,
+        retorna a página em ordem de id_usuario (ver cursor_usuarios).
+        """
+        if limite is not None or apos is not None:
+            return list(islice(self.cursor_usuarios(apos), limite))
         return list(self.usuarios.values())
 
-    def gerar_relatorio_emprestimos_ativos(self) -> List[Tuple[Usuario, Livro, date]]:
+    def contar_usuarios(self) -> int:
+        """
+        Retorna a quantidade de usuários cadastrados, sem montar a lista.
+        """
+        return len(self.usuarios)
+
+    def gerar_relatorio_emprestimos_ativos(self, limite: Optional[int] = None,
+                                           apos: Optional[Tuple[str, str]] = None
+                                           ) -> List[Tuple[Usuario, Livro, date]]:
         """
         Retorna lista de tuplas (Usuario, Livro, data_emprestimo) para cada empréstimo ativo.
+        Com `limite` e/ou `apos` (par id_usuario, isbn), retorna a página em ordem de
+        (id_usuario, isbn) (ver cursor_emprestimos_ativos).
+        """
+        if limite is not None or apos is not None:
+            return list(islice(self.cursor_emprestimos_ativos(apos), limite))
+        return list(self.iterar_emprestimos_ativos())
+
+    def iterar_emprestimos_ativos(self) -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data_emprestimo) para cada empréstimo ativo, na ordem
+        dos empréstimos, sem montar a lista inteira.
+        """
+        usuarios = self.usuarios
+        catalogo = self.catalogo
+        for (id_usuario, isbn), data_emprestimo in self.emprestimos.ativos.items():
+            yield usuarios[id_usuario], catalogo[isbn], data_emprestimo
+
+    def contar_emprestimos_ativos(self) -> int:
+        """
+        Retorna a quantidade de empréstimos ativos.
+        """
+        return len(self.emprestimos)
+
+    def emprestimos_do_livro(self, isbn: str) -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data_emprestimo) dos usuários que estão com o ISBN informado.
+        """
+        livro = self.catalogo.get(isbn)
+        if livro is None:
+            raise LivroNaoEncontradoError(f"Livro com ISBN {isbn} não encontrado no catálogo.")
+        usuarios = self.usuarios
+        for id_usuario, data_emprestimo in list(self.emprestimos.do_livro(isbn).items()):
+            yield usuarios[id_usuario], livro, data_emprestimo
+
+    def emprestimos_do_usuario(self, id_usuario: str) -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data_emprestimo) dos empréstimos ativos de um usuário.
+        """
+        usuario = self.usuarios.get(id_usuario)
+        if usuario is None:
+            raise UsuarioNaoEncontradoError(f"Usuário com ID {id_usuario} não encontrado.")
+        catalogo = self.catalogo
+        for isbn, data_emprestimo in list(usuario.emprestimos_ativos.items()):
+            yield usuario, catalogo[isbn], data_emprestimo
+
+    def emprestimos_entre(self, data_inicio: date, data_fim: date) -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data_emprestimo) dos empréstimos feitos entre
+        data_inicio e data_fim (inclusive), em ordem de data.
+        """
+        usuarios = self.usuarios
+        catalogo = self.catalogo
+        for (id_usuario, isbn), data_emprestimo in self.emprestimos.entre(data_inicio, data_fim):
+            yield usuarios[id_usuario], catalogo[isbn], data_emprestimo
+
+    # ------------------------- Cursores (paginação por chave) -------------------------
+    def _chaves_ordenadas(self, chaves: ChavesOrdenadas) -> List[str]:
+        """
+        Lista ordenada de ISBNs ou de ids de usuário, já com os cadastros recentes.
+        """
+        return chaves.sincronizar()
+
+    def _cursor_subconjunto(self, subconjunto: Mapping[str, Livro], apos: Optional[str]) -> Iterator[Livro]:
+        """
+        Gera, em ordem de ISBN e a partir do seguinte a `apos`, os livros de um dos
+        conjuntos mantidos (disponíveis ou emprestados). Se o conjunto for esparso, ordena
+        só as suas chaves; senão, filtra a lista ordenada de todo o catálogo.
+        """
+        if len(subconjunto) * self.FATOR_ESPARSO < len(self.catalogo):
+            chaves = sorted(subconjunto)
+        else:
+            chaves = self._chaves_ordenadas(self._isbns_ordenados)
+        for isbn in chaves_apos(chaves, apos):
+            # O conjunto pode ter mudado desde que as chaves foram lidas
+            livro = subconjunto.get(isbn)
+            if livro is not None:
+                yield livro
+
+    def cursor_livros_disponiveis(self, apos: Optional[str] = None) -> Iterator[Livro]:
+        """
+        Gera os livros com cópias disponíveis em ordem de ISBN, começando pelo ISBN
+        seguinte a `apos` (do início, se None).
         """
-        relatorio = []
-        for usuario in self.usuarios.values():
-            for isbn, data_emprestimo in usuario.emprestimos_ativos.items():
-                livro = self.catalogo.get(isbn)
-                if livro:
-                    relatorio.append((usuario, livro, data_emprestimo))
+        return self._cursor_subconjunto(self._disponiveis, apos)
+
+    def cursor_livros_emprestados(self, apos: Optional[str] = None) -> Iterator[Livro]:
+        """
+        Gera os livros com alguma cópia emprestada em ordem de ISBN, começando pelo ISBN
+        seguinte a `apos` (do início, se None).
+        """
+        return self._cursor_subconjunto(self._emprestados, apos)
+
+    def cursor_usuarios(self, apos: Optional[str] = None) -> Iterator[Usuario]:
+        """
+        Gera os usuários em ordem de id_usuario, começando pelo id seguinte a `apos`
+        (do início, se None).
+        """
+        usuarios = self.usuarios
+        for id_usuario in chaves_apos(self._chaves_ordenadas(self._ids_ordenados), apos):
+            yield usuarios[id_usuario]
+
+    def _emprestimos_do_usuario_ordenados(self, usuario: Usuario) -> List[Tuple[str, date]]:
+        """
+        Pares (isbn, data_emprestimo) dos empréstimos ativos do usuário, em ordem de ISBN.
+        """
+        return sorted(usuario.emprestimos_ativos.items())
+
+    def _chaves_emprestimos(self) -> List[Tuple[str, str]]:
+        """
+        Pares (id_usuario, isbn) de todos os empréstimos ativos.
+        """
+        return list(self.emprestimos.ativos)
+
+    def cursor_emprestimos_ativos(self, apos: Optional[Tuple[str, str]] = None
+                                  ) -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data_emprestimo) em ordem de (id_usuario, isbn),
+        começando pelo empréstimo seguinte ao par `apos` (do início, se None).
+        """
+        usuarios = self.usuarios
+        catalogo = self.catalogo
+        if apos is not None:
+            apos = tuple(apos)
+        if len(self.emprestimos) * self.FATOR_ESPARSO < len(usuarios):
+            # Poucos empréstimos para muitos usuários: ordena os próprios pares
+            ativos = self.emprestimos.ativos
+            for chave in chaves_apos(sorted(self._chaves_emprestimos()), apos):
+                data_emprestimo = ativos.get(chave)
+                if data_emprestimo is not None:
+                    yield usuarios[chave[0]], catalogo[chave[1]], data_emprestimo
+            return
+
+        ids = self._chaves_ordenadas(self._ids_ordenados)
+        inicio = 0 if apos is None else bisect_left(ids, apos[0])
+        for id_usuario in map(ids.__getitem__, range(inicio, len(ids))):
+            usuario = usuarios[id_usuario]
+            if not usuario.possui_emprestimos():
+                continue
+            emprestimos = self._emprestimos_do_usuario_ordenados(usuario)
+            if apos is not None and id_usuario == apos[0]:
+                emprestimos = emprestimos[bisect_right(emprestimos, (apos[1], date.max)):]
+            for isbn, data_emprestimo in emprestimos:
+                yield usuario, catalogo[isbn], data_emprestimo
+
+    def cursor_busca(self, campo: str, valor_busca: str, apos: Optional[str] = None) -> Iterator[Livro]:
+        """
+        Gera os livros de buscar_livros, na mesma ordem, a partir do livro seguinte ao
+        ISBN `apos`. Se `apos` não estiver no resultado, não gera nada.
+        """
+        isbns, posicoes = self._resultado_busca(campo, valor_busca)
+        inicio = 0
+        if apos is not None:
+            posicao = posicoes.get(apos)
+            if posicao is None:
+                return
+            inicio = posicao + 1
+        catalogo = self.catalogo
+        for isbn in map(isbns.__getitem__, range(inicio, len(isbns))):
+            yield catalogo[isbn]
+
+    def _resultado_busca(self, campo: str, valor_busca: str) -> Tuple[List[str], Dict[str, int]]:
+        """
+        ISBNs de buscar_livros e a posição de cada um no resultado, guardados em cache
+        por consulta. O catálogo só cresce, então o seu tamanho identifica a versão do
+        resultado: um livro cadastrado depois invalida as consultas em cache.
+        """
+        consulta = (campo, valor_busca)
+        tamanho = len(self.catalogo)
+        resultados = self._resultados_busca
+        guardado = resultados.get(consulta)
+        if guardado is not None and guardado[0] == tamanho:
+            return guardado[1], guardado[2]
+        isbns = self._isbns_busca(campo, valor_busca)
+        posicoes = {isbn: posicao for posicao, isbn in enumerate(isbns)}
+        resultados.pop(consulta, None)
+        if len(resultados) >= self.LIMITE_RESULTADOS_BUSCA:
+            # Descarta a consulta mais antiga
+            del resultados[next(iter(resultados))]
+        resultados[consulta] = (tamanho, isbns, posicoes)
+        return isbns, posicoes
+
+    # ------------------------- Prazos e atrasos -------------------------
+    def data_vencimento(self, id_usuario: str, isbn: str) -> Optional[date]:
+        """
+        Retorna a data de vencimento do empréstimo ativo, ou None se não houver empréstimo.
+        """
+        return self.emprestimos.vencimentos.get((id_usuario, isbn))
+
+    def emprestimos_vencidos(self, data_referencia: Optional[date] = None) -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data_vencimento) dos empréstimos atrasados na data de
+        referência (vencimento anterior a ela; padrão: hoje), do mais antigo ao mais recente.
+        Usa o índice de vencimentos: custa O(log d + k) para k empréstimos atrasados.
+        """
+        if data_referencia is None:
+            data_referencia = date.today()
+        usuarios = self.usuarios
+        catalogo = self.catalogo
+        for (id_usuario, isbn), vencimento in self.emprestimos.vencidos_entre(None, data_referencia):
+            yield usuarios[id_usuario], catalogo[isbn], vencimento
+
+    def processar_atrasos(self, data_referencia: Optional[date] = None) -> RelatorioAtrasos:
+        """
+        Processamento noturno: gera avisos para os empréstimos que venceram desde a última
+        execução e lança as multas dos dias de atraso decorridos desde então.
+
+        Cada dia de atraso é cobrado uma única vez: um empréstimo que já estava atrasado na
+        execução anterior paga apenas os dias desde ela; um que venceu depois paga os dias
+        desde o vencimento. Uma data igual ou anterior à última execução não lança nada.
+        """
+        if data_referencia is None:
+            data_referencia = date.today()
+        relatorio = RelatorioAtrasos(data_referencia)
+        anterior = self.ultimo_processamento
+        if anterior is not None and data_referencia <= anterior:
+            return relatorio
+
+        multa_diaria = self.multa_diaria
+        multas = relatorio.multas
+        if anterior is not None:
+            # Já atrasados na execução anterior: cobra só as noites desde então
+            valor = (data_referencia - anterior).days * multa_diaria
+            for (id_usuario, _), _ in self.emprestimos.vencidos_entre(None, anterior):
+                multas[id_usuario] = multas.get(id_usuario, 0) + valor
+        usuarios = self.usuarios
+        catalogo = self.catalogo
+        for (id_usuario, isbn), vencimento in self.emprestimos.vencidos_entre(anterior, data_referencia):
+            relatorio.avisos.append((usuarios[id_usuario], catalogo[isbn], vencimento))
+            multas[id_usuario] = multas.get(id_usuario, 0) + (data_referencia - vencimento).days * multa_diaria
+
+        acumuladas = self.multas
+        for id_usuario, valor in multas.items():
+            acumuladas[id_usuario] = acumuladas.get(id_usuario, 0) + valor
+        self.ultimo_processamento = data_referencia
         return relatorio
 
 
 # -----------------------------------------------------------
 # Funções Auxiliares de Interface de Console
 # -----------------------------------------------------------
+# Linhas por escrita na saída dos relatórios e consultas
+TAMANHO_BLOCO_SAIDA = 1000
+
+
+def escrever_linhas(linhas: Iterable[str], saida=None, tamanho_bloco: int = TAMANHO_BLOCO_SAIDA) -> int:
+    """
+    Escreve as linhas na saída (sys.stdout por padrão) em blocos de `tamanho_bloco`,
+    com uma chamada de write por bloco em vez de um print por linha, consumindo o
+    iterável aos poucos. Retorna a quantidade de linhas escritas.
+    """
+    if saida is None:
+        saida = sys.stdout
+    linhas = iter(linhas)
+    total = 0
+    while True:
+        bloco = list(islice(linhas, tamanho_bloco))
+        if not bloco:
+            break
+        saida.write("\n".join(bloco) + "\n")
+        total += len(bloco)
+    saida.flush()
+    return total
+
 
 def exibir_menu_principal():
     """
@@ -367,14 +1916,16 @@ def devolver_livro_interface(bib: Biblioteca):
 
 def consulta_livros_interface(bib: Biblioteca):
     """
-    Interface para consulta de livros por título, autor ou ano.
+    Interface para consulta de livros por título, autor, ano ou busca aproximada.
     """
     print("\n--- Consulta de Livros ---")
     print("Opções de busca:")
     print("1. Por título")
     print("2. Por autor")
     print("3. Por ano de publicação")
-    escolha = input("Selecione (1-3): ").strip()
+    print("4. Por período de publicação")
+    print("5. Busca aproximada (título ou autor, tolera erros de digitação)")
+    escolha = input("Selecione (1-5): ").strip()
 
     if escolha == '1':
         campo = 'titulo'
@@ -385,19 +1936,71 @@ def consulta_livros_interface(bib: Biblioteca):
     elif escolha == '3':
         campo = 'ano'
         termo = input("Digite o ano de publicação: ").strip()
+    elif escolha == '4':
+        campo = 'periodo'
+        try:
+            ano_inicio = int(input("Ano inicial: ").strip())
+            ano_fim = int(input("Ano final: ").strip())
+        except ValueError:
+            print("Erro: os anos do período devem ser números inteiros.")
+            return
+    elif escolha == '5':
+        campo = 'aproximada'
+        termo = input("Digite palavras do título ou do autor: ").strip()
     else:
         print("Opção de busca inválida.")
         return
 
-    resultados = bib.buscar_livros(campo, termo)
+    if campo == 'periodo':
+        resultados = bib.buscar_livros_por_periodo(ano_inicio, ano_fim)
+    elif campo == 'aproximada':
+        resultados = bib.buscar_livros_ranqueado(termo)
+    else:
+        resultados = bib.buscar_livros(campo, termo)
     if resultados:
         print(f"\nForam encontrados {len(resultados)} resultado(s):")
-        for livro in resultados:
-            print(f"- {livro}")
+        escrever_linhas(f"- {livro}" for livro in resultados)
     else:
         print("Nenhum livro encontrado para o critério informado.")
 
 
+RELATORIOS = ('disponiveis', 'emprestados', 'usuarios', 'emprestimos', 'atrasados')
+
+
+def linhas_relatorio(bib: Biblioteca, relatorio: str,
+                     data_referencia: Optional[date] = None) -> Tuple[str, int, Iterator[str]]:
+    """
+    Monta um dos RELATORIOS do console. Retorna (título do total, total, linhas). Livros,
+    usuários e empréstimos são gerados sob demanda pelos cursores, em ordem de chave
+    (ISBN, id_usuario ou (id_usuario, isbn)), sem montar a lista inteira. Os atrasados
+    são os vencidos em data_referencia (padrão: hoje), em ordem de vencimento.
+    """
+    if relatorio == 'disponiveis':
+        return ("Total de livros disponíveis", bib.contar_livros_disponiveis(),
+                (f"- {livro}" for livro in bib.cursor_livros_disponiveis()))
+    if relatorio == 'emprestados':
+        return ("Total de livros com cópias emprestadas", bib.contar_livros_emprestados(),
+                (f"- {livro} | Emprestadas: {livro.total_copias - livro.copias_disponiveis}"
+                 for livro in bib.cursor_livros_emprestados()))
+    if relatorio == 'usuarios':
+        return ("Total de usuários cadastrados", bib.contar_usuarios(),
+                (f"- {usuario}" for usuario in bib.cursor_usuarios()))
+    if relatorio == 'emprestimos':
+        return ("Total de empréstimos ativos", bib.contar_emprestimos_ativos(),
+                (f"- Usuário: {usuario.nome} (ID: {usuario.id_usuario}) | "
+                 f"Livro: '{livro.titulo}' (ISBN: {livro.isbn}) | Data do Empréstimo: {data_emp}"
+                 for usuario, livro, data_emp in bib.cursor_emprestimos_ativos()))
+    if relatorio == 'atrasados':
+        hoje = data_referencia or date.today()
+        atrasados = list(bib.emprestimos_vencidos(hoje))
+        return ("Total de empréstimos atrasados", len(atrasados),
+                (f"- Usuário: {usuario.nome} (ID: {usuario.id_usuario}) | "
+                 f"Livro: '{livro.titulo}' (ISBN: {livro.isbn}) | Vencimento: {vencimento} | "
+                 f"Dias de atraso: {(hoje - vencimento).days}"
+                 for usuario, livro, vencimento in atrasados))
+    raise ValueError(f"Relatório desconhecido: {relatorio!r}")
+
+
 def relatorios_interface(bib: Biblioteca):
     """
     Interface para geração de relatórios diversos.
@@ -408,45 +2011,215 @@ def relatorios_interface(bib: Biblioteca):
         print("2. Livros emprestados")
         print("3. Usuários cadastrados")
         print("4. Empréstimos ativos")
+        print("5. Empréstimos atrasados")
         print("0. Voltar ao menu principal")
-        escolha = input("Selecione (0-4): ").strip()
-
-        if escolha == '1':
-            disponiveis = bib.gerar_relatorio_livros_disponiveis()
-            print(f"\nTotal de livros disponíveis: {len(disponiveis)}")
-            for livro in disponiveis:
-                print(f"- {livro}")
-        elif escolha == '2':
-            emprestados = bib.gerar_relatorio_livros_emprestados()
-            print(f"\nTotal de livros com cópias emprestadas: {len(emprestados)}")
-            for livro in emprestados:
-                copias_emprestadas = livro.total_copias - livro.copias_disponiveis
-                print(f"- {livro} | Emprestadas: {copias_emprestadas}")
-        elif escolha == '3':
-            usuarios = bib.gerar_relatorio_usuarios()
-            print(f"\nTotal de usuários cadastrados: {len(usuarios)}")
-            for usuario in usuarios:
-                print(f"- {usuario}")
-        elif escolha == '4':
-            emprestimos_ativos = bib.gerar_relatorio_emprestimos_ativos()
-            print(f"\nTotal de empréstimos ativos: {len(emprestimos_ativos)}")
-            for usuario, livro, data_emp in emprestimos_ativos:
-                print(f"- Usuário: {usuario.nome} (ID: {usuario.id_usuario}) | "
-                      f"Livro: '{livro.titulo}' (ISBN: {livro.isbn}) | Data do Empréstimo: {data_emp}")
+        escolha = input("Selecione (0-5): ").strip()
+
+        if escolha in ('1', '2', '3', '4', '5'):
+            titulo, total, linhas = linhas_relatorio(bib, RELATORIOS[int(escolha) - 1])
+            print(f"\n{titulo}: {total}")
+            escrever_linhas(linhas)
         elif escolha == '0':
             break
         else:
             print("Opção inválida. Tente novamente.")
 
 
+# -----------------------------------------------------------
+# Modo em Lote (script de operações)
+# -----------------------------------------------------------
+# Uma operação por linha, com os campos separados por TAB; linhas em branco e
+# iniciadas por '#' são ignoradas. Datas no formato AAAA-MM-DD.
+#   L  titulo  autor  ano  isbn  total_copias   cadastrar livro
+#   U  nome  id_usuario  contato                cadastrar usuário
+#   E  id_usuario  isbn  [data]                 empréstimo (sem data: hoje)
+#   D  id_usuario  isbn                         devolução
+#   B  campo  termo                             consulta por titulo, autor, ano ou aproximada
+#   P  ano_inicio  ano_fim                      consulta por período
+#   R  relatorio  [data]                        um dos RELATORIOS (atrasados: na data, ou hoje)
+
+# Erros de uma operação que não interrompem o script (ValueError: campos inválidos)
+ERROS_SCRIPT = (
+    DuplicidadeLivroError,
+    DuplicidadeUsuarioError,
+    LivroNaoEncontradoError,
+    UsuarioNaoEncontradoError,
+    LivroIndisponivelError,
+    EmprestimoDuplicadoError,
+    DevolucaoInvalidaError,
+    ExcecaoDevolucaoInvalida,
+    ValueError,
+)
+
+
+class ResumoScript:
+    """
+    Resultado da execução de um script de operações.
+
+    Atributos:
+        operacoes (Dict[str, int]): operações concluídas, por código
+        erros (Dict[str, int]): operações com erro, por classe da exceção
+        primeiros_erros (List[Tuple[int, str]]): (número da linha, mensagem) dos primeiros erros
+        resultados (int): linhas produzidas por consultas e relatórios
+        duracao (float): tempo de execução, em segundos
+    """
+
+    ERROS_GUARDADOS = 10
+
+    def __init__(self):
+        self.operacoes: Dict[str, int] = {}
+        self.erros: Dict[str, int] = {}
+        self.primeiros_erros: List[Tuple[int, str]] = []
+        self.resultados = 0
+        self.duracao = 0.0
+
+    def registrar_erro(self, numero_linha: int, erro: Exception):
+        nome = type(erro).__name__
+        self.erros[nome] = self.erros.get(nome, 0) + 1
+        if len(self.primeiros_erros) < self.ERROS_GUARDADOS:
+            self.primeiros_erros.append((numero_linha, f"{nome}: {erro}"))
+
+    def __str__(self) -> str:
+        concluidas = sum(self.operacoes.values())
+        com_erro = sum(self.erros.values())
+        total = concluidas + com_erro
+        vazao = total / self.duracao if self.duracao > 0 else 0.0
+        linhas = [f"Operações: {total} | Concluídas: {concluidas} | Com erro: {com_erro} | "
+                  f"Resultados: {self.resultados} | Tempo: {self.duracao:.3f} s | Vazão: {vazao:,.0f} op/s"]
+        if self.operacoes:
+            linhas.append("Por operação: " + ", ".join(f"{codigo}={quantidade}"
+                                                      for codigo, quantidade in sorted(self.operacoes.items())))
+        if self.erros:
+            linhas.append("Erros: " + ", ".join(f"{nome}={quantidade}"
+                                               for nome, quantidade in sorted(self.erros.items())))
+            linhas += [f"  linha {numero}: {mensagem}" for numero, mensagem in self.primeiros_erros]
+        return "\n".join(linhas)
+
+
+def _script_data(texto: str) -> Optional[date]:
+    return date.fromisoformat(texto) if texto else None
+
+
+def _script_livro(bib: Biblioteca, titulo: str, autor: str, ano: str, isbn: str, total_copias: str):
+    bib.cadastrar_livro(titulo, autor, int(ano), isbn, int(total_copias))
+
+
+def _script_usuario(bib: Biblioteca, nome: str, id_usuario: str, contato: str):
+    bib.cadastrar_usuario(nome, id_usuario, contato)
+
+
+def _script_emprestar(bib: Biblioteca, id_usuario: str, isbn: str, data: str = ""):
+    bib.emprestar_livro(id_usuario, isbn, _script_data(data))
+
+
+def _script_devolver(bib: Biblioteca, id_usuario: str, isbn: str):
+    bib.devolver_livro(id_usuario, isbn)
+
+
+def _script_buscar(bib: Biblioteca, campo: str, termo: str) -> Iterator[str]:
+    if campo == 'aproximada':
+        resultados = bib.buscar_livros_ranqueado(termo)
+    elif campo in ('titulo', 'autor', 'ano'):
+        resultados = bib.buscar_livros(campo, termo)
+    else:
+        raise ValueError(f"Campo de busca desconhecido: {campo!r}")
+    return (f"- {livro}" for livro in resultados)
+
+
+def _script_periodo(bib: Biblioteca, ano_inicio: str, ano_fim: str) -> Iterator[str]:
+    return (f"- {livro}" for livro in bib.buscar_livros_por_periodo(int(ano_inicio), int(ano_fim)))
+
+
+def _script_relatorio(bib: Biblioteca, relatorio: str, data: str = "") -> Iterator[str]:
+    titulo, total, linhas = linhas_relatorio(bib, relatorio, _script_data(data))
+    yield f"{titulo}: {total}"
+    yield from linhas
+
+
+# código -> (função, campos obrigatórios, campos opcionais)
+OPERACOES_SCRIPT = {
+    'L': (_script_livro, 5, 0),
+    'U': (_script_usuario, 3, 0),
+    'E': (_script_emprestar, 2, 1),
+    'D': (_script_devolver, 2, 0),
+    'B': (_script_buscar, 2, 0),
+    'P': (_script_periodo, 2, 0),
+    'R': (_script_relatorio, 1, 1),
+}
+
+
+def executar_script(bib: Biblioteca, linhas: Iterable[str], saida=None) -> ResumoScript:
+    """
+    Executa um script de operações (ver o formato acima) o mais rápido possível, sem
+    prompts nem mensagens por operação. Consultas e relatórios são executados e as suas
+    linhas, formatadas como no console, são descartadas ou, com `saida`, escritas nela
+    (útil para comparar duas versões com o mesmo script); os erros também vão para
+    `saida`, como "! linha N: Classe: mensagem". Um erro não interrompe o script.
+    """
+    resumo = ResumoScript()
+    operacoes = resumo.operacoes
+    inicio = time.perf_counter()
+    for numero, linha in enumerate(linhas, 1):
+        linha = linha.rstrip('\r\n')
+        if not linha.strip() or linha.startswith('#'):
+            continue
+        codigo, *campos = [campo.strip() for campo in linha.split('\t')]
+        try:
+            operacao = OPERACOES_SCRIPT.get(codigo)
+            if operacao is None:
+                raise ValueError(f"Operação desconhecida: {codigo!r}")
+            funcao, obrigatorios, opcionais = operacao
+            if not obrigatorios <= len(campos) <= obrigatorios + opcionais:
+                raise ValueError(f"A operação {codigo} espera {obrigatorios} campo(s), recebeu {len(campos)}")
+            resultado = funcao(bib, *campos)
+            if resultado is not None:
+                if saida is None:
+                    resumo.resultados += sum(1 for _ in resultado)
+                else:
+                    resumo.resultados += escrever_linhas(resultado, saida)
+        except ERROS_SCRIPT as e:
+            resumo.registrar_erro(numero, e)
+            if saida is not None:
+                saida.write(f"! linha {numero}: {type(e).__name__}: {e}\n")
+        else:
+            operacoes[codigo] = operacoes.get(codigo, 0) + 1
+    resumo.duracao = time.perf_counter() - inicio
+    return resumo
+
+
+def executar_arquivo_script(bib: Biblioteca, caminho: str, saida: Optional[str] = None) -> ResumoScript:
+    """
+    Executa o script de um arquivo ('-' lê da entrada padrão), opcionalmente gravando
+    as linhas produzidas em outro arquivo, e retorna o resumo.
+    """
+    entrada = sys.stdin if caminho == '-' else open(caminho, encoding='utf-8')
+    destino = open(saida, 'w', encoding='utf-8') if saida else None
+    try:
+        return executar_script(bib, entrada, destino)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if destino is not None:
+            destino.close()
+
+
 # -----------------------------------------------------------
 # Função Principal
 # -----------------------------------------------------------
-def main():
+def main(biblioteca: Optional[Biblioteca] = None, script: Optional[str] = None,
+         saida_script: Optional[str] = None):
     """
     Ponto de entrada da aplicação. Exibe o menu principal e redireciona para as funcionalidades.
+    Opcionalmente recebe uma biblioteca já construída (por exemplo, uma versão persistente).
+    Com `script` (um arquivo, ou '-' para a entrada padrão), executa o script de operações
+    em vez do menu e exibe só o resumo (ver executar_script).
     """
-    biblioteca = Biblioteca()
+    if biblioteca is None:
+        biblioteca = Biblioteca()
+
+    if script is not None:
+        print(executar_arquivo_script(biblioteca, script, saida_script))
+        return
 
     while True:
         exibir_menu_principal()
@@ -471,5 +2244,17 @@ def main():
             print("Opção inválida. Por favor, selecione uma opção válida (0-6).")
 
 
+def adicionar_argumentos_script(parser: argparse.ArgumentParser):
+    """
+    Adiciona as opções do modo em lote (--script e --saida-script) a um parser.
+    """
+    parser.add_argument('--script', help="executa um script de operações (arquivo, ou '-' para "
+                                         "a entrada padrão) em vez do menu interativo")
+    parser.add_argument('--saida-script', help="arquivo onde gravar as linhas produzidas pelo script")
+
+
 if __name__ == '__main__':
-    main()
+    _parser = argparse.ArgumentParser(description="Sistema de Gerenciamento de Biblioteca.")
+    adicionar_argumentos_script(_parser)
+    _args = _parser.parse_args()
+    main(script=_args.script, saida_script=_args.saida_script)
@@ -142,4 +142,5 @@ def menu():
 
 
 # Execução do programa
-menu()
+if __name__ == '__main__':
+    menu()
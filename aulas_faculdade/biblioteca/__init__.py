@@ -0,0 +1,43 @@
+"""
+Extensões do Sistema de Gerenciamento de Biblioteca.
+
+O sistema principal está em "Projeto Integrador 2.py", cujo nome contém espaços
+e por isso não pode ser importado com `import`. Este pacote carrega esse arquivo
+como o módulo `aulas_faculdade.biblioteca.projeto` e reexporta suas classes,
+para que os módulos de extensão (persistência, benchmarks etc.) possam usá-las.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+_NOME_MODULO = __name__ + ".projeto"
+_CAMINHO_PROJETO = Path(__file__).resolve().parent.parent / "Projeto Integrador 2.py"
+
+
+def _carregar_projeto():
+    """
+    Carrega "Projeto Integrador 2.py" uma única vez e o registra em sys.modules.
+    """
+    if _NOME_MODULO in sys.modules:
+        return sys.modules[_NOME_MODULO]
+    spec = importlib.util.spec_from_file_location(_NOME_MODULO, _CAMINHO_PROJETO)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[_NOME_MODULO] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+projeto = _carregar_projeto()
+
+Biblioteca = projeto.Biblioteca
+Livro = projeto.Livro
+Usuario = projeto.Usuario
+DuplicidadeLivroError = projeto.DuplicidadeLivroError
+DuplicidadeUsuarioError = projeto.DuplicidadeUsuarioError
+LivroNaoEncontradoError = projeto.LivroNaoEncontradoError
+UsuarioNaoEncontradoError = projeto.UsuarioNaoEncontradoError
+LivroIndisponivelError = projeto.LivroIndisponivelError
+EmprestimoDuplicadoError = projeto.EmprestimoDuplicadoError
+DevolucaoInvalidaError = projeto.DevolucaoInvalidaError
+ExcecaoDevolucaoInvalida = projeto.ExcecaoDevolucaoInvalida
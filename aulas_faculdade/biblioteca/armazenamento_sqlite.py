@@ -0,0 +1,754 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+armazenamento_sqlite.py
+
+Implementação alternativa da Biblioteca com armazenamento em disco via `sqlite3`.
+
+A classe BibliotecaSQLite mantém as mesmas assinaturas de métodos e as mesmas
+exceções customizadas de "Projeto Integrador 2.py", de modo que as funções de
+console e de relatório funcionam sem alterações sobre ela. Os dados ficam no
+banco e só são convertidos em objetos Livro/Usuario quando retornados.
+"""
+
+import argparse
+import json
+import sqlite3
+from contextlib import contextmanager
+from datetime import date
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from . import (
+    Biblioteca,
+    DevolucaoInvalidaError,
+    DuplicidadeLivroError,
+    DuplicidadeUsuarioError,
+    EmprestimoDuplicadoError,
+    ExcecaoDevolucaoInvalida,
+    Livro,
+    LivroIndisponivelError,
+    LivroNaoEncontradoError,
+    Usuario,
+    UsuarioNaoEncontradoError,
+    projeto,
+)
+
+# -----------------------------------------------------------
+# Esquema do Banco
+# -----------------------------------------------------------
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS livros (
+    seq                INTEGER PRIMARY KEY,
+    isbn               TEXT NOT NULL UNIQUE,
+    titulo             TEXT NOT NULL,
+    autor              TEXT NOT NULL,
+    ano                INTEGER NOT NULL,
+    total_copias       INTEGER NOT NULL,
+    copias_disponiveis INTEGER NOT NULL,
+    titulo_busca       TEXT NOT NULL,
+    autor_busca        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_livros_ano ON livros (ano, seq);
+CREATE INDEX IF NOT EXISTS idx_livros_emprestados ON livros (seq)
+    WHERE copias_disponiveis < total_copias;
+
+CREATE TABLE IF NOT EXISTS usuarios (
+    seq        INTEGER PRIMARY KEY,
+    id_usuario TEXT NOT NULL UNIQUE,
+    nome       TEXT NOT NULL,
+    contato    TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS emprestimos (
+    seq             INTEGER PRIMARY KEY,
+    id_usuario      TEXT NOT NULL,
+    isbn            TEXT NOT NULL,
+    data_emprestimo INTEGER NOT NULL,
+    data_vencimento INTEGER NOT NULL,
+    UNIQUE (id_usuario, isbn)
+);
+CREATE INDEX IF NOT EXISTS idx_emprestimos_isbn ON emprestimos (isbn);
+CREATE INDEX IF NOT EXISTS idx_emprestimos_data ON emprestimos (data_emprestimo);
+
+CREATE TABLE IF NOT EXISTS multas (
+    id_usuario TEXT PRIMARY KEY,
+    valor      INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS estado (
+    chave TEXT PRIMARY KEY,
+    valor
+);
+"""
+
+# Criado depois da migração: bancos anteriores à versão 2 ainda não têm a coluna
+ESQUEMA_VENCIMENTOS = """
+CREATE INDEX IF NOT EXISTS idx_emprestimos_vencimento ON emprestimos (data_vencimento, seq);
+"""
+
+# PRAGMA user_version do esquema; a versão 1 passou a guardar nas colunas *_busca o
+# texto de projeto.normalizar_texto (sem acentos) em vez de str.lower, e a versão 2
+# guarda o vencimento de cada empréstimo, fixado no momento do empréstimo
+VERSAO_ESQUEMA = 2
+
+# Exceções de empréstimo/devolução registradas por par nas operações em lote
+ERROS_OPERACAO = (
+    UsuarioNaoEncontradoError,
+    LivroNaoEncontradoError,
+    LivroIndisponivelError,
+    EmprestimoDuplicadoError,
+    DevolucaoInvalidaError,
+    ExcecaoDevolucaoInvalida,
+)
+
+_COLUNAS_LIVRO = "titulo, autor, ano, isbn, total_copias, copias_disponiveis"
+_COLUNAS_USUARIO = "nome, id_usuario, contato"
+
+
+def _livro_de_linha(linha: tuple) -> Livro:
+    """
+    Constrói um objeto Livro a partir de uma linha (titulo, autor, ano, isbn, total, disponíveis).
+    """
+    titulo, autor, ano, isbn, total_copias, copias_disponiveis = linha
+    livro = Livro(titulo, autor, ano, isbn, total_copias)
+    livro.copias_disponiveis = copias_disponiveis
+    return livro
+
+
+# -----------------------------------------------------------
+# Classe BibliotecaSQLite
+# -----------------------------------------------------------
+class BibliotecaSQLite:
+    """
+    Biblioteca armazenada em um banco SQLite, com a mesma API de Biblioteca.
+
+    Cada operação de escrita roda em sua própria transação, a menos que esteja
+    dentro de um bloco `with bib.transacao():`, que agrupa várias operações em uma
+    única transação (muito mais rápido para cargas em lote). As consultas usam SQL
+    constante, reaproveitado pelo cache de comandos preparados do sqlite3.
+
+    Atributos:
+        caminho (str): arquivo do banco (ou ':memory:')
+        conexao (sqlite3.Connection): conexão aberta com o banco
+        prazo_emprestimo (int): prazo, em dias, dos novos empréstimos; o vencimento de cada
+            empréstimo é gravado quando ele é feito e consultado pelo índice por vencimento
+        multa_diaria (int): multa por dia de atraso, em centavos
+        indices_aproximados (Dict[str, IndiceAproximado]): índices de palavras em memória
+            para a busca aproximada, completados a partir das colunas *_busca
+    """
+
+    def __init__(self, caminho: str = ':memory:', prazo_emprestimo: int = projeto.PRAZO_EMPRESTIMO_DIAS,
+                 multa_diaria: int = projeto.MULTA_DIARIA_CENTAVOS):
+        self.caminho = caminho
+        self.prazo_emprestimo = prazo_emprestimo
+        self.multa_diaria = multa_diaria
+        self.conexao = sqlite3.connect(caminho, isolation_level=None, cached_statements=256)
+        self.conexao.execute("PRAGMA journal_mode = WAL")
+        self.conexao.execute("PRAGMA synchronous = NORMAL")
+        self.conexao.executescript(ESQUEMA)
+        self._profundidade_transacao = 0
+        self._migrar()
+        self.conexao.executescript(ESQUEMA_VENCIMENTOS)
+        self.indices_aproximados: Dict[str, projeto.IndiceAproximado] = {
+            campo: projeto.IndiceAproximado() for campo in Biblioteca.CAMPOS_TEXTO
+        }
+        self._seq_aproximado = 0
+
+    def _migrar(self):
+        """
+        Atualiza bancos criados por versões anteriores do esquema.
+        """
+        versao = self.conexao.execute("PRAGMA user_version").fetchone()[0]
+        if versao >= VERSAO_ESQUEMA:
+            return
+        with self.transacao():
+            if versao < 1:
+                self.conexao.create_function('normalizar_texto', 1, projeto.normalizar_texto, deterministic=True)
+                self.conexao.execute("UPDATE livros SET titulo_busca = normalizar_texto(titulo),"
+                                     " autor_busca = normalizar_texto(autor)")
+            colunas = {linha[1] for linha in self.conexao.execute("PRAGMA table_info(emprestimos)")}
+            if 'data_vencimento' not in colunas:
+                # Empréstimos anteriores à versão 2 vencem pelo prazo atual
+                self.conexao.execute("ALTER TABLE emprestimos ADD COLUMN data_vencimento INTEGER NOT NULL DEFAULT 0")
+                self.conexao.execute("UPDATE emprestimos SET data_vencimento = data_emprestimo + ?",
+                                     (self.prazo_emprestimo,))
+            self.conexao.execute(f"PRAGMA user_version = {VERSAO_ESQUEMA}")
+
+    # ------------------------- Transações -------------------------
+    @contextmanager
+    def transacao(self):
+        """
+        Agrupa as operações do bloco em uma única transação.
+        Se uma exceção escapar do bloco, todas as alterações são desfeitas.
+        """
+        if self._profundidade_transacao:
+            self._profundidade_transacao += 1
+            try:
+                yield
+            finally:
+                self._profundidade_transacao -= 1
+            return
+
+        self.conexao.execute("BEGIN IMMEDIATE")
+        self._profundidade_transacao = 1
+        try:
+            yield
+        except BaseException:
+            self.conexao.execute("ROLLBACK")
+            raise
+        else:
+            self.conexao.execute("COMMIT")
+        finally:
+            self._profundidade_transacao = 0
+
+    @contextmanager
+    def _operacao(self):
+        """
+        Executa uma operação de escrita atomicamente, com SAVEPOINT, para que uma
+        exceção desfaça apenas a operação corrente mesmo dentro de um lote.
+        """
+        with self.transacao():
+            self.conexao.execute("SAVEPOINT operacao")
+            try:
+                yield self.conexao
+            except BaseException:
+                self.conexao.execute("ROLLBACK TO operacao")
+                self.conexao.execute("RELEASE operacao")
+                raise
+            self.conexao.execute("RELEASE operacao")
+
+    def fechar(self):
+        """
+        Fecha a conexão com o banco.
+        """
+        self.conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    # ------------------------- Cadastros -------------------------
+    def cadastrar_livro(self, titulo: str, autor: str, ano: int, isbn: str, total_copias: int):
+        """
+        Cadastra um novo livro no catálogo.
+        Levanta DuplicidadeLivroError se já existir um livro com o ISBN informado.
+        """
+        with self._operacao() as con:
+            try:
+                con.execute(
+                    "INSERT INTO livros (isbn, titulo, autor, ano, total_copias, copias_disponiveis,"
+                    " titulo_busca, autor_busca) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (isbn, titulo, autor, ano, total_copias, total_copias,
+                     projeto.normalizar_texto(titulo), projeto.normalizar_texto(autor)))
+            except sqlite3.IntegrityError:
+                raise DuplicidadeLivroError(f"Já existe um livro cadastrado com ISBN {isbn}.") from None
+
+    def cadastrar_usuario(self, nome: str, id_usuario: str, contato: str):
+        """
+        Cadastra um novo usuário.
+        Levanta DuplicidadeUsuarioError se já existir um usuário com o ID informado.
+        """
+        with self._operacao() as con:
+            try:
+                con.execute("INSERT INTO usuarios (id_usuario, nome, contato) VALUES (?, ?, ?)",
+                            (id_usuario, nome, contato))
+            except sqlite3.IntegrityError:
+                raise DuplicidadeUsuarioError(f"Já existe um usuário cadastrado com ID {id_usuario}.") from None
+
+    def _chaves_existentes(self, tabela: str, coluna: str, lote: List[Tuple[int, object]],
+                           posicao: int) -> Set[str]:
+        """
+        Retorna, com uma única consulta, as chaves do lote (o campo `posicao` de cada
+        registro lido) que já estão cadastradas na tabela.
+        """
+        chaves = [valores[posicao].strip() for _, valores in lote
+                  if not isinstance(valores, str) and isinstance(valores[posicao], str)]
+        cursor = self.conexao.execute(
+            f"SELECT {coluna} FROM {tabela} WHERE {coluna} IN (SELECT value FROM json_each(?))",
+            (json.dumps(chaves),))
+        return {linha[0] for linha in cursor}
+
+    def importar_livros(self, caminho, formato: Optional[str] = None,
+                        tamanho_lote: int = projeto.TAMANHO_LOTE_IMPORTACAO) -> projeto.RelatorioImportacao:
+        """
+        Importa livros de um arquivo CSV ou JSONL, com as mesmas regras e o mesmo relatório
+        de Biblioteca.importar_livros. Cada lote é validado em memória (os ISBNs já
+        cadastrados vêm de uma consulta só) e gravado com executemany em uma transação.
+        """
+        relatorio = projeto.RelatorioImportacao()
+        registros = projeto._ler_registros(caminho, projeto.CAMPOS_LIVRO, formato)
+        posicao_isbn = projeto.CAMPOS_LIVRO.index('isbn')
+        normalizar = projeto.normalizar_texto
+        while True:
+            lote = list(islice(registros, tamanho_lote))
+            if not lote:
+                break
+            relatorio.lidos += len(lote)
+            with self.transacao():
+                existentes = self._chaves_existentes('livros', 'isbn', lote, posicao_isbn)
+                novos = projeto._validar_livros(lote, existentes, relatorio.erros)
+                self.conexao.executemany(
+                    "INSERT INTO livros (isbn, titulo, autor, ano, total_copias, copias_disponiveis,"
+                    " titulo_busca, autor_busca) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(livro.isbn, livro.titulo, livro.autor, livro.ano, livro.total_copias, livro.total_copias,
+                      normalizar(livro.titulo), normalizar(livro.autor)) for livro in novos])
+            relatorio.importados += len(novos)
+        return relatorio
+
+    def importar_usuarios(self, caminho, formato: Optional[str] = None,
+                          tamanho_lote: int = projeto.TAMANHO_LOTE_IMPORTACAO) -> projeto.RelatorioImportacao:
+        """
+        Importa usuários de um arquivo CSV ou JSONL, como importar_livros.
+        """
+        relatorio = projeto.RelatorioImportacao()
+        registros = projeto._ler_registros(caminho, projeto.CAMPOS_USUARIO, formato)
+        posicao_id = projeto.CAMPOS_USUARIO.index('id_usuario')
+        while True:
+            lote = list(islice(registros, tamanho_lote))
+            if not lote:
+                break
+            relatorio.lidos += len(lote)
+            with self.transacao():
+                existentes = self._chaves_existentes('usuarios', 'id_usuario', lote, posicao_id)
+                novos = projeto._validar_usuarios(lote, existentes, relatorio.erros)
+                self.conexao.executemany(
+                    "INSERT INTO usuarios (id_usuario, nome, contato) VALUES (?, ?, ?)",
+                    [(usuario.id_usuario, usuario.nome, usuario.contato) for usuario in novos])
+            relatorio.importados += len(novos)
+        return relatorio
+
+    # ------------------------- Empréstimos -------------------------
+    def _buscar_usuario_e_livro(self, con: sqlite3.Connection, id_usuario: str, isbn: str):
+        """
+        Retorna (nome do usuário, título, total de cópias, cópias disponíveis),
+        levantando as exceções de inexistência na mesma ordem da Biblioteca em memória.
+        """
+        usuario = con.execute("SELECT nome FROM usuarios WHERE id_usuario = ?", (id_usuario,)).fetchone()
+        if usuario is None:
+            raise UsuarioNaoEncontradoError(f"Usuário com ID {id_usuario} não encontrado.")
+        livro = con.execute("SELECT titulo, total_copias, copias_disponiveis FROM livros WHERE isbn = ?",
+                            (isbn,)).fetchone()
+        if livro is None:
+            raise LivroNaoEncontradoError(f"Livro com ISBN {isbn} não encontrado no catálogo.")
+        return (usuario[0],) + livro
+
+    def emprestar_livro(self, id_usuario: str, isbn: str, data_emprestimo: Optional[date] = None):
+        """
+        Realiza o empréstimo de um livro para um usuário.
+        Verifica existência de usuário e livro, disponibilidade e registra o empréstimo.
+        Se data_emprestimo não for informada, utiliza a data de hoje.
+        """
+        if data_emprestimo is None:
+            data_emprestimo = date.today()
+        with self._operacao() as con:
+            nome, titulo, _, disponiveis = self._buscar_usuario_e_livro(con, id_usuario, isbn)
+            if disponiveis <= 0:
+                raise LivroIndisponivelError(f"O livro '{titulo}' não possui cópias disponíveis.")
+            try:
+                con.execute("INSERT INTO emprestimos (id_usuario, isbn, data_emprestimo, data_vencimento)"
+                            " VALUES (?, ?, ?, ?)",
+                            (id_usuario, isbn, data_emprestimo.toordinal(),
+                             data_emprestimo.toordinal() + self.prazo_emprestimo))
+            except sqlite3.IntegrityError:
+                raise EmprestimoDuplicadoError(
+                    f"O usuário '{nome}' já possui o livro com ISBN {isbn}.") from None
+            con.execute("UPDATE livros SET copias_disponiveis = copias_disponiveis - 1 WHERE isbn = ?", (isbn,))
+
+    def devolver_livro(self, id_usuario: str, isbn: str):
+        """
+        Realiza a devolução de um livro por um usuário.
+        Verifica existência de usuário e livro, existência do empréstimo e atualiza cópias.
+        """
+        with self._operacao() as con:
+            nome, titulo, total, disponiveis = self._buscar_usuario_e_livro(con, id_usuario, isbn)
+            removidos = con.execute("DELETE FROM emprestimos WHERE id_usuario = ? AND isbn = ?",
+                                    (id_usuario, isbn)).rowcount
+            if not removidos:
+                raise DevolucaoInvalidaError(
+                    f"O usuário '{nome}' não possui o livro com ISBN {isbn} emprestado.")
+            if disponiveis >= total:
+                raise ExcecaoDevolucaoInvalida(
+                    f"Tentativa de devolver '{titulo}', mas todas as cópias já estão disponíveis.")
+            con.execute("UPDATE livros SET copias_disponiveis = copias_disponiveis + 1 WHERE isbn = ?", (isbn,))
+
+    def _aplicar_lote(self, operacao, pares) -> projeto.ResultadoLote:
+        """
+        Executa `operacao` para cada par dentro de um SAVEPOINT do lote inteiro;
+        se algum par falhar, o lote todo é desfeito.
+        """
+        erros: List[Optional[Exception]] = []
+        with self.transacao():
+            self.conexao.execute("SAVEPOINT lote")
+            try:
+                for id_usuario, isbn in pares:
+                    try:
+                        operacao(id_usuario, isbn)
+                    except ERROS_OPERACAO as e:
+                        erros.append(e)
+                    else:
+                        erros.append(None)
+            except BaseException:
+                self.conexao.execute("ROLLBACK TO lote")
+                self.conexao.execute("RELEASE lote")
+                raise
+            aplicado = not any(erros)
+            if not aplicado:
+                self.conexao.execute("ROLLBACK TO lote")
+            self.conexao.execute("RELEASE lote")
+        return projeto.ResultadoLote(aplicado, erros)
+
+    def emprestar_lote(self, pares, data_emprestimo: Optional[date] = None) -> projeto.ResultadoLote:
+        """
+        Empresta vários livros de uma vez, tudo ou nada (ver Biblioteca.emprestar_lote).
+        """
+        if data_emprestimo is None:
+            data_emprestimo = date.today()
+        return self._aplicar_lote(
+            lambda id_usuario, isbn: self.emprestar_livro(id_usuario, isbn, data_emprestimo), pares)
+
+    def devolver_lote(self, pares) -> projeto.ResultadoLote:
+        """
+        Devolve vários livros de uma vez, tudo ou nada (ver Biblioteca.devolver_lote).
+        """
+        return self._aplicar_lote(self.devolver_livro, pares)
+
+    # ------------------------- Consultas -------------------------
+    def buscar_livros(self, campo: str, valor_busca: str, limite: Optional[int] = None,
+                      apos: Optional[str] = None) -> List[Livro]:
+        """
+        Busca livros conforme o campo informado (titulo, autor ou ano).
+        Retorna lista de objetos Livro que correspondem ao critério de busca; com
+        `limite` e/ou `apos`, retorna só a página correspondente (ver cursor_busca).
+        """
+        return list(islice(self.cursor_busca(campo, valor_busca, apos), limite))
+
+    def cursor_busca(self, campo: str, valor_busca: str, apos: Optional[str] = None) -> Iterator[Livro]:
+        """
+        Gera os livros de buscar_livros, na ordem de cadastro, a partir do livro seguinte
+        ao ISBN `apos`. Se `apos` não estiver no catálogo, não gera nada.
+        """
+        if campo in ('titulo', 'autor'):
+            # As colunas *_busca guardam o texto já normalizado (projeto.normalizar_texto),
+            # preservando a mesma semântica da Biblioteca em memória.
+            filtro = f"instr({campo}_busca, ?) > 0"
+            parametros: tuple = (projeto.normalizar_texto(valor_busca),)
+        elif campo == 'ano':
+            try:
+                parametros = (int(valor_busca),)
+            except ValueError:
+                # Se não for um ano válido, ignora
+                return
+            filtro = "ano = ?"
+        else:
+            return
+        if apos is not None:
+            # Paginação por chave: continua depois da posição de cadastro do ISBN `apos`
+            filtro += " AND seq > (SELECT seq FROM livros WHERE isbn = ?)"
+            parametros += (apos,)
+        cursor = self.conexao.execute(
+            f"SELECT {_COLUNAS_LIVRO} FROM livros WHERE {filtro} ORDER BY seq", parametros)
+        for linha in cursor:
+            yield _livro_de_linha(linha)
+
+    def buscar_livros_pontuados(self, termo: str, limite: int = 10,
+                                campos: Iterable[str] = Biblioteca.CAMPOS_TEXTO) -> List[Tuple[float, Livro]]:
+        """
+        Busca aproximada com relevância (ver Biblioteca.buscar_livros_pontuados).
+        Antes de consultar, indexa em memória os livros cadastrados desde a última busca.
+        """
+        cursor = self.conexao.execute(
+            "SELECT seq, isbn, titulo_busca, autor_busca FROM livros WHERE seq > ? ORDER BY seq",
+            (self._seq_aproximado,))
+        indice_titulo = self.indices_aproximados['titulo']
+        indice_autor = self.indices_aproximados['autor']
+        for seq, isbn, titulo_busca, autor_busca in cursor:
+            indice_titulo.adicionar(isbn, titulo_busca)
+            indice_autor.adicionar(isbn, autor_busca)
+            self._seq_aproximado = seq
+
+        resultados = []
+        for isbn, pontuacao in projeto.ranquear_busca(self.indices_aproximados, Biblioteca.PESOS_BUSCA,
+                                                      termo, limite, campos):
+            linha = self.conexao.execute(f"SELECT {_COLUNAS_LIVRO} FROM livros WHERE isbn = ?", (isbn,)).fetchone()
+            if linha is not None:
+                resultados.append((pontuacao, _livro_de_linha(linha)))
+        return resultados
+
+    def buscar_livros_ranqueado(self, termo: str, limite: int = 10,
+                                campos: Iterable[str] = Biblioteca.CAMPOS_TEXTO) -> List[Livro]:
+        """
+        Retorna os livros de buscar_livros_pontuados, do mais ao menos relevante.
+        """
+        return [livro for _, livro in self.buscar_livros_pontuados(termo, limite, campos)]
+
+    def buscar_livros_por_periodo(self, ano_inicio: int, ano_fim: int) -> List[Livro]:
+        """
+        Retorna os livros publicados entre ano_inicio e ano_fim (inclusive),
+        ordenados por ano e, dentro do mesmo ano, pela ordem de cadastro.
+        """
+        cursor = self.conexao.execute(
+            f"SELECT {_COLUNAS_LIVRO} FROM livros WHERE ano BETWEEN ? AND ? ORDER BY ano, seq",
+            (ano_inicio, ano_fim))
+        return [_livro_de_linha(linha) for linha in cursor]
+
+    # ------------------------- Relatórios -------------------------
+    def gerar_relatorio_livros_disponiveis(self, limite: Optional[int] = None,
+                                           apos: Optional[str] = None) -> List[Livro]:
+        """
+        Retorna lista de livros com cópias disponíveis para empréstimo. Com `limite`
+        e/ou `apos`, retorna a página em ordem de ISBN.
+        """
+        if limite is not None or apos is not None:
+            return list(self._cursor_livros("copias_disponiveis > 0", apos, limite))
+        cursor = self.conexao.execute(
+            f"SELECT {_COLUNAS_LIVRO} FROM livros WHERE copias_disponiveis > 0 ORDER BY seq")
+        return [_livro_de_linha(linha) for linha in cursor]
+
+    def gerar_relatorio_livros_emprestados(self, limite: Optional[int] = None,
+                                           apos: Optional[str] = None) -> List[Livro]:
+        """
+        Retorna lista de livros que estão com alguma cópia emprestada. Com `limite`
+        e/ou `apos`, retorna a página em ordem de ISBN.
+        """
+        if limite is not None or apos is not None:
+            return list(self._cursor_livros("copias_disponiveis < total_copias", apos, limite))
+        cursor = self.conexao.execute(
+            f"SELECT {_COLUNAS_LIVRO} FROM livros WHERE copias_disponiveis < total_copias ORDER BY seq")
+        return [_livro_de_linha(linha) for linha in cursor]
+
+    # ------------------------- Cursores (paginação por chave) -------------------------
+    def _cursor_livros(self, filtro: str, apos: Optional[str], limite: Optional[int] = None) -> Iterator[Livro]:
+        """
+        Gera, em ordem de ISBN, os livros que satisfazem o filtro SQL, a partir do ISBN
+        seguinte a `apos`. A condição `isbn > ?` usa o índice único de isbn, então cada
+        página custa o mesmo, sem OFFSET.
+        """
+        if apos is not None:
+            filtro += " AND isbn > ?"
+        cursor = self.conexao.execute(
+            f"SELECT {_COLUNAS_LIVRO} FROM livros WHERE {filtro} ORDER BY isbn LIMIT ?",
+            (() if apos is None else (apos,)) + (-1 if limite is None else limite,))
+        for linha in cursor:
+            yield _livro_de_linha(linha)
+
+    def cursor_livros_disponiveis(self, apos: Optional[str] = None) -> Iterator[Livro]:
+        """
+        Gera os livros com cópias disponíveis em ordem de ISBN, após o ISBN `apos`.
+        """
+        return self._cursor_livros("copias_disponiveis > 0", apos)
+
+    def cursor_livros_emprestados(self, apos: Optional[str] = None) -> Iterator[Livro]:
+        """
+        Gera os livros com alguma cópia emprestada em ordem de ISBN, após o ISBN `apos`.
+        """
+        return self._cursor_livros("copias_disponiveis < total_copias", apos)
+
+    def cursor_usuarios(self, apos: Optional[str] = None) -> Iterator[Usuario]:
+        """
+        Gera os usuários em ordem de id_usuario, após o id `apos`.
+        """
+        if apos is None:
+            cursor = self.conexao.execute(f"SELECT {_COLUNAS_USUARIO} FROM usuarios ORDER BY id_usuario")
+        else:
+            cursor = self.conexao.execute(
+                f"SELECT {_COLUNAS_USUARIO} FROM usuarios WHERE id_usuario > ? ORDER BY id_usuario", (apos,))
+        for linha in cursor:
+            yield Usuario(*linha)
+
+    def cursor_emprestimos_ativos(self, apos: Optional[Tuple[str, str]] = None
+                                  ) -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data_emprestimo) em ordem de (id_usuario, isbn),
+        após o par `apos`; usa o índice único (id_usuario, isbn) de emprestimos.
+        """
+        if apos is None:
+            return self._iterar_emprestimos(ordem="e.id_usuario, e.isbn")
+        return self._iterar_emprestimos("WHERE (e.id_usuario, e.isbn) > (?, ?)", tuple(apos),
+                                        "e.id_usuario, e.isbn")
+
+    def contar_livros_disponiveis(self) -> int:
+        """
+        Retorna a quantidade de livros com cópias disponíveis, sem montar a lista.
+        """
+        return self.conexao.execute("SELECT count(*) FROM livros WHERE copias_disponiveis > 0").fetchone()[0]
+
+    def contar_livros_emprestados(self) -> int:
+        """
+        Retorna a quantidade de livros com alguma cópia emprestada, sem montar a lista.
+        """
+        return self.conexao.execute(
+            "SELECT count(*) FROM livros WHERE copias_disponiveis < total_copias").fetchone()[0]
+
+    def gerar_relatorio_usuarios(self, limite: Optional[int] = None,
+                                 apos: Optional[str] = None) -> List[Usuario]:
+        """
+        Retorna lista de todos os usuários cadastrados. Com `limite` e/ou `apos`,
+        retorna a página em ordem de id_usuario.
+        """
+        if limite is not None or apos is not None:
+            return list(islice(self.cursor_usuarios(apos), limite))
+        cursor = self.conexao.execute(f"SELECT {_COLUNAS_USUARIO} FROM usuarios ORDER BY seq")
+        return [Usuario(*linha) for linha in cursor]
+
+    def contar_usuarios(self) -> int:
+        """
+        Retorna a quantidade de usuários cadastrados, sem montar a lista.
+        """
+        return self.conexao.execute("SELECT count(*) FROM usuarios").fetchone()[0]
+
+    def _iterar_emprestimos(self, filtro: str = "", parametros: tuple = (), ordem: str = "e.seq",
+                            coluna_data: str = "e.data_emprestimo") -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data) dos empréstimos que satisfazem o filtro SQL, com a
+        data de `coluna_data` (a do empréstimo, por padrão).
+        """
+        cursor = self.conexao.execute(
+            "SELECT u.nome, u.id_usuario, u.contato, "
+            f"l.titulo, l.autor, l.ano, l.isbn, l.total_copias, l.copias_disponiveis, {coluna_data} "
+            "FROM emprestimos e JOIN usuarios u ON u.id_usuario = e.id_usuario "
+            f"JOIN livros l ON l.isbn = e.isbn {filtro} ORDER BY {ordem}", parametros)
+        for linha in cursor:
+            yield Usuario(*linha[:3]), _livro_de_linha(linha[3:9]), date.fromordinal(linha[9])
+
+    def gerar_relatorio_emprestimos_ativos(self, limite: Optional[int] = None,
+                                           apos: Optional[Tuple[str, str]] = None
+                                           ) -> List[Tuple[Usuario, Livro, date]]:
+        """
+        Retorna lista de tuplas (Usuario, Livro, data_emprestimo) para cada empréstimo ativo.
+        Com `limite` e/ou `apos` (par id_usuario, isbn), retorna a página em ordem de
+        (id_usuario, isbn).
+        """
+        if limite is not None or apos is not None:
+            return list(islice(self.cursor_emprestimos_ativos(apos), limite))
+        return list(self._iterar_emprestimos())
+
+    def iterar_emprestimos_ativos(self) -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data_emprestimo) para cada empréstimo ativo, na ordem
+        dos empréstimos, sem montar a lista inteira.
+        """
+        return self._iterar_emprestimos()
+
+    def contar_emprestimos_ativos(self) -> int:
+        """
+        Retorna a quantidade de empréstimos ativos.
+        """
+        return self.conexao.execute("SELECT count(*) FROM emprestimos").fetchone()[0]
+
+    def emprestimos_do_livro(self, isbn: str) -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data_emprestimo) dos usuários que estão com o ISBN informado.
+        """
+        if self.conexao.execute("SELECT 1 FROM livros WHERE isbn = ?", (isbn,)).fetchone() is None:
+            raise LivroNaoEncontradoError(f"Livro com ISBN {isbn} não encontrado no catálogo.")
+        return self._iterar_emprestimos("WHERE e.isbn = ?", (isbn,))
+
+    def emprestimos_do_usuario(self, id_usuario: str) -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data_emprestimo) dos empréstimos ativos de um usuário.
+        """
+        if self.conexao.execute("SELECT 1 FROM usuarios WHERE id_usuario = ?", (id_usuario,)).fetchone() is None:
+            raise UsuarioNaoEncontradoError(f"Usuário com ID {id_usuario} não encontrado.")
+        return self._iterar_emprestimos("WHERE e.id_usuario = ?", (id_usuario,))
+
+    def emprestimos_entre(self, data_inicio: date, data_fim: date) -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data_emprestimo) dos empréstimos feitos entre
+        data_inicio e data_fim (inclusive), em ordem de data.
+        """
+        return self._iterar_emprestimos("WHERE e.data_emprestimo BETWEEN ? AND ?",
+                                        (data_inicio.toordinal(), data_fim.toordinal()),
+                                        "e.data_emprestimo, e.seq")
+
+    def data_vencimento(self, id_usuario: str, isbn: str) -> Optional[date]:
+        """
+        Retorna a data de vencimento do empréstimo ativo, ou None se não houver empréstimo.
+        """
+        linha = self.conexao.execute("SELECT data_vencimento FROM emprestimos WHERE id_usuario = ? AND isbn = ?",
+                                     (id_usuario, isbn)).fetchone()
+        if linha is None:
+            return None
+        return date.fromordinal(linha[0])
+
+    def emprestimos_vencidos(self, data_referencia: Optional[date] = None) -> Iterator[Tuple[Usuario, Livro, date]]:
+        """
+        Gera tuplas (Usuario, Livro, data_vencimento) dos empréstimos atrasados na data de
+        referência (vencimento anterior a ela; padrão: hoje), do mais antigo ao mais recente.
+        """
+        if data_referencia is None:
+            data_referencia = date.today()
+        return self._iterar_emprestimos("WHERE e.data_vencimento < ?", (data_referencia.toordinal(),),
+                                        "e.data_vencimento, e.seq", "e.data_vencimento")
+
+    # ------------------------- Atrasos e Multas -------------------------
+    @property
+    def multas(self) -> Dict[str, int]:
+        """
+        Multas acumuladas por id_usuario, em centavos.
+        """
+        return dict(self.conexao.execute("SELECT id_usuario, valor FROM multas"))
+
+    @property
+    def ultimo_processamento(self) -> Optional[date]:
+        """
+        Data da última execução de processar_atrasos (None se nunca executado).
+        """
+        linha = self.conexao.execute("SELECT valor FROM estado WHERE chave = 'ultimo_processamento'").fetchone()
+        return None if linha is None else date.fromordinal(linha[0])
+
+    def processar_atrasos(self, data_referencia: Optional[date] = None) -> projeto.RelatorioAtrasos:
+        """
+        Processamento noturno: gera avisos para os empréstimos que venceram desde a última
+        execução e lança as multas dos dias de atraso decorridos desde então (mesmas regras
+        de Biblioteca.processar_atrasos). Roda em uma única transação.
+        """
+        if data_referencia is None:
+            data_referencia = date.today()
+        relatorio = projeto.RelatorioAtrasos(data_referencia)
+        with self._operacao() as con:
+            anterior = self.ultimo_processamento
+            if anterior is not None and data_referencia <= anterior:
+                return relatorio
+
+            multas = relatorio.multas
+            if anterior is not None:
+                # Já atrasados na execução anterior: cobra só as noites desde então
+                valor = (data_referencia - anterior).days * self.multa_diaria
+                for id_usuario, in con.execute("SELECT id_usuario FROM emprestimos WHERE data_vencimento < ?"
+                                               " ORDER BY data_vencimento, seq", (anterior.toordinal(),)):
+                    multas[id_usuario] = multas.get(id_usuario, 0) + valor
+            inicio = 0 if anterior is None else anterior.toordinal()
+            for usuario, livro, vencimento in self._iterar_emprestimos(
+                    "WHERE e.data_vencimento >= ? AND e.data_vencimento < ?",
+                    (inicio, data_referencia.toordinal()), "e.data_vencimento, e.seq", "e.data_vencimento"):
+                relatorio.avisos.append((usuario, livro, vencimento))
+                multas[usuario.id_usuario] = (multas.get(usuario.id_usuario, 0)
+                                              + (data_referencia - vencimento).days * self.multa_diaria)
+
+            con.executemany("INSERT INTO multas (id_usuario, valor) VALUES (?, ?)"
+                            " ON CONFLICT (id_usuario) DO UPDATE SET valor = valor + excluded.valor",
+                            multas.items())
+            con.execute("INSERT OR REPLACE INTO estado (chave, valor) VALUES ('ultimo_processamento', ?)",
+                        (data_referencia.toordinal(),))
+        return relatorio
+
+
+def main():
+    """
+    Executa o menu de console sobre uma biblioteca armazenada em SQLite.
+    """
+    parser = argparse.ArgumentParser(description="Biblioteca armazenada em SQLite.")
+    parser.add_argument('banco', help="arquivo do banco SQLite")
+    projeto.adicionar_argumentos_script(parser)
+    args = parser.parse_args()
+
+    with BibliotecaSQLite(args.banco) as bib:
+        projeto.main(bib, args.script, args.saida_script)
+
+
+if __name__ == '__main__':
+    main()
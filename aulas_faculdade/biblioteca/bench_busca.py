@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_busca.py
+
+Benchmark da busca aproximada (buscar_livros_ranqueado) em um catálogo sintético
+com títulos em português: mede a construção dos índices de palavras e a latência das
+consultas, que usam palavras sem acento e com um erro de digitação.
+
+O vocabulário é gerado por sílabas, com acentos, e as palavras dos títulos seguem
+uma distribuição de Zipf (poucas palavras muito frequentes, muitas raras), como em
+um acervo real; o ranking começa depois das PALAVRAS_COMUNS, que são sorteadas à parte. Cada consulta sorteia duas palavras de um título do catálogo,
+remove os acentos e introduz um erro (troca, remoção, inserção ou transposição).
+
+Uso:
+    python -m aulas_faculdade.biblioteca.bench_busca --livros 1000000 --consultas 500
+"""
+
+import argparse
+import gc
+import random
+import time
+from itertools import accumulate
+
+from . import Biblioteca, Livro, projeto
+
+SILABAS = ("ca", "ma", "ção", "ra", "te", "lo", "ri", "sa", "ne", "vi", "pé", "do", "gu", "lá",
+           "mo", "to", "ções", "bra", "sil", "ê", "nha", "ar", "es", "cu", "fé", "ro", "di", "ão")
+PALAVRAS_COMUNS = ("o", "a", "de", "da", "do", "e", "em", "os", "as", "um", "uma", "no", "na")
+
+
+def gerar_vocabulario(tamanho: int, rng: random.Random) -> list:
+    """
+    Gera `tamanho` palavras distintas de 2 a 4 sílabas, em ordem aleatória (a posição
+    define a frequência).
+    """
+    palavras = set()
+    while len(palavras) < tamanho:
+        palavras.add("".join(rng.choice(SILABAS) for _ in range(rng.randint(2, 4))))
+    palavras = sorted(palavras)
+    rng.shuffle(palavras)
+    return palavras
+
+
+def gerar_titulos(n_livros: int, vocabulario: list, rng: random.Random) -> list:
+    """
+    Gera n_livros títulos de 2 a 6 palavras, com frequências de Zipf.
+    """
+    deslocamento = len(PALAVRAS_COMUNS)
+    pesos_acumulados = list(accumulate(1.0 / (deslocamento + posicao)
+                                       for posicao in range(1, len(vocabulario) + 1)))
+    titulos = []
+    for _ in range(n_livros):
+        palavras = rng.choices(vocabulario, cum_weights=pesos_acumulados, k=rng.randint(2, 5))
+        if rng.random() < 0.5:
+            palavras.insert(rng.randrange(len(palavras)), rng.choice(PALAVRAS_COMUNS))
+        palavras[0] = palavras[0].capitalize()
+        titulos.append(" ".join(palavras))
+    return titulos
+
+
+def errar(palavra: str, rng: random.Random) -> str:
+    """
+    Introduz um erro de digitação (troca, remoção, inserção ou transposição).
+    """
+    if len(palavra) < projeto.IndiceAproximado.TAMANHO_MINIMO:
+        return palavra
+    i = rng.randrange(len(palavra) - 1)
+    tipo = rng.randrange(4)
+    if tipo == 0:
+        return palavra[:i] + rng.choice("aeiourst") + palavra[i + 1:]
+    if tipo == 1:
+        return palavra[:i] + palavra[i + 1:]
+    if tipo == 2:
+        return palavra[:i] + rng.choice("aeiourst") + palavra[i:]
+    return palavra[:i] + palavra[i + 1] + palavra[i] + palavra[i + 2:]
+
+
+def gerar_consultas(titulos: list, n_consultas: int, rng: random.Random) -> list:
+    """
+    Sorteia duas palavras de títulos do catálogo, sem acentos e com um erro na mais longa.
+    """
+    consultas = []
+    while len(consultas) < n_consultas:
+        palavras = [p for p in projeto.normalizar_texto(rng.choice(titulos)).split()
+                    if p not in PALAVRAS_COMUNS]
+        if len(palavras) < 2:
+            continue
+        escolhidas = rng.sample(palavras, 2)
+        escolhidas.sort(key=len)
+        escolhidas[-1] = errar(escolhidas[-1], rng)
+        consultas.append(" ".join(escolhidas))
+    return consultas
+
+
+def percentil(tempos: list, fracao: float) -> float:
+    return tempos[min(len(tempos) - 1, int(fracao * len(tempos)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da busca aproximada com relevância.")
+    parser.add_argument('--livros', type=int, default=1_000_000)
+    parser.add_argument('--vocabulario', type=int, default=50_000)
+    parser.add_argument('--consultas', type=int, default=500)
+    parser.add_argument('--limite', type=int, default=10, help="resultados por consulta (top-k)")
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.semente)
+    vocabulario = gerar_vocabulario(args.vocabulario, rng)
+    titulos = gerar_titulos(args.livros, vocabulario, rng)
+    consultas = gerar_consultas(titulos, args.consultas, rng)
+
+    bib = Biblioteca()
+    with projeto._sem_coleta_de_lixo():
+        bib._adicionar_livros([Livro(titulo, f"Autor {i % 20000}", 1900 + i % 125, f"isbn-{i}", 1)
+                               for i, titulo in enumerate(titulos)])
+    del titulos
+    inicio = time.perf_counter()
+    bib.buscar_livros('titulo', 'aquecimento')
+    t_trigramas = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    bib.buscar_livros_ranqueado('aquecimento')
+    t_aproximados = time.perf_counter() - inicio
+    gc.collect()
+    gc.freeze()
+    indice = bib.indices_aproximados['titulo']
+    print(f"{args.livros:,} livros | vocabulário de títulos: {len(indice.postagens):,} palavras | "
+          f"variantes de deleção: {len(indice.delecoes):,}")
+    print(f"índices de trigramas: {t_trigramas:.1f} s | índices aproximados: {t_aproximados:.1f} s")
+
+    tempos = []
+    sem_resultado = 0
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        resultados = bib.buscar_livros_ranqueado(consulta, args.limite)
+        tempos.append(time.perf_counter() - inicio)
+        sem_resultado += not resultados
+    tempos.sort()
+    print(f"\n{len(consultas)} consultas (top-{args.limite}), ex.: {consultas[0]!r} -> "
+          f"{[livro.titulo for livro in bib.buscar_livros_ranqueado(consultas[0], 3)]}")
+    print(f"mediana {percentil(tempos, 0.5) * 1000:.2f} ms | p95 {percentil(tempos, 0.95) * 1000:.2f} ms | "
+          f"p99 {percentil(tempos, 0.99) * 1000:.2f} ms | máx {tempos[-1] * 1000:.2f} ms | "
+          f"sem resultado: {sem_resultado}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_concorrencia.py
+
+Teste de estresse e benchmark multithread da BibliotecaConcorrente.
+
+Várias threads emprestam e devolvem livros com poucas cópias, disputando os mesmos
+exemplares. Ao final de cada rodada o estado é conferido:
+- nenhum livro fica com cópias disponíveis negativas ou acima do total;
+- para cada livro, as cópias emprestadas batem com os empréstimos registrados.
+A vazão (operações/s) é reportada para cada quantidade de threads.
+
+Uso:
+    python -m aulas_faculdade.biblioteca.bench_concorrencia --threads 1 2 4 8 --operacoes 200000
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+from . import (
+    DevolucaoInvalidaError,
+    EmprestimoDuplicadoError,
+    LivroIndisponivelError,
+)
+from .concorrencia import BibliotecaConcorrente
+
+ERROS_ESPERADOS = (LivroIndisponivelError, EmprestimoDuplicadoError, DevolucaoInvalidaError)
+
+
+def montar_biblioteca(n_livros: int, n_usuarios: int, copias: int) -> BibliotecaConcorrente:
+    """
+    Cria uma biblioteca com poucos exemplares por livro, para forçar disputa.
+    """
+    bib = BibliotecaConcorrente()
+    for i in range(n_livros):
+        bib.cadastrar_livro(f"Livro {i}", f"Autor {i % 50}", 2000, f"isbn-{i}", copias)
+    for i in range(n_usuarios):
+        bib.cadastrar_usuario(f"Usuário {i}", f"u{i}", "contato")
+    return bib
+
+
+def trabalhador(bib: BibliotecaConcorrente, operacoes: int, n_livros: int, n_usuarios: int,
+                semente: int, barreira: threading.Barrier):
+    """
+    Executa empréstimos e devoluções aleatórias, individuais e em lote.
+    """
+    aleatorio = random.Random(semente)
+    barreira.wait()
+    for _ in range(operacoes):
+        id_usuario = f"u{aleatorio.randrange(n_usuarios)}"
+        isbn = f"isbn-{aleatorio.randrange(n_livros)}"
+        try:
+            sorteio = aleatorio.random()
+            if sorteio < 0.45:
+                bib.emprestar_livro(id_usuario, isbn)
+            elif sorteio < 0.9:
+                bib.devolver_livro(id_usuario, isbn)
+            else:
+                # Balcão: pilha de livros para o mesmo usuário, em lote tudo-ou-nada
+                pilha = [(id_usuario, f"isbn-{aleatorio.randrange(n_livros)}") for _ in range(3)]
+                if sorteio < 0.95:
+                    bib.emprestar_lote(pilha)
+                else:
+                    bib.devolver_lote(pilha)
+        except ERROS_ESPERADOS:
+            pass
+
+
+def verificar(bib: BibliotecaConcorrente):
+    """
+    Confere que nenhuma cópia foi emprestada além do total e que, para cada livro,
+    as cópias emprestadas batem com os empréstimos registrados.
+    """
+    for isbn, livro in bib.catalogo.items():
+        if not 0 <= livro.copias_disponiveis <= livro.total_copias:
+            raise AssertionError(f"{isbn}: {livro.copias_disponiveis}/{livro.total_copias} cópias disponíveis")
+        emprestadas = livro.total_copias - livro.copias_disponiveis
+        registrados = len(bib.emprestimos.do_livro(isbn))
+        if emprestadas != registrados:
+            raise AssertionError(f"{isbn}: {emprestadas} cópias emprestadas, {registrados} empréstimos registrados")
+
+
+def rodar(n_threads: int, operacoes: int, n_livros: int, n_usuarios: int, copias: int) -> float:
+    """
+    Executa uma rodada com n_threads e retorna a vazão em operações/s.
+    """
+    bib = montar_biblioteca(n_livros, n_usuarios, copias)
+    por_thread = operacoes // n_threads
+    barreira = threading.Barrier(n_threads + 1)
+    threads = [threading.Thread(target=trabalhador,
+                                args=(bib, por_thread, n_livros, n_usuarios, semente, barreira))
+               for semente in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    barreira.wait()
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+    verificar(bib)
+    return por_thread * n_threads / duracao
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estresse multithread da BibliotecaConcorrente.")
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--operacoes', type=int, default=200_000)
+    parser.add_argument('--livros', type=int, default=500)
+    parser.add_argument('--usuarios', type=int, default=200)
+    parser.add_argument('--copias', type=int, default=2)
+    args = parser.parse_args()
+
+    # Trocas de thread frequentes aumentam a chance de expor condições de corrida
+    sys.setswitchinterval(1e-6)
+
+    print(f"{'threads':>8}{'ops/s':>14}")
+    for n_threads in args.threads:
+        vazao = rodar(n_threads, args.operacoes, args.livros, args.usuarios, args.copias)
+        print(f"{n_threads:>8}{vazao:>14,.0f}   estado verificado: cópias e registro de empréstimos consistentes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_inicializacao.py
+
+Benchmark de inicialização do servidor com persistência: mede o tempo entre o início
+do processo e a primeira resposta servida, com o estado em um snapshot mapeado
+(snapshot_mapeado.py) de milhões de livros e usuários.
+
+O snapshot sintético é escrito direto no formato mapeável, sem montar a biblioteca
+em memória. Cada rodada inicia `servidor.py --dados DIR --snapshot-mapeado` em um
+processo novo, conecta assim que a porta abre e envia consultas de leitura (os
+empréstimos de um usuário e de um livro), para que todas as rodadas partam do mesmo
+estado. Com --comparar-pickle, o mesmo estado é regravado no snapshot em pickle e o
+servidor é medido também nesse formato (use com catálogos menores: a carga em
+pickle reconstrói todos os objetos).
+
+Uso:
+    python -m aulas_faculdade.biblioteca.bench_inicializacao --livros 10000000 --usuarios 2000000
+"""
+
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from .persistencia import BibliotecaPersistente, gravar_snapshot
+from .snapshot_mapeado import escrever_snapshot_mapeado
+
+
+def isbn_sintetico(i: int) -> str:
+    return f"978{i:010d}"
+
+
+def id_sintetico(j: int) -> str:
+    return f"u{j:07d}"
+
+
+def gerar_snapshot(caminho: Path, n_livros: int, n_usuarios: int, n_emprestimos: int):
+    """
+    Escreve um snapshot mapeado sintético: um livro a cada `passo` tem uma de suas duas
+    cópias emprestada, para os usuários em rodízio.
+    """
+    passo = max(1, n_livros // max(1, n_emprestimos))
+    inicio = date(2024, 1, 1)
+    emprestados = range(0, min(n_livros, passo * n_emprestimos), passo)
+    livros = ((f"Livro {i}", f"Autor {i % 50_000}", 1900 + i % 125, isbn_sintetico(i), 2,
+               1 if i % passo == 0 and i < passo * n_emprestimos else 2)
+              for i in range(n_livros))
+    usuarios = ((f"Usuário {j}", id_sintetico(j), f"u{j}@exemplo.org") for j in range(n_usuarios))
+    emprestimos = ((id_sintetico(k % n_usuarios), isbn_sintetico(i), inicio + timedelta(days=k % 30),
+                    inicio + timedelta(days=k % 30 + 14))
+                   for k, i in enumerate(emprestados))
+    with open(caminho, 'wb') as arquivo:
+        escrever_snapshot_mapeado(arquivo, livros, usuarios, emprestimos)
+
+
+def porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def medir_inicio(diretorio: Path, mapeado: bool, consultas: list) -> dict:
+    """
+    Inicia o servidor, espera a porta abrir e mede o tempo até cada resposta.
+    Retorna os tempos (s, desde o início do processo) e a memória residente do servidor.
+    """
+    porta = porta_livre()
+    comando = [sys.executable, '-m', 'aulas_faculdade.biblioteca.servidor',
+               '--porta', str(porta), '--dados', str(diretorio)]
+    if mapeado:
+        comando.append('--snapshot-mapeado')
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(comando, stdout=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                conexao = socket.create_connection(('127.0.0.1', porta))
+                break
+            except ConnectionRefusedError:
+                if processo.poll() is not None:
+                    raise RuntimeError("o servidor terminou antes de abrir a porta")
+                time.sleep(0.002)
+        tempos = []
+        with conexao, conexao.makefile('rwb') as canal:
+            for i, (operacao, argumentos) in enumerate(consultas):
+                canal.write(json.dumps({'id': i, 'op': operacao, 'args': argumentos}).encode('utf-8') + b"\n")
+                canal.flush()
+                resposta = json.loads(canal.readline())
+                tempos.append(time.perf_counter() - inicio)
+                if not resposta['ok']:
+                    raise RuntimeError(resposta)
+        with open(f"/proc/{processo.pid}/status") as status:
+            rss = next((int(linha.split()[1]) for linha in status if linha.startswith('VmRSS')), 0)
+        return {'tempos': tempos, 'rss_mb': rss / 1024}
+    finally:
+        processo.terminate()
+        processo.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo do início do processo até a primeira resposta.")
+    parser.add_argument('--livros', type=int, default=10_000_000)
+    parser.add_argument('--usuarios', type=int, default=2_000_000)
+    parser.add_argument('--emprestimos', type=int, default=100_000)
+    parser.add_argument('--rodadas', type=int, default=3)
+    parser.add_argument('--dados', help="diretório do snapshot (padrão: diretório temporário)")
+    parser.add_argument('--comparar-pickle', action='store_true',
+                        help="mede também a inicialização com o snapshot em pickle")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporario:
+        diretorio = Path(args.dados or temporario)
+        diretorio.mkdir(parents=True, exist_ok=True)
+        caminho = diretorio / BibliotecaPersistente.NOME_SNAPSHOT_MAPEADO
+        t0 = time.perf_counter()
+        gerar_snapshot(caminho, args.livros, args.usuarios, args.emprestimos)
+        print(f"{args.livros:,} livros | {args.usuarios:,} usuários | {args.emprestimos:,} empréstimos: "
+              f"snapshot mapeado de {caminho.stat().st_size / 2 ** 20:,.0f} MiB escrito em "
+              f"{time.perf_counter() - t0:.1f} s")
+
+        consultas = [
+            ('emprestimos_do_usuario', {'id_usuario': id_sintetico(args.usuarios // 2)}),
+            ('emprestimos_do_livro', {'isbn': isbn_sintetico(0)}),
+            ('contar_livros_disponiveis', {}),
+        ]
+        formatos = [('mapeado', diretorio, True)]
+        if args.comparar_pickle:
+            diretorio_pickle = Path(temporario) / 'pickle'
+            diretorio_pickle.mkdir()
+            with BibliotecaPersistente(diretorio, snapshot_mapeado=True) as bib:
+                gravar_snapshot(bib, diretorio_pickle / BibliotecaPersistente.NOME_SNAPSHOT, bib.lsn)
+            formatos.append(('pickle', diretorio_pickle, False))
+
+        print(f"\n{'formato':<10}{'1ª resposta':>14}{'2ª':>10}{'3ª':>10}{'RSS':>12}")
+        for nome, pasta, mapeado in formatos:
+            for _ in range(args.rodadas):
+                medida = medir_inicio(pasta, mapeado, consultas)
+                primeira, segunda, terceira = medida['tempos']
+                print(f"{nome:<10}{primeira * 1000:>12.0f}ms{segunda * 1000:>8.0f}ms{terceira * 1000:>8.0f}ms"
+                      f"{medida['rss_mb']:>9.0f} MiB")
+
+
+if __name__ == '__main__':
+    main()
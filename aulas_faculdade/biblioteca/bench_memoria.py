@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_memoria.py
+
+Benchmark de memória: compara os bytes por livro e por usuário das classes
+compactas (__slots__, autor internado, empréstimos alocados sob demanda) com as
+classes originais baseadas em __dict__.
+
+Os textos são criados antes da medição, de modo que só entram na conta os objetos
+e as estruturas que eles alocam (__dict__ e dicionário de empréstimos). A economia
+do internamento do autor, que libera as cópias repetidas lidas de arquivo, é à parte.
+
+Uso:
+    python -m aulas_faculdade.biblioteca.bench_memoria --livros 200000 --usuarios 50000
+"""
+
+import argparse
+import gc
+import tracemalloc
+from datetime import date
+from typing import Dict
+
+from . import Livro, Usuario
+
+
+# -----------------------------------------------------------
+# Classes Originais (referência para comparação)
+# -----------------------------------------------------------
+class LivroOriginal:
+    """
+    Livro como era antes do modo compacto: atributos em um __dict__ por instância.
+    """
+
+    def __init__(self, titulo: str, autor: str, ano: int, isbn: str, total_copias: int):
+        self.titulo = titulo
+        self.autor = autor
+        self.ano = ano
+        self.isbn = isbn
+        self.total_copias = total_copias
+        self.copias_disponiveis = total_copias
+
+
+class UsuarioOriginal:
+    """
+    Usuario como era antes do modo compacto: __dict__ e dicionário de empréstimos sempre alocados.
+    """
+
+    def __init__(self, nome: str, id_usuario: str, contato: str):
+        self.nome = nome
+        self.id_usuario = id_usuario
+        self.contato = contato
+        self.emprestimos_ativos: Dict[str, date] = {}
+
+
+def _medir(fabrica, argumentos) -> float:
+    """
+    Retorna os bytes alocados por objeto ao construir um objeto para cada tupla de argumentos.
+    """
+    gc.collect()
+    tracemalloc.start()
+    objetos = [fabrica(*args) for args in argumentos]
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total = len(objetos)
+    del objetos
+    return atual / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memória de Livro e Usuario.")
+    parser.add_argument('--livros', type=int, default=200_000)
+    parser.add_argument('--usuarios', type=int, default=50_000)
+    parser.add_argument('--autores', type=int, default=5_000, help="autores distintos no acervo")
+    args = parser.parse_args()
+
+    livros = [(f"Título {i}", f"Autor {i % args.autores}", 1900 + i % 120, f"isbn-{i}", 2)
+              for i in range(args.livros)]
+    usuarios = [(f"Usuário {i}", f"u{i}", f"u{i}@exemplo.com") for i in range(args.usuarios)]
+
+    print(f"{'Classe':<20}{'bytes/objeto':>14}")
+    original = _medir(LivroOriginal, livros)
+    compacto = _medir(Livro, livros)
+    print(f"{'LivroOriginal':<20}{original:>14.1f}")
+    print(f"{'Livro':<20}{compacto:>14.1f}   ({original / compacto:.1f}x menor)")
+
+    original = _medir(UsuarioOriginal, usuarios)
+    compacto = _medir(Usuario, usuarios)
+    print(f"{'UsuarioOriginal':<20}{original:>14.1f}")
+    print(f"{'Usuario':<20}{compacto:>14.1f}   ({original / compacto:.1f}x menor)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_motores.py
+
+Suíte de benchmark que compara as três implementações da Biblioteca:
+- "Projeto Integrador.py"   (listas, operações por título, mensagens com print)
+- "Projeto Integrador 1.py" (mesma interface por título, com índices em dicionários)
+- "Projeto Integrador 2.py" (dicionários, índices e exceções)
+
+Para cada tamanho de catálogo (e base de usuários proporcional) são medidos:
+cadastro de livros e usuários, empréstimo, devolução, buscas por título, autor e
+ano e todos os métodos de relatório. Os motores são usados diretamente pelas suas
+classes, sem passar pelos menus de `input()`; a saída de `print` dos motores
+antigos é descartada durante a medição.
+
+O resultado é gravado em JSON. Com --baseline, cada medição é comparada com a
+medição correspondente (motor, tamanho, operação) de uma execução anterior, e o
+programa termina com código 1 se alguma ficou mais lenta que a tolerância.
+
+Uso:
+    python -m aulas_faculdade.biblioteca.bench_motores --tamanhos 1000 10000 100000 --saida atual.json
+    python -m aulas_faculdade.biblioteca.bench_motores --baseline base.json --tolerancia 0.25
+    python -m aulas_faculdade.biblioteca.bench_motores --tamanhos 1000000 10000000 --motores v2
+"""
+
+import argparse
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from . import projeto
+
+_PASTA_PROJETOS = Path(__file__).resolve().parent.parent
+
+# Tamanho máximo usado com os motores de listas: acima disso cada medição leva minutos
+LIMITE_MOTORES_LISTA = 100_000
+
+
+def carregar_arquivo(nome_arquivo: str, nome_modulo: str):
+    """
+    Carrega um dos arquivos "Projeto Integrador*.py" como módulo (sem executar o menu).
+    """
+    if nome_modulo in sys.modules:
+        return sys.modules[nome_modulo]
+    spec = importlib.util.spec_from_file_location(nome_modulo, _PASTA_PROJETOS / nome_arquivo)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nome_modulo] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+# -----------------------------------------------------------
+# Adaptadores dos Motores
+# -----------------------------------------------------------
+class MotorLista:
+    """
+    Adaptador para as versões baseadas em listas ("Projeto Integrador.py" e "1.py").
+
+    Essas versões emprestam e devolvem por título, e a consulta filtra título e autor
+    ao mesmo tempo; não há busca por ano nem relatórios separados.
+    """
+
+    BUSCA_POR_ANO = False
+
+    def __init__(self, modulo):
+        self.modulo = modulo
+        self.bib = modulo.Biblioteca()
+
+    def cadastrar_livro(self, titulo: str, autor: str, ano: int, isbn: str, copias: int):
+        self.bib.cadastrar_livro(self.modulo.Livro(titulo, autor, ano, copias))
+
+    def cadastrar_usuario(self, nome: str, id_usuario: str, contato: str):
+        self.bib.cadastrar_usuario(self.modulo.Usuario(nome, id_usuario, contato))
+
+    def emprestar(self, id_usuario: str, titulo: str, isbn: str):
+        self.bib.emprestar_livro(id_usuario, titulo)
+
+    def devolver(self, id_usuario: str, titulo: str, isbn: str):
+        self.bib.devolver_livro(id_usuario, titulo)
+
+    def buscar_titulo(self, termo: str):
+        self.bib.consultar_livros(termo)
+
+    def buscar_autor(self, termo: str):
+        self.bib.consultar_livros(termo)
+
+    def buscar_ano(self, ano: int):
+        raise NotImplementedError
+
+    def relatorios(self) -> Dict[str, Callable[[], object]]:
+        return {'relatorios': self.bib.relatorios}
+
+
+class MotorDicionario:
+    """
+    Adaptador para "Projeto Integrador 2.py" (catálogo e usuários em dicionários).
+    """
+
+    BUSCA_POR_ANO = True
+
+    def __init__(self, modulo):
+        self.bib = modulo.Biblioteca()
+
+    def cadastrar_livro(self, titulo: str, autor: str, ano: int, isbn: str, copias: int):
+        self.bib.cadastrar_livro(titulo, autor, ano, isbn, copias)
+
+    def cadastrar_usuario(self, nome: str, id_usuario: str, contato: str):
+        self.bib.cadastrar_usuario(nome, id_usuario, contato)
+
+    def emprestar(self, id_usuario: str, titulo: str, isbn: str):
+        self.bib.emprestar_livro(id_usuario, isbn)
+
+    def devolver(self, id_usuario: str, titulo: str, isbn: str):
+        self.bib.devolver_livro(id_usuario, isbn)
+
+    def buscar_titulo(self, termo: str):
+        self.bib.buscar_livros('titulo', termo)
+
+    def buscar_autor(self, termo: str):
+        self.bib.buscar_livros('autor', termo)
+
+    def buscar_ano(self, ano: int):
+        self.bib.buscar_livros('ano', str(ano))
+
+    def relatorios(self) -> Dict[str, Callable[[], object]]:
+        bib = self.bib
+        return {
+            'gerar_relatorio_livros_disponiveis': bib.gerar_relatorio_livros_disponiveis,
+            'gerar_relatorio_livros_emprestados': bib.gerar_relatorio_livros_emprestados,
+            'contar_livros_disponiveis': bib.contar_livros_disponiveis,
+            'contar_livros_emprestados': bib.contar_livros_emprestados,
+            'gerar_relatorio_usuarios': bib.gerar_relatorio_usuarios,
+            'gerar_relatorio_emprestimos_ativos': bib.gerar_relatorio_emprestimos_ativos,
+            'contar_emprestimos_ativos': bib.contar_emprestimos_ativos,
+        }
+
+
+MOTORES = {
+    'v0': ("Projeto Integrador.py", MotorLista),
+    'v1': ("Projeto Integrador 1.py", MotorLista),
+    'v2': ("Projeto Integrador 2.py", MotorDicionario),
+}
+
+
+def criar_motor(nome: str):
+    """
+    Instancia o adaptador do motor informado ('v0', 'v1' ou 'v2') com uma biblioteca vazia.
+    """
+    arquivo, adaptador = MOTORES[nome]
+    if nome == 'v2':
+        return adaptador(projeto)
+    return adaptador(carregar_arquivo(arquivo, f"{__package__}.motor_{nome}"))
+
+
+# -----------------------------------------------------------
+# Dados Sintéticos e Medição
+# -----------------------------------------------------------
+def dados_sinteticos(n_livros: int) -> Tuple[List[tuple], List[tuple]]:
+    """
+    Gera n_livros livros e n_livros // 10 usuários com títulos e ISBNs únicos.
+    Títulos e autores têm largura fixa, para que a busca por um termo exato
+    encontre um único livro (ou um único autor).
+    """
+    n_usuarios = max(1, n_livros // 10)
+    livros = [(f"Titulo {i:08d}", f"Autor {i % 5000:05d}", 1900 + i % 125, f"isbn-{i}", 2)
+              for i in range(n_livros)]
+    usuarios = [(f"Usuário {i}", f"u{i}", f"u{i}@exemplo.com") for i in range(n_usuarios)]
+    return livros, usuarios
+
+
+def _cronometrar(funcao: Callable, argumentos: List[tuple]) -> float:
+    """
+    Executa funcao(*args) para cada tupla e retorna o tempo total em segundos.
+    """
+    inicio = time.perf_counter()
+    for args in argumentos:
+        funcao(*args)
+    return time.perf_counter() - inicio
+
+
+def medir_motor(nome: str, n_livros: int, amostras: int, repeticoes: int) -> List[dict]:
+    """
+    Mede todas as operações de um motor para um tamanho de catálogo.
+    Retorna uma lista de medições {motor, tamanho, operacao, quantidade, segundos, segundos_por_op}.
+    """
+    livros, usuarios = dados_sinteticos(n_livros)
+    motor = criar_motor(nome)
+    medicoes: List[dict] = []
+
+    def registrar(operacao: str, quantidade: int, segundos: float):
+        medicoes.append({'motor': nome, 'tamanho': n_livros, 'operacao': operacao,
+                         'quantidade': quantidade, 'segundos': segundos,
+                         'segundos_por_op': segundos / quantidade})
+
+    passo = max(1, n_livros // amostras)
+    selecionados = livros[::passo][:amostras]
+    pares = [(usuarios[i % len(usuarios)][1], livro[0], livro[3]) for i, livro in enumerate(selecionados)]
+
+    with contextlib.redirect_stdout(io.StringIO()) as saida:
+        gc.collect()
+        registrar('cadastrar_livro', len(livros), _cronometrar(motor.cadastrar_livro, livros))
+        registrar('cadastrar_usuario', len(usuarios), _cronometrar(motor.cadastrar_usuario, usuarios))
+
+        # A primeira busca inclui a construção de índices preguiçosos, quando houver
+        inicio = time.perf_counter()
+        motor.buscar_titulo(selecionados[0][0])
+        registrar('primeira_busca', 1, time.perf_counter() - inicio)
+
+        registrar('emprestar', len(pares), _cronometrar(motor.emprestar, pares))
+        registrar('buscar_titulo', len(selecionados),
+                  _cronometrar(motor.buscar_titulo, [(livro[0],) for livro in selecionados]))
+        registrar('buscar_autor', len(selecionados),
+                  _cronometrar(motor.buscar_autor, [(livro[1],) for livro in selecionados]))
+        if motor.BUSCA_POR_ANO:
+            registrar('buscar_ano', len(selecionados),
+                      _cronometrar(motor.buscar_ano, [(livro[2],) for livro in selecionados]))
+
+        # Relatórios com as amostras emprestadas: há livros e usuários nos dois estados
+        for operacao, relatorio in motor.relatorios().items():
+            melhor = min(_cronometrar(relatorio, [()]) for _ in range(repeticoes))
+            registrar(operacao, 1, melhor)
+            saida.seek(0)
+            saida.truncate()
+
+        registrar('devolver', len(pares), _cronometrar(motor.devolver, pares))
+    return medicoes
+
+
+# -----------------------------------------------------------
+# Comparação com a Linha de Base
+# -----------------------------------------------------------
+def _chave(medicao: dict) -> Tuple[str, int, str]:
+    return medicao['motor'], medicao['tamanho'], medicao['operacao']
+
+
+def comparar(atual: List[dict], baseline: List[dict], tolerancia: float) -> List[dict]:
+    """
+    Compara as medições com as da linha de base e retorna as regressões
+    (razão atual/base acima de 1 + tolerancia).
+    """
+    base = {_chave(m): m for m in baseline}
+    regressoes = []
+    for medicao in atual:
+        anterior = base.get(_chave(medicao))
+        if anterior is None or anterior['segundos_por_op'] <= 0:
+            continue
+        razao = medicao['segundos_por_op'] / anterior['segundos_por_op']
+        medicao['razao_baseline'] = razao
+        if razao > 1 + tolerancia:
+            regressoes.append(medicao)
+    return regressoes
+
+
+def _formatar_tempo(segundos: float) -> str:
+    if segundos >= 1:
+        return f"{segundos:.2f} s"
+    if segundos >= 1e-3:
+        return f"{segundos * 1e3:.2f} ms"
+    return f"{segundos * 1e6:.2f} µs"
+
+
+def imprimir(medicoes: List[dict]):
+    """
+    Mostra as medições em forma de tabela.
+    """
+    print(f"{'motor':<6}{'tamanho':>12}  {'operação':<36}{'por op':>12}{'vs base':>10}")
+    for m in medicoes:
+        razao = m.get('razao_baseline')
+        coluna_base = f"{razao:.2f}x" if razao is not None else "-"
+        print(f"{m['motor']:<6}{m['tamanho']:>12,}  {m['operacao']:<36}"
+              f"{_formatar_tempo(m['segundos_por_op']):>12}{coluna_base:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark comparativo dos motores da Biblioteca.")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help="quantidades de livros (até 10^7); usuários = livros / 10")
+    parser.add_argument('--motores', nargs='+', choices=sorted(MOTORES), default=sorted(MOTORES))
+    parser.add_argument('--amostras', type=int, default=1_000,
+                        help="operações medidas por tipo (empréstimos, devoluções, buscas)")
+    parser.add_argument('--repeticoes', type=int, default=3, help="repetições de cada relatório (vale a menor)")
+    parser.add_argument('--limite-lista', type=int, default=LIMITE_MOTORES_LISTA,
+                        help="tamanho máximo medido nos motores de listas (v0, v1)")
+    parser.add_argument('--saida', help="arquivo JSON com os resultados")
+    parser.add_argument('--baseline', help="JSON de uma execução anterior para detectar regressões")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="piora relativa aceita antes de acusar regressão (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    medicoes: List[dict] = []
+    pulados: List[Tuple[str, int]] = []
+    for n_livros in args.tamanhos:
+        for nome in args.motores:
+            if MOTORES[nome][1] is MotorLista and n_livros > args.limite_lista:
+                pulados.append((nome, n_livros))
+                continue
+            medicoes.extend(medir_motor(nome, n_livros, args.amostras, args.repeticoes))
+
+    regressoes: List[dict] = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as arquivo:
+            regressoes = comparar(medicoes, json.load(arquivo)['medicoes'], args.tolerancia)
+
+    imprimir(medicoes)
+    for nome, n_livros in pulados:
+        print(f"(pulado: {nome} com {n_livros:,} livros; acima de --limite-lista)")
+
+    if args.saida:
+        resultado = {
+            'gerado_em': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'amostras': args.amostras,
+            'medicoes': medicoes,
+        }
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultado, arquivo, ensure_ascii=False, indent=1)
+
+    if regressoes:
+        print(f"\n{len(regressoes)} regressão(ões) acima de {args.tolerancia:.0%}:")
+        for m in regressoes:
+            print(f"  {m['motor']} / {m['tamanho']:,} / {m['operacao']}: {m['razao_baseline']:.2f}x")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
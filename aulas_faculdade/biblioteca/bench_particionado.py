@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_particionado.py
+
+Mede a latência de buscas e relatórios da BibliotecaParticionada conforme a
+quantidade de processos (partições), comparando com a Biblioteca de um só processo.
+
+Cada processo de trabalho gera diretamente a sua fatia do catálogo sintético (os
+livros cujo ISBN pertence à partição), sem trafegar milhões de objetos pelos pipes.
+1% dos livros fica emprestado, para que os relatórios de empréstimos não fiquem vazios.
+
+O ganho esperado depende dos núcleos disponíveis: operações que varrem a partição e
+devolvem pouco (contagens, busca curta por varredura) escalam com os núcleos, enquanto
+relatórios que devolvem muitos livros pagam a serialização do resultado pelo pipe.
+
+Uso:
+    python -m aulas_faculdade.biblioteca.bench_particionado --livros 10000000 --processos 1 2 4 8
+"""
+
+import argparse
+import multiprocessing
+import time
+import zlib
+from typing import Callable, Dict, List
+
+from . import Biblioteca, Livro, Usuario
+from .particionado import BibliotecaParticionada, ParticaoBiblioteca
+
+PROPORCAO_EMPRESTADOS = 100
+
+
+def _pertence(chave: str, indice: int, n_particoes: int) -> bool:
+    return zlib.crc32(chave.encode('utf-8')) % n_particoes == indice
+
+
+def gerar_fatia(bib: Biblioteca, indice: int, n_particoes: int, n_livros: int, n_usuarios: int) -> int:
+    """
+    Cadastra em `bib` os livros e usuários sintéticos da partição `indice` e empresta
+    1% dos livros. Com n_particoes == 1 gera o catálogo inteiro. Retorna a quantidade de livros.
+    """
+    livros = []
+    for i in range(n_livros):
+        isbn = f"isbn-{i}"
+        if n_particoes == 1 or _pertence(isbn, indice, n_particoes):
+            livros.append(Livro(f"Titulo {i:08d}", f"Autor {i % 5000:05d}", 1900 + i % 125, isbn, 2))
+    bib._adicionar_livros(livros)
+    usuarios = []
+    for i in range(n_usuarios):
+        id_usuario = f"u{i}"
+        if n_particoes == 1 or _pertence(id_usuario, indice, n_particoes):
+            usuarios.append(Usuario(f"Usuário {i}", id_usuario, "contato"))
+    bib._adicionar_usuarios(usuarios)
+    for posicao, livro in enumerate(livros[::PROPORCAO_EMPRESTADOS]):
+        id_usuario = f"u{posicao % n_usuarios}"
+        if isinstance(bib, ParticaoBiblioteca):
+            bib.emprestar_para("Usuário", id_usuario, "contato", livro.isbn)
+        else:
+            bib.emprestar_livro(id_usuario, livro.isbn)
+    return len(livros)
+
+
+def consultas(bib) -> Dict[str, Callable[[], object]]:
+    """
+    Operações medidas: buscas e relatórios, todos executados sobre o catálogo inteiro.
+    """
+    return {
+        'contar_livros_disponiveis': bib.contar_livros_disponiveis,
+        'contar_emprestimos_ativos': bib.contar_emprestimos_ativos,
+        'buscar_titulo (varredura, 2 letras)': lambda: bib.buscar_livros('titulo', 'zq'),
+        'buscar_autor (trigramas)': lambda: bib.buscar_livros('autor', 'Autor 00042'),
+        'buscar_livros_por_periodo (1 ano)': lambda: bib.buscar_livros_por_periodo(2000, 2000),
+        'gerar_relatorio_livros_emprestados': bib.gerar_relatorio_livros_emprestados,
+        'gerar_relatorio_emprestimos_ativos': bib.gerar_relatorio_emprestimos_ativos,
+        'gerar_relatorio_usuarios': bib.gerar_relatorio_usuarios,
+    }
+
+
+def medir(bib, repeticoes: int) -> Dict[str, float]:
+    """
+    Retorna o menor tempo (s) de cada consulta em `repeticoes` execuções.
+    """
+    bib.buscar_livros('titulo', 'aquecimento')  # constrói os índices preguiçosos
+    tempos = {}
+    for nome, consulta in consultas(bib).items():
+        melhor = float('inf')
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            consulta()
+            melhor = min(melhor, time.perf_counter() - inicio)
+        tempos[nome] = melhor
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Escalabilidade da Biblioteca particionada.")
+    parser.add_argument('--livros', type=int, default=10_000_000)
+    parser.add_argument('--usuarios', type=int, default=100_000)
+    parser.add_argument('--processos', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Catálogo: {args.livros:,} livros | {args.usuarios:,} usuários | "
+          f"núcleos disponíveis: {multiprocessing.cpu_count()}")
+
+    colunas: List[str] = ['local']
+    resultados: List[Dict[str, float]] = []
+
+    local = Biblioteca()
+    inicio = time.perf_counter()
+    gerar_fatia(local, 0, 1, args.livros, args.usuarios)
+    print(f"local: carga em {time.perf_counter() - inicio:.1f} s")
+    resultados.append(medir(local, args.repeticoes))
+    del local
+
+    for n_processos in args.processos:
+        with BibliotecaParticionada(n_processos) as bib:
+            inicio = time.perf_counter()
+            bib.em_todas(gerar_fatia, args.livros, args.usuarios)
+            print(f"{n_processos} processo(s): carga em {time.perf_counter() - inicio:.1f} s")
+            colunas.append(f"{n_processos} proc")
+            resultados.append(medir(bib, args.repeticoes))
+
+    print(f"\n{'consulta':<40}" + "".join(f"{coluna:>12}" for coluna in colunas))
+    for nome in resultados[0]:
+        print(f"{nome:<40}" + "".join(f"{tempos[nome] * 1000:>10.2f}ms" for tempos in resultados))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_persistencia.py
+
+Benchmark da persistência da Biblioteca:
+- vazão (operações/s) com durabilidade ativa, para diferentes tamanhos de grupo de fsync;
+- tempo de recuperação a partir de um log com N operações (padrão: 1.000.000),
+  reexecutando o log inteiro e a partir de um snapshot.
+
+Uso:
+    python -m aulas_faculdade.biblioteca.bench_persistencia --operacoes 1000000
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from .persistencia import BibliotecaPersistente
+
+
+def gerar_operacoes(bib: BibliotecaPersistente, n_operacoes: int):
+    """
+    Executa n_operacoes misturando cadastros, empréstimos e devoluções.
+    """
+    n_livros = max(1, n_operacoes // 4)
+    n_usuarios = max(1, n_operacoes // 8)
+    feitas = 0
+    for i in range(n_livros):
+        bib.cadastrar_livro(f"Livro {i}", f"Autor {i % 997}", 1900 + i % 120, f"isbn-{i}", 3)
+        feitas += 1
+    for i in range(n_usuarios):
+        bib.cadastrar_usuario(f"Usuário {i}", f"u{i}", f"u{i}@exemplo.com")
+        feitas += 1
+    i = 0
+    while feitas < n_operacoes:
+        id_usuario = f"u{i % n_usuarios}"
+        isbn = f"isbn-{i % n_livros}"
+        bib.emprestar_livro(id_usuario, isbn)
+        feitas += 1
+        if feitas < n_operacoes:
+            bib.devolver_livro(id_usuario, isbn)
+            feitas += 1
+        i += 1
+
+
+def medir_vazao(n_operacoes: int, tamanho_grupo: int) -> float:
+    """
+    Mede operações/s com o log durável ativo.
+    """
+    diretorio = Path(tempfile.mkdtemp(prefix='bench_wal_'))
+    try:
+        bib = BibliotecaPersistente(diretorio, tamanho_grupo=tamanho_grupo, intervalo_snapshot=0)
+        inicio = time.perf_counter()
+        gerar_operacoes(bib, n_operacoes)
+        bib.fechar()
+        return n_operacoes / (time.perf_counter() - inicio)
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def medir_recuperacao(n_operacoes: int):
+    """
+    Mede o tempo de recuperação reexecutando o log completo e a partir de um snapshot.
+    """
+    diretorio = Path(tempfile.mkdtemp(prefix='bench_rec_'))
+    try:
+        bib = BibliotecaPersistente(diretorio, tamanho_grupo=4096, intervalo_snapshot=0)
+        gerar_operacoes(bib, n_operacoes)
+        bib.fechar()
+
+        inicio = time.perf_counter()
+        recuperada = BibliotecaPersistente(diretorio, intervalo_snapshot=0)
+        tempo_log = time.perf_counter() - inicio
+        print(f"Recuperação de {recuperada.lsn:,} operações só pelo log: {tempo_log:.2f} s")
+
+        recuperada.snapshot()
+        recuperada.fechar()
+        inicio = time.perf_counter()
+        BibliotecaPersistente(diretorio, intervalo_snapshot=0).fechar()
+        tempo_snapshot = time.perf_counter() - inicio
+        print(f"Recuperação a partir do snapshot: {tempo_snapshot:.2f} s")
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da persistência da Biblioteca.")
+    parser.add_argument('--operacoes', type=int, default=1_000_000,
+                        help="operações registradas no teste de recuperação")
+    parser.add_argument('--operacoes-vazao', type=int, default=50_000,
+                        help="operações no teste de vazão")
+    args = parser.parse_args()
+
+    print("=== Vazão com durabilidade ===")
+    for tamanho_grupo in (1, 16, 128, 1024):
+        vazao = medir_vazao(args.operacoes_vazao, tamanho_grupo)
+        print(f"Grupo de fsync = {tamanho_grupo:>5}: {vazao:>12,.0f} ops/s")
+
+    print("\n=== Recuperação ===")
+    medir_recuperacao(args.operacoes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_servidor.py
+
+Gerador de carga para o servidor da Biblioteca (servidor.py).
+
+Abre várias conexões simultâneas; cada conexão mantém uma janela de requisições em
+pipeline (envia várias antes de ler as respostas). Mede a latência de cada
+requisição (do envio até a resposta) e reporta p50, p99 e a vazão total.
+
+Uso:
+    python -m aulas_faculdade.biblioteca.bench_servidor --conexoes 1000 --requisicoes 100 --janela 8
+    python -m aulas_faculdade.biblioteca.bench_servidor --porta 8765 --sem-servidor   # servidor já em execução
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import deque
+from typing import Dict, List
+
+
+def _linha(id_requisicao: int, op: str, **args) -> bytes:
+    """
+    Codifica uma requisição do protocolo em uma linha JSON.
+    """
+    return json.dumps({'id': id_requisicao, 'op': op, 'args': args}).encode('utf-8') + b'\n'
+
+
+async def preparar(host: str, porta: int, n_livros: int, n_usuarios: int):
+    """
+    Cadastra livros e usuários de teste usando uma única conexão em pipeline.
+    """
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    linhas = [_linha(i, 'cadastrar_livro', titulo=f"Livro {i}", autor=f"Autor {i % 100}",
+                     ano=1950 + i % 70, isbn=f"isbn-{i}", total_copias=5)
+              for i in range(n_livros)]
+    linhas += [_linha(i, 'cadastrar_usuario', nome=f"Usuário {i}", id_usuario=f"u{i}", contato="c")
+               for i in range(n_usuarios)]
+    escritor.write(b''.join(linhas))
+    await escritor.drain()
+    for _ in linhas:
+        await leitor.readline()
+    escritor.close()
+    await escritor.wait_closed()
+
+
+def _requisicao_aleatoria(aleatorio: random.Random, id_requisicao: int, n_livros: int, n_usuarios: int) -> bytes:
+    """
+    Sorteia uma requisição da mistura de carga (empréstimos, devoluções e buscas).
+    """
+    sorteio = aleatorio.random()
+    id_usuario = f"u{aleatorio.randrange(n_usuarios)}"
+    isbn = f"isbn-{aleatorio.randrange(n_livros)}"
+    if sorteio < 0.4:
+        return _linha(id_requisicao, 'emprestar_livro', id_usuario=id_usuario, isbn=isbn)
+    if sorteio < 0.8:
+        return _linha(id_requisicao, 'devolver_livro', id_usuario=id_usuario, isbn=isbn)
+    if sorteio < 0.9:
+        return _linha(id_requisicao, 'buscar_livros_por_periodo', ano_inicio=1990, ano_fim=1991)
+    return _linha(id_requisicao, 'contar_emprestimos_ativos')
+
+
+async def cliente(host: str, porta: int, requisicoes: int, janela: int, n_livros: int, n_usuarios: int,
+                  semente: int, latencias: List[float], erros: Dict[str, int]):
+    """
+    Executa uma conexão com `janela` requisições em voo ao mesmo tempo.
+    """
+    aleatorio = random.Random(semente)
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    enviados = deque()
+    proximo = 0
+    while proximo < requisicoes or enviados:
+        while proximo < requisicoes and len(enviados) < janela:
+            escritor.write(_requisicao_aleatoria(aleatorio, proximo, n_livros, n_usuarios))
+            enviados.append(time.perf_counter())
+            proximo += 1
+        await escritor.drain()
+        resposta = json.loads(await leitor.readline())
+        latencias.append(time.perf_counter() - enviados.popleft())
+        if not resposta['ok']:
+            erros[resposta['erro']] = erros.get(resposta['erro'], 0) + 1
+    escritor.close()
+    await escritor.wait_closed()
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """
+    Percentil p (0-100) por ordenação simples.
+    """
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+async def executar(args):
+    await preparar(args.host, args.porta, args.livros, args.usuarios)
+    latencias: List[float] = []
+    erros: Dict[str, int] = {}
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        cliente(args.host, args.porta, args.requisicoes, args.janela, args.livros, args.usuarios,
+                semente, latencias, erros)
+        for semente in range(args.conexoes)
+    ))
+    duracao = time.perf_counter() - inicio
+
+    print(f"Conexões: {args.conexoes} | janela de pipeline: {args.janela}")
+    print(f"Requisições: {len(latencias):,} em {duracao:.2f} s -> {len(latencias) / duracao:,.0f} req/s")
+    print(f"Latência p50: {percentil(latencias, 50) * 1000:.2f} ms | "
+          f"p99: {percentil(latencias, 99) * 1000:.2f} ms")
+    print(f"Respostas de erro de negócio: {erros}")
+
+
+async def _aguardar_porta(host: str, porta: int, tempo_maximo: float = 10.0):
+    """
+    Espera o servidor começar a aceitar conexões.
+    """
+    limite = time.monotonic() + tempo_maximo
+    while True:
+        try:
+            _, escritor = await asyncio.open_connection(host, porta)
+            escritor.close()
+            return
+        except OSError:
+            if time.monotonic() > limite:
+                raise
+            await asyncio.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga do servidor da Biblioteca.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--conexoes', type=int, default=1000)
+    parser.add_argument('--requisicoes', type=int, default=100, help="requisições por conexão")
+    parser.add_argument('--janela', type=int, default=8, help="requisições em voo por conexão")
+    parser.add_argument('--livros', type=int, default=10_000)
+    parser.add_argument('--usuarios', type=int, default=2_000)
+    parser.add_argument('--sem-servidor', action='store_true',
+                        help="não inicia um servidor local; usa o que já estiver em host:porta")
+    args = parser.parse_args()
+
+    processo = None
+    if not args.sem_servidor:
+        processo = subprocess.Popen([sys.executable, '-m', 'aulas_faculdade.biblioteca.servidor',
+                                     '--host', args.host, '--porta', str(args.porta)],
+                                    stdout=subprocess.DEVNULL)
+    try:
+        if processo is not None:
+            asyncio.run(_aguardar_porta(args.host, args.porta))
+        asyncio.run(executar(args))
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_vencimentos.py
+
+Benchmark do índice de vencimentos: com milhões de empréstimos ativos, compara
+"empréstimos atrasados na data D" pelo índice (calendário de vencimentos) com a
+varredura de `emprestimos_ativos` de todos os usuários, e mede o processamento
+noturno de atrasos em noites consecutivas.
+
+Os empréstimos são distribuídos uniformemente pelos últimos --dias dias, então a
+fração atrasada cresce conforme a data de referência avança.
+
+Uso:
+    python -m aulas_faculdade.biblioteca.bench_vencimentos --emprestimos 5000000
+"""
+
+import argparse
+import gc
+import time
+from datetime import date, timedelta
+from operator import itemgetter
+
+from . import Biblioteca, Livro, Usuario, projeto
+
+
+def montar(n_emprestimos: int, n_dias: int, inicio: date) -> Biblioteca:
+    """
+    Cria uma biblioteca com n_emprestimos empréstimos ativos (um exemplar por livro,
+    um livro por empréstimo) espalhados por n_dias dias a partir de `inicio`.
+    """
+    bib = Biblioteca()
+    n_usuarios = max(1, n_emprestimos // 10)
+    with projeto._sem_coleta_de_lixo():
+        bib._adicionar_livros([Livro(f"Livro {i}", "Autor", 2000, f"isbn-{i}", 1) for i in range(n_emprestimos)])
+        bib._adicionar_usuarios([Usuario(f"Usuário {i}", f"u{i}", "contato") for i in range(n_usuarios)])
+        por_dia = -(-n_emprestimos // n_dias)
+        for dia in range(n_dias):
+            pares = [(f"u{i % n_usuarios}", f"isbn-{i}")
+                     for i in range(dia * por_dia, min(n_emprestimos, (dia + 1) * por_dia))]
+            if pares:
+                bib.emprestar_lote(pares, inicio + timedelta(days=dia))
+    return bib
+
+
+def varredura(bib: Biblioteca, data_referencia: date) -> list:
+    """
+    Forma ingênua: percorre os empréstimos de todos os usuários e ordena os atrasados
+    por vencimento, produzindo o mesmo resultado que emprestimos_vencidos.
+    """
+    prazo = timedelta(days=bib.prazo_emprestimo)
+    catalogo = bib.catalogo
+    atrasados = [(usuario, catalogo[isbn], data_emp + prazo)
+                 for usuario in bib.usuarios.values()
+                 for isbn, data_emp in usuario.emprestimos_ativos.items()
+                 if data_emp + prazo < data_referencia]
+    atrasados.sort(key=itemgetter(2))
+    return atrasados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do índice de vencimentos e das multas.")
+    parser.add_argument('--emprestimos', type=int, default=5_000_000)
+    parser.add_argument('--dias', type=int, default=60, help="dias pelos quais os empréstimos se espalham")
+    parser.add_argument('--noites', type=int, default=7, help="execuções consecutivas do processamento noturno")
+    args = parser.parse_args()
+
+    inicio = date(2024, 1, 1)
+    t0 = time.perf_counter()
+    bib = montar(args.emprestimos, args.dias, inicio)
+    # O estado montado é permanente: tirá-lo das varreduras do coletor de lixo evita
+    # pausas que não têm relação com as operações medidas.
+    gc.collect()
+    gc.freeze()
+    print(f"{args.emprestimos:,} empréstimos ativos montados em {time.perf_counter() - t0:.1f} s "
+          f"(prazo {bib.prazo_emprestimo} dias)")
+
+    print(f"\n{'data de referência':<20}{'atrasados':>12}{'índice':>12}{'varredura':>12}")
+    for deslocamento in (bib.prazo_emprestimo + 1, bib.prazo_emprestimo + 7, args.dias // 2, args.dias):
+        data_referencia = inicio + timedelta(days=deslocamento)
+        t0 = time.perf_counter()
+        atrasados = len(list(bib.emprestimos_vencidos(data_referencia)))
+        t_indice = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        conferencia = len(varredura(bib, data_referencia))
+        t_varredura = time.perf_counter() - t0
+        assert conferencia == atrasados
+        print(f"{data_referencia.isoformat():<20}{atrasados:>12,}{t_indice * 1000:>10.1f}ms{t_varredura * 1000:>10.1f}ms")
+
+    print(f"\n{'noite':<14}{'novos atrasos':>14}{'multados':>10}{'tempo':>12}")
+    primeira = inicio + timedelta(days=bib.prazo_emprestimo)
+    for noite in range(args.noites):
+        data_referencia = primeira + timedelta(days=noite)
+        t0 = time.perf_counter()
+        relatorio = bib.processar_atrasos(data_referencia)
+        duracao = time.perf_counter() - t0
+        print(f"{data_referencia.isoformat():<14}{len(relatorio.avisos):>14,}{len(relatorio.multas):>10,}"
+              f"{duracao * 1000:>10.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+concorrencia.py
+
+Modo seguro para múltiplas threads da Biblioteca, com travas de granularidade fina.
+
+Em vez de uma trava global, cada operação de empréstimo/devolução trava apenas o
+usuário e o livro envolvidos, de modo que empréstimos não relacionados prosseguem
+em paralelo. As travas são distribuídas em faixas (lock striping): a chave é mapeada
+para uma de N travas fixas, sem alocar uma trava por ISBN ou por usuário.
+
+Ordem de aquisição (evita deadlock): primeiro a trava do usuário, depois a do livro;
+quando uma operação envolve várias chaves do mesmo tipo, elas são adquiridas em
+ordem crescente de índice de faixa.
+"""
+
+import threading
+from contextlib import ExitStack, contextmanager
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import Biblioteca, Livro, Usuario, projeto
+
+
+# -----------------------------------------------------------
+# Classe TravasDistribuidas
+# -----------------------------------------------------------
+class TravasDistribuidas:
+    """
+    Conjunto fixo de travas indexado pelo hash da chave.
+
+    Atributos:
+        travas (List[threading.Lock]): as travas de cada faixa
+    """
+
+    def __init__(self, quantidade: int = 1024):
+        self.travas: List[threading.Lock] = [threading.Lock() for _ in range(quantidade)]
+
+    def indice(self, chave: str) -> int:
+        """
+        Retorna o índice da faixa responsável pela chave.
+        """
+        return hash(chave) % len(self.travas)
+
+    @contextmanager
+    def travar(self, chaves: Iterable[str]):
+        """
+        Adquire as travas das chaves informadas em ordem crescente de faixa, sem repetições.
+        """
+        indices = sorted({self.indice(chave) for chave in chaves})
+        with ExitStack() as pilha:
+            for i in indices:
+                pilha.enter_context(self.travas[i])
+            yield
+
+
+# -----------------------------------------------------------
+# Classe RegistroEmprestimosSincronizado
+# -----------------------------------------------------------
+class RegistroEmprestimosSincronizado(projeto.RegistroEmprestimos):
+    """
+    Registro central de empréstimos protegido por uma trava própria.
+
+    As seções críticas são curtas (algumas operações de dicionário), por isso uma única
+    trava não serializa as operações de empréstimo como um todo.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.trava = threading.Lock()
+
+    def registrar(self, id_usuario: str, isbn: str, data_emprestimo: date,
+                  data_vencimento: Optional[date] = None):
+        with self.trava:
+            super().registrar(id_usuario, isbn, data_emprestimo, data_vencimento)
+
+    def remover(self, id_usuario: str, isbn: str):
+        with self.trava:
+            super().remover(id_usuario, isbn)
+
+    def registrar_lote(self, pares: List[Tuple[str, str]], data_emprestimo: date,
+                       data_vencimento: Optional[date] = None):
+        with self.trava:
+            super().registrar_lote(pares, data_emprestimo, data_vencimento)
+
+    def remover_lote(self, pares: List[Tuple[str, str]]):
+        with self.trava:
+            for id_usuario, isbn in pares:
+                projeto.RegistroEmprestimos.remover(self, id_usuario, isbn)
+
+    def copiar_ativos(self) -> List[Tuple[Tuple[str, str], date]]:
+        """
+        Retorna uma cópia consistente dos empréstimos ativos.
+        """
+        with self.trava:
+            return list(self.ativos.items())
+
+    def copiar_entre(self, data_inicio: date, data_fim: date) -> List[Tuple[Tuple[str, str], date]]:
+        """
+        Retorna uma cópia consistente dos empréstimos feitos entre as datas.
+        """
+        with self.trava:
+            return list(self.entre(data_inicio, data_fim))
+
+    def vencidos_entre(self, data_inicio: Optional[date], data_fim: date) -> Iterator[Tuple[Tuple[str, str], date]]:
+        with self.trava:
+            return iter(list(super().vencidos_entre(data_inicio, data_fim)))
+
+
+# -----------------------------------------------------------
+# Classe BibliotecaConcorrente
+# -----------------------------------------------------------
+class BibliotecaConcorrente(Biblioteca):
+    """
+    Biblioteca segura para uso por várias threads ao mesmo tempo.
+
+    - Empréstimos e devoluções travam a faixa do usuário e a faixa do ISBN, nessa ordem,
+      tornando atômico o "verifica cópia disponível e empresta".
+    - Cadastros, atualização dos índices (inclusive as chaves ordenadas dos cursores),
+      buscas e o processamento de atrasos compartilham a trava do catálogo.
+    - O registro central de empréstimos tem uma trava interna de seção curta.
+
+    Atributos:
+        travas_usuario (TravasDistribuidas): travas por faixa de id_usuario
+        travas_livro (TravasDistribuidas): travas por faixa de ISBN
+    """
+
+    def __init__(self, faixas: int = 1024, **configuracao):
+        super().__init__(**configuracao)
+        self.emprestimos = RegistroEmprestimosSincronizado()
+        self.travas_usuario = TravasDistribuidas(faixas)
+        self.travas_livro = TravasDistribuidas(faixas)
+        self._trava_catalogo = threading.RLock()
+
+    @contextmanager
+    def travar(self, ids_usuario: Iterable[str], isbns: Iterable[str]):
+        """
+        Adquire as travas dos usuários e livros informados na ordem fixa (usuários, depois livros).
+        """
+        with self.travas_usuario.travar(ids_usuario), self.travas_livro.travar(isbns):
+            yield
+
+    # ------------------------- Cadastros e índices -------------------------
+    def cadastrar_livro(self, titulo: str, autor: str, ano: int, isbn: str, total_copias: int):
+        with self._trava_catalogo:
+            super().cadastrar_livro(titulo, autor, ano, isbn, total_copias)
+
+    def cadastrar_usuario(self, nome: str, id_usuario: str, contato: str):
+        with self._trava_catalogo:
+            super().cadastrar_usuario(nome, id_usuario, contato)
+
+    def _adicionar_livros(self, livros: List[Livro]):
+        with self._trava_catalogo:
+            super()._adicionar_livros(livros)
+
+    def _adicionar_usuarios(self, usuarios: List[Usuario]):
+        with self._trava_catalogo:
+            super()._adicionar_usuarios(usuarios)
+
+    def _isbns_busca(self, campo: str, valor_busca: str) -> List[str]:
+        # buscar_livros e cursor_busca passam por aqui
+        with self._trava_catalogo:
+            return super()._isbns_busca(campo, valor_busca)
+
+    def _resultado_busca(self, campo: str, valor_busca: str) -> Tuple[List[str], Dict[str, int]]:
+        # Protege também o cache de resultados das buscas paginadas
+        with self._trava_catalogo:
+            return super()._resultado_busca(campo, valor_busca)
+
+    def buscar_livros_por_periodo(self, ano_inicio: int, ano_fim: int) -> List[Livro]:
+        with self._trava_catalogo:
+            return super().buscar_livros_por_periodo(ano_inicio, ano_fim)
+
+    def buscar_livros_pontuados(self, termo: str, limite: int = 10,
+                                campos: Iterable[str] = Biblioteca.CAMPOS_TEXTO) -> List[Tuple[float, Livro]]:
+        # buscar_livros_ranqueado passa por aqui
+        with self._trava_catalogo:
+            return super().buscar_livros_pontuados(termo, limite, campos)
+
+    def processar_atrasos(self, data_referencia: Optional[date] = None) -> projeto.RelatorioAtrasos:
+        # Serializa as execuções; o registro de empréstimos é lido por cópias consistentes
+        with self._trava_catalogo:
+            return super().processar_atrasos(data_referencia)
+
+    # ------------------------- Empréstimos -------------------------
+    def emprestar_livro(self, id_usuario: str, isbn: str, data_emprestimo: Optional[date] = None):
+        with self.travar((id_usuario,), (isbn,)):
+            super().emprestar_livro(id_usuario, isbn, data_emprestimo)
+
+    def devolver_livro(self, id_usuario: str, isbn: str):
+        with self.travar((id_usuario,), (isbn,)):
+            super().devolver_livro(id_usuario, isbn)
+
+    def emprestar_lote(self, pares: Iterable[Tuple[str, str]],
+                       data_emprestimo: Optional[date] = None) -> projeto.ResultadoLote:
+        pares = list(pares)
+        with self.travar((u for u, _ in pares), (isbn for _, isbn in pares)):
+            return super().emprestar_lote(pares, data_emprestimo)
+
+    def devolver_lote(self, pares: Iterable[Tuple[str, str]]) -> projeto.ResultadoLote:
+        pares = list(pares)
+        with self.travar((u for u, _ in pares), (isbn for _, isbn in pares)):
+            return super().devolver_lote(pares)
+
+    # ------------------------- Relatórios -------------------------
+    def iterar_emprestimos_ativos(self) -> Iterator[Tuple[Usuario, Livro, date]]:
+        usuarios = self.usuarios
+        catalogo = self.catalogo
+        for (id_usuario, isbn), data_emprestimo in self.emprestimos.copiar_ativos():
+            yield usuarios[id_usuario], catalogo[isbn], data_emprestimo
+
+    def _chaves_ordenadas(self, chaves: projeto.ChavesOrdenadas) -> List[str]:
+        # A sincronização troca a lista ordenada; cursores abertos seguem com a anterior
+        with self._trava_catalogo:
+            return super()._chaves_ordenadas(chaves)
+
+    def _emprestimos_do_usuario_ordenados(self, usuario: Usuario) -> List[Tuple[str, date]]:
+        with self.travas_usuario.travar((usuario.id_usuario,)):
+            return super()._emprestimos_do_usuario_ordenados(usuario)
+
+    def _chaves_emprestimos(self) -> List[Tuple[str, str]]:
+        return [chave for chave, _ in self.emprestimos.copiar_ativos()]
+
+    def emprestimos_do_livro(self, isbn: str) -> Iterator[Tuple[Usuario, Livro, date]]:
+        with self.travas_livro.travar((isbn,)):
+            return iter(list(super().emprestimos_do_livro(isbn)))
+
+    def emprestimos_do_usuario(self, id_usuario: str) -> Iterator[Tuple[Usuario, Livro, date]]:
+        with self.travas_usuario.travar((id_usuario,)):
+            return iter(list(super().emprestimos_do_usuario(id_usuario)))
+
+    def emprestimos_entre(self, data_inicio: date, data_fim: date) -> Iterator[Tuple[Usuario, Livro, date]]:
+        usuarios = self.usuarios
+        catalogo = self.catalogo
+        for (id_usuario, isbn), data_emprestimo in self.emprestimos.copiar_entre(data_inicio, data_fim):
+            yield usuarios[id_usuario], catalogo[isbn], data_emprestimo
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+metricas.py
+
+Instrumentação opcional da Biblioteca: contagem de chamadas, contagem de erros por
+classe de exceção e histogramas de latência por operação, exportáveis no formato
+texto do Prometheus (para arquivo ou por um endpoint HTTP local).
+
+A instrumentação é ligada explicitamente, por instância:
+
+    metricas = Metricas()
+    instrumentar(bib, metricas)           # métodos da Biblioteca
+    instrumentar_interface(metricas)      # funções *_interface do console
+
+`instrumentar` substitui os métodos apenas no objeto informado (atributos de
+instância), e `instrumentar_interface` troca as funções no módulo do projeto. Sem
+essas chamadas nenhuma classe ou função é alterada: o caminho normal não passa
+por nenhum invólucro e o custo é zero. `desinstrumentar` e
+`desinstrumentar_interface` desfazem a troca.
+
+Uso (menu de console com métricas):
+    python -m aulas_faculdade.biblioteca.metricas --porta 9464 --arquivo metricas.prom
+"""
+
+import argparse
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import Biblioteca, projeto
+
+# -----------------------------------------------------------
+# Configuração
+# -----------------------------------------------------------
+# Limites superiores (em segundos) dos baldes do histograma de latência
+BALDES_LATENCIA = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Métodos que retornam geradores ficam de fora: o tempo da chamada não inclui o consumo
+METODOS_INSTRUMENTADOS = (
+    'cadastrar_livro',
+    'cadastrar_usuario',
+    'importar_livros',
+    'importar_usuarios',
+    'emprestar_livro',
+    'devolver_livro',
+    'emprestar_lote',
+    'devolver_lote',
+    'buscar_livros',
+    'buscar_livros_ranqueado',
+    'buscar_livros_por_periodo',
+    'gerar_relatorio_livros_disponiveis',
+    'gerar_relatorio_livros_emprestados',
+    'contar_livros_disponiveis',
+    'contar_livros_emprestados',
+    'gerar_relatorio_usuarios',
+    'contar_usuarios',
+    'gerar_relatorio_emprestimos_ativos',
+    'contar_emprestimos_ativos',
+)
+
+FUNCOES_INTERFACE = (
+    'cadastrar_livro_interface',
+    'cadastrar_usuario_interface',
+    'emprestar_livro_interface',
+    'devolver_livro_interface',
+    'consulta_livros_interface',
+    'relatorios_interface',
+)
+
+TIPO_CONTEUDO_PROMETHEUS = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+# -----------------------------------------------------------
+# Classe Metricas
+# -----------------------------------------------------------
+class Metricas:
+    """
+    Acumula contadores e histogramas de latência por operação.
+
+    Atributos:
+        chamadas (Dict[str, int]): chamadas por operação
+        erros (Dict[Tuple[str, str], int]): erros por (operação, classe da exceção)
+        baldes (Dict[str, List[int]]): contagem por balde de latência (não cumulativa)
+        soma_latencia (Dict[str, float]): soma das latências por operação, em segundos
+    """
+
+    def __init__(self, baldes: Tuple[float, ...] = BALDES_LATENCIA):
+        self.limites = baldes
+        self.chamadas: Dict[str, int] = {}
+        self.erros: Dict[Tuple[str, str], int] = {}
+        self.baldes: Dict[str, List[int]] = {}
+        self.soma_latencia: Dict[str, float] = {}
+        self._trava = threading.Lock()
+
+    def observar(self, operacao: str, duracao: float, erro: Optional[BaseException] = None):
+        """
+        Registra uma chamada da operação com sua duração e, se houver, a exceção levantada.
+        """
+        indice = bisect_left(self.limites, duracao)
+        with self._trava:
+            self.chamadas[operacao] = self.chamadas.get(operacao, 0) + 1
+            self.soma_latencia[operacao] = self.soma_latencia.get(operacao, 0.0) + duracao
+            baldes = self.baldes.get(operacao)
+            if baldes is None:
+                baldes = self.baldes[operacao] = [0] * (len(self.limites) + 1)
+            baldes[indice] += 1
+            if erro is not None:
+                chave = (operacao, type(erro).__name__)
+                self.erros[chave] = self.erros.get(chave, 0) + 1
+
+    def envolver(self, operacao: str, funcao):
+        """
+        Retorna um invólucro de `funcao` que mede cada chamada como `operacao`.
+        """
+        relogio = time.perf_counter
+        observar = self.observar
+
+        @functools.wraps(funcao)
+        def instrumentada(*args, **kwargs):
+            inicio = relogio()
+            try:
+                resultado = funcao(*args, **kwargs)
+            except BaseException as e:
+                observar(operacao, relogio() - inicio, e)
+                raise
+            observar(operacao, relogio() - inicio)
+            return resultado
+
+        instrumentada.__wrapped_original__ = funcao
+        return instrumentada
+
+    # ------------------------- Exportação -------------------------
+    def exportar_prometheus(self) -> str:
+        """
+        Retorna as métricas no formato texto de exposição do Prometheus.
+        """
+        with self._trava:
+            chamadas = dict(self.chamadas)
+            erros = dict(self.erros)
+            baldes = {op: list(contagens) for op, contagens in self.baldes.items()}
+            somas = dict(self.soma_latencia)
+
+        linhas = [
+            "# HELP biblioteca_operacoes_total Chamadas por operação da Biblioteca.",
+            "# TYPE biblioteca_operacoes_total counter",
+        ]
+        for operacao in sorted(chamadas):
+            linhas.append(f'biblioteca_operacoes_total{{operacao="{operacao}"}} {chamadas[operacao]}')
+
+        linhas += [
+            "# HELP biblioteca_erros_total Exceções por operação e classe de erro.",
+            "# TYPE biblioteca_erros_total counter",
+        ]
+        for (operacao, erro) in sorted(erros):
+            linhas.append(f'biblioteca_erros_total{{operacao="{operacao}",erro="{erro}"}} '
+                          f'{erros[(operacao, erro)]}')
+
+        linhas += [
+            "# HELP biblioteca_operacao_duracao_segundos Latência das operações da Biblioteca.",
+            "# TYPE biblioteca_operacao_duracao_segundos histogram",
+        ]
+        for operacao in sorted(baldes):
+            acumulado = 0
+            for limite, quantidade in zip(self.limites, baldes[operacao]):
+                acumulado += quantidade
+                linhas.append(f'biblioteca_operacao_duracao_segundos_bucket'
+                              f'{{operacao="{operacao}",le="{limite:g}"}} {acumulado}')
+            acumulado += baldes[operacao][-1]
+            linhas.append(f'biblioteca_operacao_duracao_segundos_bucket'
+                          f'{{operacao="{operacao}",le="+Inf"}} {acumulado}')
+            linhas.append(f'biblioteca_operacao_duracao_segundos_sum{{operacao="{operacao}"}} '
+                          f'{somas[operacao]:.9f}')
+            linhas.append(f'biblioteca_operacao_duracao_segundos_count{{operacao="{operacao}"}} {acumulado}')
+        return "\n".join(linhas) + "\n"
+
+    def gravar(self, caminho):
+        """
+        Grava as métricas em um arquivo (substituição atômica), por exemplo para o
+        textfile collector do node_exporter.
+        """
+        temporario = f"{caminho}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(self.exportar_prometheus())
+        os.replace(temporario, caminho)
+
+    def servir_http(self, host: str = '127.0.0.1', porta: int = 9464) -> ThreadingHTTPServer:
+        """
+        Inicia, em uma thread de fundo, um endpoint HTTP que responde GET /metrics.
+        Retorna o servidor; chame `shutdown()` nele para encerrar.
+        """
+        metricas = self
+
+        class _Manipulador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                corpo = metricas.exportar_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', TIPO_CONTEUDO_PROMETHEUS)
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, formato, *args):
+                pass
+
+        servidor = ThreadingHTTPServer((host, porta), _Manipulador)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        return servidor
+
+
+# -----------------------------------------------------------
+# Ligar e Desligar a Instrumentação
+# -----------------------------------------------------------
+def instrumentar(bib: Biblioteca, metricas: Metricas,
+                 metodos: Iterable[str] = METODOS_INSTRUMENTADOS) -> Biblioteca:
+    """
+    Instrumenta os métodos informados apenas nesta instância (funciona também com as
+    subclasses de Biblioteca). Retorna a própria biblioteca.
+    """
+    for nome in metodos:
+        metodo = getattr(bib, nome, None)
+        if metodo is None or nome in vars(bib):
+            continue
+        setattr(bib, nome, metricas.envolver(nome, metodo))
+    return bib
+
+
+def desinstrumentar(bib: Biblioteca):
+    """
+    Remove os invólucros instalados por `instrumentar`, voltando aos métodos da classe.
+    """
+    for nome, valor in list(vars(bib).items()):
+        if hasattr(valor, '__wrapped_original__'):
+            delattr(bib, nome)
+
+
+def instrumentar_interface(metricas: Metricas, funcoes: Iterable[str] = FUNCOES_INTERFACE):
+    """
+    Instrumenta as funções *_interface do console (o menu as procura no módulo a cada opção).
+    """
+    for nome in funcoes:
+        funcao = getattr(projeto, nome)
+        if not hasattr(funcao, '__wrapped_original__'):
+            setattr(projeto, nome, metricas.envolver(nome, funcao))
+
+
+def desinstrumentar_interface():
+    """
+    Restaura as funções *_interface originais.
+    """
+    for nome in FUNCOES_INTERFACE:
+        funcao = getattr(projeto, nome)
+        original = getattr(funcao, '__wrapped_original__', None)
+        if original is not None:
+            setattr(projeto, nome, original)
+
+
+def main():
+    """
+    Executa o menu de console com a instrumentação ligada.
+    """
+    parser = argparse.ArgumentParser(description="Menu da Biblioteca com métricas no formato Prometheus.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, help="porta do endpoint HTTP /metrics")
+    parser.add_argument('--arquivo', help="arquivo onde gravar as métricas ao sair")
+    projeto.adicionar_argumentos_script(parser)
+    args = parser.parse_args()
+
+    metricas = Metricas()
+    bib = instrumentar(Biblioteca(), metricas)
+    instrumentar_interface(metricas)
+    servidor = metricas.servir_http(args.host, args.porta) if args.porta else None
+    try:
+        projeto.main(bib, args.script, args.saida_script)
+    finally:
+        desinstrumentar_interface()
+        if servidor is not None:
+            servidor.shutdown()
+        if args.arquivo:
+            metricas.gravar(args.arquivo)
+
+
+if __name__ == '__main__':
+    main()
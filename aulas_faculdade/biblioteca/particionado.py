@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+particionado.py
+
+Modo particionado (sharded) da Biblioteca, com um processo de trabalho por partição.
+
+Os livros são distribuídos entre as partições pelo hash do ISBN e os usuários pelo
+hash do id_usuario. Cada processo mantém uma Biblioteca com a sua fatia, de modo
+que consultas e relatórios rodam em paralelo em vários núcleos:
+- operações de uma chave (cadastro, empréstimo, devolução, empréstimos de um livro)
+  vão apenas para a partição dona;
+- importações são lidas no coordenador e cada lote é dividido entre as partições
+  donas, que validam e cadastram a sua parte em paralelo;
+- buscas e relatórios são enviados a todas as partições e os resultados são
+  combinados no processo coordenador.
+
+Os empréstimos ficam na partição do livro. Como o usuário pode estar em outra
+partição, o coordenador primeiro consulta a partição do usuário (que confirma a
+existência e informa nome e contato) e depois envia a operação à partição do livro,
+que mantém uma cópia-sombra do usuário para registrar o empréstimo. As sombras
+não aparecem no relatório de usuários, que considera só os usuários próprios de
+cada partição.
+
+Empréstimos e devoluções em lote continuam tudo-ou-nada entre as partições: cada
+partição verifica os pares dos seus livros e só se nenhuma encontrar erro todas
+aplicam a sua parte. Se a aplicação falhar em uma delas, as que já aplicaram
+desfazem a sua parte.
+
+A ordem dos relatórios combinados segue as partições (e, dentro de cada uma, a
+ordem da Biblioteca); buscas por período e empréstimos por data são intercalados
+para manter a ordenação por ano e por data. Relatórios paginados (com `limite` ou
+`apos`) seguem a ordem da chave: cada partição devolve a sua própria página e o
+coordenador intercala as páginas e corta no limite. Na busca aproximada, cada partição
+devolve os seus `limite` melhores e o coordenador escolhe os `limite` melhores entre
+eles; a pontuação de um livro depende só do próprio livro, então é comparável entre
+partições.
+
+Uso:
+    python -m aulas_faculdade.biblioteca.particionado --particoes 4 [--script OPERACOES]
+"""
+
+import argparse
+import heapq
+import multiprocessing
+import zlib
+from datetime import date
+from functools import partial
+from itertools import islice
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import Biblioteca, Livro, Usuario, UsuarioNaoEncontradoError, projeto
+
+
+# -----------------------------------------------------------
+# Classe ParticaoBiblioteca (executada nos processos de trabalho)
+# -----------------------------------------------------------
+class ParticaoBiblioteca(Biblioteca):
+    """
+    Biblioteca de uma partição.
+
+    Atributos:
+        proprios (Dict[str, None]): ids (em ordem de cadastro) dos usuários que pertencem
+            a esta partição; os demais em `usuarios` são sombras criadas por empréstimos
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.proprios: Dict[str, None] = {}
+        self._desfazer_lote: Optional[Callable[[], Any]] = None
+
+    def cadastrar_usuario(self, nome: str, id_usuario: str, contato: str):
+        super().cadastrar_usuario(nome, id_usuario, contato)
+        self.proprios[id_usuario] = None
+
+    def _adicionar_usuarios(self, usuarios: List[Usuario]):
+        super()._adicionar_usuarios(usuarios)
+        for usuario in usuarios:
+            self.proprios[usuario.id_usuario] = None
+
+    def dados_usuario(self, id_usuario: str) -> Tuple[str, str]:
+        """
+        Retorna (nome, contato) de um usuário próprio desta partição.
+        """
+        if id_usuario not in self.proprios:
+            raise UsuarioNaoEncontradoError(f"Usuário com ID {id_usuario} não encontrado.")
+        usuario = self.usuarios[id_usuario]
+        return usuario.nome, usuario.contato
+
+    def dados_usuarios(self, ids: List[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        Retorna {id_usuario: (nome, contato)} dos ids que são usuários próprios desta partição.
+        """
+        usuarios = self.usuarios
+        return {id_usuario: (usuarios[id_usuario].nome, usuarios[id_usuario].contato)
+                for id_usuario in ids if id_usuario in self.proprios}
+
+    def _garantir_usuario(self, nome: str, id_usuario: str, contato: str):
+        """
+        Cria a sombra de um usuário de outra partição, se ainda não existir.
+        """
+        if id_usuario not in self.usuarios:
+            self.usuarios[id_usuario] = Usuario(nome, id_usuario, contato)
+
+    def emprestar_para(self, nome: str, id_usuario: str, contato: str, isbn: str,
+                       data_emprestimo: Optional[date] = None):
+        self._garantir_usuario(nome, id_usuario, contato)
+        self.emprestar_livro(id_usuario, isbn, data_emprestimo)
+
+    def devolver_de(self, nome: str, id_usuario: str, contato: str, isbn: str):
+        self._garantir_usuario(nome, id_usuario, contato)
+        self.devolver_livro(id_usuario, isbn)
+
+    def verificar_lote(self, operacao: str, dados: Dict[str, Tuple[str, str]],
+                       pares: List[Tuple[str, str]]) -> List[Optional[Exception]]:
+        """
+        Cria as sombras dos usuários em `dados` e verifica os pares ('emprestar' ou
+        'devolver') dos livros desta partição, sem alterar nada.
+        """
+        for id_usuario, (nome, contato) in dados.items():
+            self._garantir_usuario(nome, id_usuario, contato)
+        if operacao == 'emprestar':
+            return self._verificar_emprestimos(pares)
+        return self._verificar_devolucoes(pares)
+
+    def aplicar_lote(self, operacao: str, pares: List[Tuple[str, str]],
+                     data_emprestimo: Optional[date] = None):
+        """
+        Aplica a parte de um lote já verificada e guarda como desfazê-la, para o caso
+        de outra partição não conseguir aplicar a sua.
+        """
+        self._desfazer_lote = None
+        if operacao == 'emprestar':
+            resultado = self.emprestar_lote(pares, data_emprestimo)
+            desfazer = partial(self.devolver_lote, pares)
+        else:
+            registro = self.emprestimos
+            anteriores = [(par, registro.ativos.get(par), registro.vencimentos.get(par)) for par in pares]
+            resultado = self.devolver_lote(pares)
+            desfazer = partial(self._restaurar_emprestimos, anteriores)
+        if not resultado.aplicado:
+            raise next(erro for erro in resultado.erros if erro is not None)
+        self._desfazer_lote = desfazer
+
+    def desfazer_lote(self):
+        """
+        Desfaz a última parte de lote aplicada por aplicar_lote.
+        """
+        desfazer, self._desfazer_lote = self._desfazer_lote, None
+        if desfazer is not None:
+            desfazer()
+
+    def _restaurar_emprestimos(self, anteriores: List[Tuple[Tuple[str, str], date, Optional[date]]]):
+        """
+        Refaz empréstimos devolvidos, com as datas de empréstimo e de vencimento originais.
+        """
+        for (id_usuario, isbn), data_emprestimo, data_vencimento in anteriores:
+            livro = self.catalogo[isbn]
+            livro.copias_disponiveis -= 1
+            self.usuarios[id_usuario].emprestimos_ativos[isbn] = data_emprestimo
+            self.emprestimos.registrar(id_usuario, isbn, data_emprestimo, data_vencimento)
+            self._atualizar_disponibilidade(livro)
+
+    def importar_lote_livros(self, lote: List[Tuple[int, object]]) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Valida e cadastra a parte de um lote de importação que cabe a esta partição.
+        Retorna (quantidade importada, erros por linha).
+        """
+        erros: List[Tuple[int, str]] = []
+        novos = projeto._validar_livros(lote, self.catalogo, erros)
+        self._adicionar_livros(novos)
+        return len(novos), erros
+
+    def importar_lote_usuarios(self, lote: List[Tuple[int, object]]) -> Tuple[int, List[Tuple[int, str]]]:
+        erros: List[Tuple[int, str]] = []
+        novos = projeto._validar_usuarios(lote, self.usuarios, erros)
+        self._adicionar_usuarios(novos)
+        return len(novos), erros
+
+    def emprestimos_locais_do_usuario(self, id_usuario: str) -> List[Tuple[Usuario, Livro, date]]:
+        """
+        Empréstimos do usuário registrados nesta partição (os dos livros daqui). Um
+        usuário desconhecido aqui, nem próprio nem sombra, simplesmente não tem
+        empréstimos nesta partição: a existência é conferida na partição dona.
+        """
+        if id_usuario not in self.usuarios:
+            return []
+        return list(self.emprestimos_do_usuario(id_usuario))
+
+    def gerar_relatorio_usuarios(self, limite: Optional[int] = None,
+                                 apos: Optional[str] = None) -> List[Usuario]:
+        if limite is not None or apos is not None:
+            return list(islice(self.cursor_usuarios(apos), limite))
+        usuarios = self.usuarios
+        return [usuarios[id_usuario] for id_usuario in self.proprios]
+
+    def cursor_usuarios(self, apos: Optional[str] = None) -> Iterator[Usuario]:
+        proprios = self.proprios
+        for usuario in super().cursor_usuarios(apos):
+            if usuario.id_usuario in proprios:
+                yield usuario
+
+    def contar_usuarios(self) -> int:
+        return len(self.proprios)
+
+
+def _ler_atributo(particao: ParticaoBiblioteca, indice: int, n_particoes: int, nome: str) -> Any:
+    return getattr(particao, nome)
+
+
+def _trabalhador(conexao):
+    """
+    Laço de um processo de trabalho: recebe (método, argumentos), executa na partição
+    e devolve (True, resultado) ou (False, exceção). Geradores são materializados.
+    Uma mensagem None encerra o processo.
+    """
+    particao = ParticaoBiblioteca()
+    while True:
+        mensagem = conexao.recv()
+        if mensagem is None:
+            break
+        metodo, argumentos = mensagem
+        try:
+            if callable(metodo):
+                resultado = metodo(particao, *argumentos)
+            else:
+                resultado = getattr(particao, metodo)(*argumentos)
+            if isinstance(resultado, Iterator):
+                resultado = list(resultado)
+        except Exception as e:
+            conexao.send((False, e))
+        else:
+            conexao.send((True, resultado))
+    conexao.close()
+
+
+# -----------------------------------------------------------
+# Classe BibliotecaParticionada (coordenador)
+# -----------------------------------------------------------
+# Chaves da paginação, usadas para intercalar as páginas das partições
+_CHAVE_LIVRO = attrgetter('isbn')
+_CHAVE_USUARIO = attrgetter('id_usuario')
+
+
+def _chave_emprestimo(emprestimo: Tuple[Usuario, Livro, date]) -> Tuple[str, str]:
+    return emprestimo[0].id_usuario, emprestimo[1].isbn
+
+
+class BibliotecaParticionada:
+    """
+    Biblioteca distribuída entre processos, com os mesmos métodos de Biblioteca. O
+    estado (catalogo, usuarios, registro de empréstimos) fica nas partições; multas e
+    ultimo_processamento são lidos delas e combinados.
+
+    Atributos:
+        n_particoes (int): quantidade de partições (e de processos de trabalho)
+    """
+
+    # Itens pedidos a cada partição por vez pelos cursores
+    TAMANHO_PAGINA = 1000
+
+    def __init__(self, n_particoes: int = None):
+        self.n_particoes = n_particoes or multiprocessing.cpu_count()
+        self._conexoes = []
+        self._processos = []
+        for _ in range(self.n_particoes):
+            local, remota = multiprocessing.Pipe()
+            processo = multiprocessing.Process(target=_trabalhador, args=(remota,), daemon=True)
+            processo.start()
+            remota.close()
+            self._conexoes.append(local)
+            self._processos.append(processo)
+
+    def particao(self, chave: str) -> int:
+        """
+        Retorna a partição dona de um ISBN ou id_usuario (hash estável entre processos).
+        """
+        return zlib.crc32(chave.encode('utf-8')) % self.n_particoes
+
+    # ------------------------- Comunicação -------------------------
+    @staticmethod
+    def _resposta(conexao) -> Any:
+        ok, resultado = conexao.recv()
+        if not ok:
+            raise resultado
+        return resultado
+
+    def _chamar(self, indice: int, metodo, *argumentos) -> Any:
+        """
+        Executa um método na partição informada e retorna o resultado.
+        """
+        conexao = self._conexoes[indice]
+        conexao.send((metodo, argumentos))
+        return self._resposta(conexao)
+
+    def _coletar(self) -> List[Any]:
+        """
+        Lê a resposta de todas as partições, em ordem; todas são lidas antes de
+        repassar uma eventual exceção, para não deixar respostas pendentes.
+        """
+        resultados, erro = [], None
+        for conexao in self._conexoes:
+            try:
+                resultados.append(self._resposta(conexao))
+            except Exception as e:
+                erro = erro or e
+        if erro is not None:
+            raise erro
+        return resultados
+
+    def _espalhar(self, metodo, *argumentos) -> List[Any]:
+        """
+        Envia o mesmo método a todas as partições e coleta os resultados.
+        """
+        for conexao in self._conexoes:
+            conexao.send((metodo, argumentos))
+        return self._coletar()
+
+    def _distribuir(self, metodo, argumentos: List[tuple]) -> List[Any]:
+        """
+        Envia o mesmo método a todas as partições, cada uma com os seus próprios
+        argumentos (argumentos[i] para a partição i), e coleta os resultados.
+        """
+        for conexao, argumentos_particao in zip(self._conexoes, argumentos):
+            conexao.send((metodo, argumentos_particao))
+        return self._coletar()
+
+    def em_todas(self, funcao: Callable, *argumentos) -> List[Any]:
+        """
+        Executa funcao(particao, indice, n_particoes, *argumentos) em cada processo de
+        trabalho (a função deve ser definida no nível de um módulo). Útil para cargas
+        e manutenção feitas diretamente nas partições.
+        """
+        for indice, conexao in enumerate(self._conexoes):
+            conexao.send((funcao, (indice, self.n_particoes) + argumentos))
+        return self._coletar()
+
+    def fechar(self):
+        """
+        Encerra os processos de trabalho.
+        """
+        for conexao in self._conexoes:
+            conexao.send(None)
+            conexao.close()
+        for processo in self._processos:
+            processo.join()
+        self._conexoes = []
+        self._processos = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    # ------------------------- Cadastros -------------------------
+    def cadastrar_livro(self, titulo: str, autor: str, ano: int, isbn: str, total_copias: int):
+        self._chamar(self.particao(isbn), 'cadastrar_livro', titulo, autor, ano, isbn, total_copias)
+
+    def cadastrar_usuario(self, nome: str, id_usuario: str, contato: str):
+        self._chamar(self.particao(id_usuario), 'cadastrar_usuario', nome, id_usuario, contato)
+
+    def _importar(self, metodo: str, caminho, campos: Tuple[str, ...], posicao_chave: int,
+                  formato: Optional[str], tamanho_lote: int) -> projeto.RelatorioImportacao:
+        """
+        Lê o arquivo em lotes no coordenador e divide cada lote pela partição da chave
+        (campo `posicao_chave`); as partições validam e cadastram as suas partes em paralelo.
+        Linhas ilegíveis vão para a partição 0, que só as registra como erro.
+        """
+        relatorio = projeto.RelatorioImportacao()
+        registros = projeto._ler_registros(caminho, campos, formato)
+        while True:
+            lote = list(islice(registros, tamanho_lote))
+            if not lote:
+                break
+            relatorio.lidos += len(lote)
+            partes: List[List[Tuple[int, object]]] = [[] for _ in range(self.n_particoes)]
+            for registro in lote:
+                valores = registro[1]
+                chave = None if isinstance(valores, str) else valores[posicao_chave]
+                partes[self.particao(chave.strip()) if isinstance(chave, str) else 0].append(registro)
+            resultados = self._distribuir(metodo, [(parte,) for parte in partes])
+            relatorio.importados += sum(map(itemgetter(0), resultados))
+            # Cada partição devolve os erros em ordem de linha
+            relatorio.erros.extend(heapq.merge(*map(itemgetter(1), resultados)))
+        return relatorio
+
+    def importar_livros(self, caminho, formato: Optional[str] = None,
+                        tamanho_lote: int = projeto.TAMANHO_LOTE_IMPORTACAO) -> projeto.RelatorioImportacao:
+        return self._importar('importar_lote_livros', caminho, projeto.CAMPOS_LIVRO,
+                              projeto.CAMPOS_LIVRO.index('isbn'), formato, tamanho_lote)
+
+    def importar_usuarios(self, caminho, formato: Optional[str] = None,
+                          tamanho_lote: int = projeto.TAMANHO_LOTE_IMPORTACAO) -> projeto.RelatorioImportacao:
+        return self._importar('importar_lote_usuarios', caminho, projeto.CAMPOS_USUARIO,
+                              projeto.CAMPOS_USUARIO.index('id_usuario'), formato, tamanho_lote)
+
+    # ------------------------- Empréstimos -------------------------
+    def emprestar_livro(self, id_usuario: str, isbn: str, data_emprestimo: Optional[date] = None):
+        nome, contato = self._chamar(self.particao(id_usuario), 'dados_usuario', id_usuario)
+        self._chamar(self.particao(isbn), 'emprestar_para', nome, id_usuario, contato, isbn, data_emprestimo)
+
+    def devolver_livro(self, id_usuario: str, isbn: str):
+        nome, contato = self._chamar(self.particao(id_usuario), 'dados_usuario', id_usuario)
+        self._chamar(self.particao(isbn), 'devolver_de', nome, id_usuario, contato, isbn)
+
+    def _lote(self, operacao: str, pares: Iterable[Tuple[str, str]],
+              data_emprestimo: Optional[date] = None) -> projeto.ResultadoLote:
+        """
+        Empréstimo ou devolução em lote, tudo-ou-nada entre as partições. Os dados dos
+        usuários vêm das partições donas; cada partição de livros verifica os seus pares
+        e, sem nenhum erro, todas aplicam a sua parte. Se alguma falhar ao aplicar, as
+        que já aplicaram desfazem a sua parte e a exceção é repassada.
+        """
+        pares = list(map(tuple, pares))
+        ids: List[List[str]] = [[] for _ in range(self.n_particoes)]
+        for id_usuario in dict.fromkeys(map(itemgetter(0), pares)):
+            ids[self.particao(id_usuario)].append(id_usuario)
+        dados: Dict[str, Tuple[str, str]] = {}
+        for parte in self._distribuir('dados_usuarios', [(lista,) for lista in ids]):
+            dados.update(parte)
+
+        posicoes: List[List[int]] = [[] for _ in range(self.n_particoes)]
+        for posicao, (_, isbn) in enumerate(pares):
+            posicoes[self.particao(isbn)].append(posicao)
+        partes = [[pares[posicao] for posicao in lista] for lista in posicoes]
+        verificacoes = self._distribuir('verificar_lote', [
+            (operacao, {id_usuario: dados[id_usuario] for id_usuario, _ in parte if id_usuario in dados}, parte)
+            for parte in partes
+        ])
+        erros: List[Optional[Exception]] = [None] * len(pares)
+        for lista, erros_particao in zip(posicoes, verificacoes):
+            for posicao, erro in zip(lista, erros_particao):
+                erros[posicao] = erro
+        if any(erros):
+            return projeto.ResultadoLote(False, erros)
+
+        envolvidas = [indice for indice, parte in enumerate(partes) if parte]
+        for indice in envolvidas:
+            self._conexoes[indice].send(('aplicar_lote', (operacao, partes[indice], data_emprestimo)))
+        aplicadas, falha = [], None
+        for indice in envolvidas:
+            try:
+                self._resposta(self._conexoes[indice])
+                aplicadas.append(indice)
+            except Exception as e:
+                falha = falha or e
+        if falha is not None:
+            for indice in aplicadas:
+                self._chamar(indice, 'desfazer_lote')
+            raise falha
+        return projeto.ResultadoLote(True, erros)
+
+    def emprestar_lote(self, pares: Iterable[Tuple[str, str]],
+                       data_emprestimo: Optional[date] = None) -> projeto.ResultadoLote:
+        if data_emprestimo is None:
+            data_emprestimo = date.today()
+        return self._lote('emprestar', pares, data_emprestimo)
+
+    def devolver_lote(self, pares: Iterable[Tuple[str, str]]) -> projeto.ResultadoLote:
+        return self._lote('devolver', pares)
+
+    # ------------------------- Consultas e relatórios -------------------------
+    def buscar_livros(self, campo: str, valor_busca: str, limite: Optional[int] = None,
+                      apos: Optional[str] = None) -> List[Livro]:
+        if campo == 'ano':
+            try:
+                ano = int(valor_busca)
+            except ValueError:
+                return []
+            livros = self.buscar_livros_por_periodo(ano, ano)
+            if apos is not None:
+                isbns = [livro.isbn for livro in livros]
+                livros = livros[isbns.index(apos) + 1:] if apos in isbns else []
+            return livros[:limite]
+        if limite is None and apos is None:
+            return [livro for parte in self._espalhar('buscar_livros', campo, valor_busca) for livro in parte]
+        # O resultado segue as partições: retoma na partição do ISBN `apos` e, se a
+        # página não encher, continua nas seguintes desde o início
+        livros: List[Livro] = []
+        inicio = 0 if apos is None else self.particao(apos)
+        for indice in range(inicio, self.n_particoes):
+            restante = None if limite is None else limite - len(livros)
+            livros += self._chamar(indice, 'buscar_livros', campo, valor_busca, restante,
+                                   apos if indice == inicio else None)
+            if limite is not None and len(livros) >= limite:
+                break
+        return livros
+
+    def buscar_livros_pontuados(self, termo: str, limite: int = 10,
+                                campos: Tuple[str, ...] = Biblioteca.CAMPOS_TEXTO) -> List[Tuple[float, Livro]]:
+        partes = self._espalhar('buscar_livros_pontuados', termo, limite, tuple(campos))
+        return heapq.nlargest(limite, (par for parte in partes for par in parte), key=itemgetter(0))
+
+    def buscar_livros_ranqueado(self, termo: str, limite: int = 10,
+                                campos: Tuple[str, ...] = Biblioteca.CAMPOS_TEXTO) -> List[Livro]:
+        return [livro for _, livro in self.buscar_livros_pontuados(termo, limite, campos)]
+
+    def buscar_livros_por_periodo(self, ano_inicio: int, ano_fim: int) -> List[Livro]:
+        partes = self._espalhar('buscar_livros_por_periodo', ano_inicio, ano_fim)
+        return list(heapq.merge(*partes, key=attrgetter('ano')))
+
+    def _pagina(self, metodo: str, limite: Optional[int], apos, chave: Callable) -> List[Any]:
+        """
+        Pede a mesma página (em ordem de chave) a todas as partições e intercala as
+        respostas, mantendo os `limite` primeiros itens.
+        """
+        partes = self._espalhar(metodo, limite, apos)
+        return list(islice(heapq.merge(*partes, key=chave), limite))
+
+    def _cursor(self, metodo: str, apos, chave: Callable) -> Iterator[Any]:
+        """
+        Gera todos os itens após `apos`, pedindo às partições páginas de TAMANHO_PAGINA.
+        """
+        while True:
+            pagina = self._pagina(metodo, self.TAMANHO_PAGINA, apos, chave)
+            yield from pagina
+            if len(pagina) < self.TAMANHO_PAGINA:
+                return
+            apos = chave(pagina[-1])
+
+    def gerar_relatorio_livros_disponiveis(self, limite: Optional[int] = None,
+                                           apos: Optional[str] = None) -> List[Livro]:
+        if limite is not None or apos is not None:
+            return self._pagina('gerar_relatorio_livros_disponiveis', limite, apos, _CHAVE_LIVRO)
+        return [livro for parte in self._espalhar('gerar_relatorio_livros_disponiveis') for livro in parte]
+
+    def gerar_relatorio_livros_emprestados(self, limite: Optional[int] = None,
+                                           apos: Optional[str] = None) -> List[Livro]:
+        if limite is not None or apos is not None:
+            return self._pagina('gerar_relatorio_livros_emprestados', limite, apos, _CHAVE_LIVRO)
+        return [livro for parte in self._espalhar('gerar_relatorio_livros_emprestados') for livro in parte]
+
+    def cursor_livros_disponiveis(self, apos: Optional[str] = None) -> Iterator[Livro]:
+        return self._cursor('gerar_relatorio_livros_disponiveis', apos, _CHAVE_LIVRO)
+
+    def cursor_livros_emprestados(self, apos: Optional[str] = None) -> Iterator[Livro]:
+        return self._cursor('gerar_relatorio_livros_emprestados', apos, _CHAVE_LIVRO)
+
+    def cursor_busca(self, campo: str, valor_busca: str, apos: Optional[str] = None) -> Iterator[Livro]:
+        while True:
+            pagina = self.buscar_livros(campo, valor_busca, self.TAMANHO_PAGINA, apos)
+            yield from pagina
+            if len(pagina) < self.TAMANHO_PAGINA:
+                return
+            apos = pagina[-1].isbn
+
+    def contar_livros_disponiveis(self) -> int:
+        return sum(self._espalhar('contar_livros_disponiveis'))
+
+    def contar_livros_emprestados(self) -> int:
+        return sum(self._espalhar('contar_livros_emprestados'))
+
+    def gerar_relatorio_usuarios(self, limite: Optional[int] = None,
+                                 apos: Optional[str] = None) -> List[Usuario]:
+        if limite is not None or apos is not None:
+            return self._pagina('gerar_relatorio_usuarios', limite, apos, _CHAVE_USUARIO)
+        return [usuario for parte in self._espalhar('gerar_relatorio_usuarios') for usuario in parte]
+
+    def cursor_usuarios(self, apos: Optional[str] = None) -> Iterator[Usuario]:
+        return self._cursor('gerar_relatorio_usuarios', apos, _CHAVE_USUARIO)
+
+    def contar_usuarios(self) -> int:
+        return sum(self._espalhar('contar_usuarios'))
+
+    def gerar_relatorio_emprestimos_ativos(self, limite: Optional[int] = None,
+                                           apos: Optional[Tuple[str, str]] = None
+                                           ) -> List[Tuple[Usuario, Livro, date]]:
+        if limite is not None or apos is not None:
+            return self._pagina('gerar_relatorio_emprestimos_ativos', limite,
+                                None if apos is None else tuple(apos), _chave_emprestimo)
+        return list(self.iterar_emprestimos_ativos())
+
+    def cursor_emprestimos_ativos(self, apos: Optional[Tuple[str, str]] = None
+                                  ) -> Iterator[Tuple[Usuario, Livro, date]]:
+        return self._cursor('gerar_relatorio_emprestimos_ativos',
+                            None if apos is None else tuple(apos), _chave_emprestimo)
+
+    def iterar_emprestimos_ativos(self) -> Iterator[Tuple[Usuario, Livro, date]]:
+        for parte in self._espalhar('iterar_emprestimos_ativos'):
+            yield from parte
+
+    def contar_emprestimos_ativos(self) -> int:
+        return sum(self._espalhar('contar_emprestimos_ativos'))
+
+    def emprestimos_do_livro(self, isbn: str) -> Iterator[Tuple[Usuario, Livro, date]]:
+        return iter(self._chamar(self.particao(isbn), 'emprestimos_do_livro', isbn))
+
+    def emprestimos_do_usuario(self, id_usuario: str) -> Iterator[Tuple[Usuario, Livro, date]]:
+        # A partição dona confirma o usuário (UsuarioNaoEncontradoError se não existir);
+        # os empréstimos estão nas partições dos livros
+        self._chamar(self.particao(id_usuario), 'dados_usuario', id_usuario)
+        for parte in self._espalhar('emprestimos_locais_do_usuario', id_usuario):
+            yield from parte
+
+    def emprestimos_entre(self, data_inicio: date, data_fim: date) -> Iterator[Tuple[Usuario, Livro, date]]:
+        partes = self._espalhar('emprestimos_entre', data_inicio, data_fim)
+        return heapq.merge(*partes, key=itemgetter(2))
+
+    # ------------------------- Prazos e atrasos -------------------------
+    def data_vencimento(self, id_usuario: str, isbn: str) -> Optional[date]:
+        return self._chamar(self.particao(isbn), 'data_vencimento', id_usuario, isbn)
+
+    def emprestimos_vencidos(self, data_referencia: Optional[date] = None) -> Iterator[Tuple[Usuario, Livro, date]]:
+        if data_referencia is None:
+            data_referencia = date.today()
+        partes = self._espalhar('emprestimos_vencidos', data_referencia)
+        return heapq.merge(*partes, key=itemgetter(2))
+
+    @property
+    def multas(self) -> Dict[str, int]:
+        """
+        Multas acumuladas por id_usuario, em centavos, somadas entre as partições.
+        """
+        multas: Dict[str, int] = {}
+        for parte in self.em_todas(_ler_atributo, 'multas'):
+            for id_usuario, valor in parte.items():
+                multas[id_usuario] = multas.get(id_usuario, 0) + valor
+        return multas
+
+    @property
+    def ultimo_processamento(self) -> Optional[date]:
+        """
+        Data da última execução de processar_atrasos (todas as partições processam juntas).
+        """
+        return self.em_todas(_ler_atributo, 'ultimo_processamento')[0]
+
+    def processar_atrasos(self, data_referencia: Optional[date] = None) -> projeto.RelatorioAtrasos:
+        """
+        Executa o processamento de atrasos em todas as partições (cada uma cobra os
+        empréstimos dos seus livros) e combina avisos e multas.
+        """
+        if data_referencia is None:
+            data_referencia = date.today()
+        relatorio = projeto.RelatorioAtrasos(data_referencia)
+        partes = self._espalhar('processar_atrasos', data_referencia)
+        relatorio.avisos = list(heapq.merge(*(parte.avisos for parte in partes), key=itemgetter(2)))
+        for parte in partes:
+            for id_usuario, valor in parte.multas.items():
+                relatorio.multas[id_usuario] = relatorio.multas.get(id_usuario, 0) + valor
+        return relatorio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Menu da Biblioteca em modo particionado.")
+    parser.add_argument('--particoes', type=int, default=multiprocessing.cpu_count())
+    projeto.adicionar_argumentos_script(parser)
+    args = parser.parse_args()
+    with BibliotecaParticionada(args.particoes) as bib:
+        projeto.main(bib, args.script, args.saida_script)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+persistencia.py
+
+Persistência durável para a Biblioteca: log de escrita antecipada (write-ahead log)
+com fsync em grupo e snapshots periódicos.
+
+Cada operação bem-sucedida de cadastro, empréstimo ou devolução gera um registro
+compacto no log. Periodicamente o estado completo é gravado em um snapshot e o log
+é truncado, de modo que a recuperação carrega o snapshot e reexecuta apenas a
+cauda do log.
+
+Formato de cada registro do log:
+    [tamanho: uint32][crc32: uint32][carga útil JSON em UTF-8]
+A carga útil é uma lista [lsn, operação, argumentos...].
+
+Os snapshots podem ser gravados em pickle (padrão) ou no formato binário mapeável
+de snapshot_mapeado.py, que permite iniciar com milhões de livros sem reconstruir
+os objetos. A recuperação lê o formato que estiver no diretório.
+
+Uso:
+    python -m aulas_faculdade.biblioteca.persistencia DIRETORIO [--snapshot-mapeado] [--script OPERACOES]
+"""
+
+import argparse
+import json
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from . import Biblioteca, Livro, Usuario, projeto
+from .snapshot_mapeado import carregar_snapshot_mapeado, escrever_biblioteca_mapeada
+
+# -----------------------------------------------------------
+# Códigos de Operação do Log
+# -----------------------------------------------------------
+OP_CADASTRAR_LIVRO = 'L'
+OP_CADASTRAR_USUARIO = 'U'
+OP_EMPRESTAR = 'E'
+OP_DEVOLVER = 'D'
+OP_EMPRESTAR_LOTE = 'EL'
+OP_DEVOLVER_LOTE = 'DL'
+OP_PROCESSAR_ATRASOS = 'A'
+OP_IMPORTAR_LIVROS = 'IL'
+OP_IMPORTAR_USUARIOS = 'IU'
+
+_CABECALHO = struct.Struct('<II')
+VERSAO_SNAPSHOT = 1
+
+
+# -----------------------------------------------------------
+# Classe LogEscrita
+# -----------------------------------------------------------
+class LogEscrita:
+    """
+    Log de escrita antecipada com fsync em grupo.
+
+    Os registros são acumulados em um buffer e gravados com um único write + fsync
+    quando o grupo atinge `tamanho_grupo` registros ou, por uma thread de
+    sincronização, quando o registro mais antigo do buffer completa `intervalo_fsync`
+    segundos de espera. Assim, o custo de um fsync é dividido entre várias operações.
+
+    Uma operação é confirmada ao chamador antes de ser durável: numa queda, perdem-se
+    no máximo os registros dos últimos `intervalo_fsync` segundos (a recuperação volta
+    a um estado consistente anterior a eles). Com `intervalo_fsync` igual a 0, cada
+    registro é sincronizado antes de anexar retornar.
+
+    Atributos:
+        caminho (Path): arquivo do log
+        tamanho_grupo (int): quantidade máxima de registros por fsync
+        intervalo_fsync (float): tempo máximo (s) que um registro aguarda no buffer antes do fsync
+    """
+
+    def __init__(self, caminho: Path, tamanho_grupo: int = 128, intervalo_fsync: float = 0.01):
+        self.caminho = Path(caminho)
+        self.tamanho_grupo = tamanho_grupo
+        self.intervalo_fsync = intervalo_fsync
+        self._arquivo = open(self.caminho, 'ab')
+        self._pendentes: List[bytes] = []
+        self._primeiro_pendente = 0.0  # instante em que o registro pendente mais antigo chegou
+        self._condicao = threading.Condition()
+        self._sincronizador = None
+        if intervalo_fsync > 0:
+            self._sincronizador = threading.Thread(target=self._sincronizar_periodicamente,
+                                                   name='LogEscrita-fsync', daemon=True)
+            self._sincronizador.start()
+
+    @staticmethod
+    def codificar(registro: list) -> bytes:
+        """
+        Converte um registro em bytes no formato [tamanho][crc32][JSON].
+        """
+        carga = json.dumps(registro, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        return _CABECALHO.pack(len(carga), zlib.crc32(carga)) + carga
+
+    @staticmethod
+    def ler(caminho: Path) -> Tuple[List[list], int]:
+        """
+        Lê todos os registros íntegros do log.
+        Retorna a lista de registros e o deslocamento do fim do último registro válido;
+        um registro incompleto ou corrompido encerra a leitura (cauda rasgada).
+        """
+        registros: List[list] = []
+        caminho = Path(caminho)
+        if not caminho.exists():
+            return registros, 0
+        dados = caminho.read_bytes()
+        tamanho_cabecalho = _CABECALHO.size
+        posicao = 0
+        while posicao + tamanho_cabecalho <= len(dados):
+            tamanho, crc = _CABECALHO.unpack_from(dados, posicao)
+            inicio = posicao + tamanho_cabecalho
+            fim = inicio + tamanho
+            if fim > len(dados):
+                break
+            carga = dados[inicio:fim]
+            if zlib.crc32(carga) != crc:
+                break
+            registros.append(json.loads(carga))
+            posicao = fim
+        return registros, posicao
+
+    def anexar(self, registro: list):
+        """
+        Adiciona um registro ao grupo pendente, sincronizando se o grupo estiver cheio
+        (ou imediatamente, com intervalo_fsync igual a 0).
+        """
+        dados = self.codificar(registro)
+        with self._condicao:
+            if not self._pendentes:
+                self._primeiro_pendente = time.monotonic()
+                self._condicao.notify()
+            self._pendentes.append(dados)
+            if len(self._pendentes) >= self.tamanho_grupo or self._sincronizador is None:
+                self._gravar_pendentes()
+
+    def _sincronizar_periodicamente(self):
+        """
+        Laço da thread de sincronização: grava o grupo pendente quando o registro mais
+        antigo completa `intervalo_fsync` segundos no buffer.
+        """
+        with self._condicao:
+            while not self._arquivo.closed:
+                if not self._pendentes:
+                    self._condicao.wait()
+                    continue
+                espera = self._primeiro_pendente + self.intervalo_fsync - time.monotonic()
+                if espera > 0:
+                    self._condicao.wait(espera)
+                    continue
+                self._gravar_pendentes()
+
+    def _gravar_pendentes(self):
+        """
+        Grava os registros pendentes e faz o fsync (chamado com a condição adquirida).
+        """
+        if self._pendentes:
+            self._arquivo.write(b''.join(self._pendentes))
+            self._pendentes.clear()
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+
+    def sincronizar(self):
+        """
+        Grava os registros pendentes e força a persistência em disco (fsync).
+        """
+        with self._condicao:
+            self._gravar_pendentes()
+
+    def truncar(self):
+        """
+        Descarta todo o conteúdo do log (usado após um snapshot durável).
+        """
+        with self._condicao:
+            self._pendentes.clear()
+            self._arquivo.truncate(0)
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+
+    def fechar(self):
+        """
+        Sincroniza os registros pendentes, encerra a thread de sincronização e fecha o arquivo.
+        """
+        with self._condicao:
+            if self._arquivo.closed:
+                return
+            self._gravar_pendentes()
+            self._arquivo.close()
+            self._condicao.notify_all()
+        if self._sincronizador is not None:
+            self._sincronizador.join()
+
+
+# -----------------------------------------------------------
+# Funções de Snapshot
+# -----------------------------------------------------------
+def _fsync_diretorio(diretorio: Path):
+    """
+    Sincroniza a entrada de diretório, garantindo que renomeações sejam duráveis.
+    """
+    if hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(diretorio, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _gravar_atomicamente(caminho: Path, escrever):
+    """
+    Grava um arquivo por escrever(arquivo) em um temporário, sincroniza e o renomeia
+    sobre o caminho final, de modo que o arquivo antigo só é substituído por um completo.
+    """
+    temporario = caminho.with_suffix(caminho.suffix + '.tmp')
+    with open(temporario, 'wb') as arquivo:
+        escrever(arquivo)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+    _fsync_diretorio(caminho.parent)
+
+
+def gravar_snapshot(bib: Biblioteca, caminho: Path, lsn: int):
+    """
+    Grava atomicamente o estado completo da biblioteca (arquivo temporário + rename).
+    O snapshot registra o último LSN que ele já contempla.
+    """
+    caminho = Path(caminho)
+    livros = [(l.titulo, l.autor, l.ano, l.isbn, l.total_copias) for l in bib.catalogo.values()]
+    usuarios = [(u.nome, u.id_usuario, u.contato) for u in bib.usuarios.values()]
+    vencimentos = bib.emprestimos.vencimentos
+    emprestimos = [(u.id_usuario, isbn, data_emp.toordinal(),
+                    (vencimentos[(u.id_usuario, isbn)] - data_emp).days)
+                   for u in bib.usuarios.values() if u.possui_emprestimos()
+                   for isbn, data_emp in u.emprestimos_ativos.items()]
+    estado = {
+        'versao': VERSAO_SNAPSHOT,
+        'lsn': lsn,
+        'livros': livros,
+        'usuarios': usuarios,
+        'emprestimos': emprestimos,
+        'multas': bib.multas,
+        'ultimo_processamento': bib.ultimo_processamento,
+    }
+    _gravar_atomicamente(caminho, lambda arquivo: pickle.dump(estado, arquivo, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def gravar_snapshot_mapeado(bib: Biblioteca, caminho: Path, lsn: int):
+    """
+    Grava atomicamente o estado completo da biblioteca no formato mapeável.
+    """
+    _gravar_atomicamente(Path(caminho), lambda arquivo: escrever_biblioteca_mapeada(arquivo, bib, lsn))
+
+
+def carregar_snapshot(bib: Biblioteca, caminho: Path) -> int:
+    """
+    Restaura o estado de um snapshot em uma biblioteca vazia.
+    Retorna o LSN contemplado pelo snapshot (0 se não houver snapshot).
+    """
+    caminho = Path(caminho)
+    if not caminho.exists():
+        return 0
+    with open(caminho, 'rb') as arquivo:
+        estado = pickle.load(arquivo)
+    if estado.get('versao') != VERSAO_SNAPSHOT:
+        raise ValueError(f"Versão de snapshot não suportada: {estado.get('versao')}")
+
+    # Os empréstimos são reaplicados pelos métodos normais para que as cópias
+    # disponíveis e demais estruturas derivadas fiquem consistentes.
+    for titulo, autor, ano, isbn, total_copias in estado['livros']:
+        Biblioteca.cadastrar_livro(bib, titulo, autor, ano, isbn, total_copias)
+    for nome, id_usuario, contato in estado['usuarios']:
+        Biblioteca.cadastrar_usuario(bib, nome, id_usuario, contato)
+    for id_usuario, isbn, ordinal, *prazo in estado['emprestimos']:
+        with _prazo(bib, prazo):
+            Biblioteca.emprestar_livro(bib, id_usuario, isbn, date.fromordinal(ordinal))
+    bib.multas.update(estado.get('multas', {}))
+    bib.ultimo_processamento = estado.get('ultimo_processamento')
+    return estado['lsn']
+
+
+@contextmanager
+def _prazo(bib: Biblioteca, prazo: list):
+    """
+    Reaplica um empréstimo com o prazo gravado ([dias]) em vez do prazo atual da
+    biblioteca, para que o vencimento recuperado seja o mesmo. Registros antigos,
+    sem prazo ([]), usam o prazo atual.
+    """
+    atual = bib.prazo_emprestimo
+    if prazo:
+        bib.prazo_emprestimo = prazo[0]
+    try:
+        yield
+    finally:
+        bib.prazo_emprestimo = atual
+
+
+# -----------------------------------------------------------
+# Classe BibliotecaPersistente
+# -----------------------------------------------------------
+class BibliotecaPersistente(Biblioteca):
+    """
+    Biblioteca com persistência durável em um diretório.
+
+    Ao ser criada, recupera o estado a partir do snapshot e da cauda do log.
+    Cada operação de escrita bem-sucedida é registrada no log; a cada
+    `intervalo_snapshot` operações um novo snapshot é gravado e o log é truncado.
+
+    Atributos:
+        diretorio (Path): diretório com o log `biblioteca.wal` e o snapshot
+            (`biblioteca.snap` em pickle ou `biblioteca.mapa` no formato mapeável)
+        intervalo_snapshot (int): operações registradas entre snapshots (0 desativa)
+        snapshot_mapeado (bool): grava os novos snapshots no formato mapeável
+        lsn (int): número de sequência do último registro emitido
+    """
+
+    NOME_LOG = 'biblioteca.wal'
+    NOME_SNAPSHOT = 'biblioteca.snap'
+    NOME_SNAPSHOT_MAPEADO = 'biblioteca.mapa'
+
+    def __init__(self, diretorio, tamanho_grupo: int = 128, intervalo_fsync: float = 0.01,
+                 intervalo_snapshot: int = 100_000, snapshot_mapeado: bool = False):
+        super().__init__()
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.intervalo_snapshot = intervalo_snapshot
+        self.snapshot_mapeado = snapshot_mapeado
+        self.lsn = 0
+        self._desde_snapshot = 0
+        self._recuperar()
+        self.log = LogEscrita(self.diretorio / self.NOME_LOG, tamanho_grupo, intervalo_fsync)
+
+    # ------------------------- Recuperação -------------------------
+    def _recuperar(self):
+        """
+        Carrega o snapshot (se existir) e reexecuta os registros do log posteriores a ele.
+        Uma cauda rasgada no log é descartada.
+        """
+        em_pickle = self.diretorio / self.NOME_SNAPSHOT
+        mapeado = self.diretorio / self.NOME_SNAPSHOT_MAPEADO
+        # Os dois formatos só convivem se a gravação foi interrompida antes de apagar
+        # o anterior; nesse caso vale o mais recente
+        if mapeado.exists() and (not em_pickle.exists()
+                                 or mapeado.stat().st_mtime_ns >= em_pickle.stat().st_mtime_ns):
+            lsn_snapshot = carregar_snapshot_mapeado(self, mapeado)
+        else:
+            lsn_snapshot = carregar_snapshot(self, em_pickle)
+        self.lsn = lsn_snapshot
+
+        caminho_log = self.diretorio / self.NOME_LOG
+        registros, fim_valido = LogEscrita.ler(caminho_log)
+        if caminho_log.exists() and caminho_log.stat().st_size > fim_valido:
+            with open(caminho_log, 'r+b') as arquivo:
+                arquivo.truncate(fim_valido)
+
+        for registro in registros:
+            lsn = registro[0]
+            if lsn <= lsn_snapshot:
+                continue
+            self._aplicar(registro[1], registro[2:])
+            self.lsn = lsn
+            self._desde_snapshot += 1
+
+    def _aplicar(self, operacao: str, argumentos: list):
+        """
+        Reaplica uma operação do log sem registrá-la novamente.
+        """
+        if operacao == OP_CADASTRAR_LIVRO:
+            Biblioteca.cadastrar_livro(self, *argumentos)
+        elif operacao == OP_CADASTRAR_USUARIO:
+            Biblioteca.cadastrar_usuario(self, *argumentos)
+        elif operacao == OP_EMPRESTAR:
+            id_usuario, isbn, ordinal, *prazo = argumentos
+            with _prazo(self, prazo):
+                Biblioteca.emprestar_livro(self, id_usuario, isbn, date.fromordinal(ordinal))
+        elif operacao == OP_DEVOLVER:
+            Biblioteca.devolver_livro(self, *argumentos)
+        elif operacao == OP_EMPRESTAR_LOTE:
+            pares, ordinal, *prazo = argumentos
+            with _prazo(self, prazo):
+                Biblioteca.emprestar_lote(self, pares, date.fromordinal(ordinal))
+        elif operacao == OP_PROCESSAR_ATRASOS:
+            Biblioteca.processar_atrasos(self, date.fromordinal(argumentos[0]))
+        elif operacao == OP_DEVOLVER_LOTE:
+            Biblioteca.devolver_lote(self, *argumentos)
+        elif operacao == OP_IMPORTAR_LIVROS:
+            Biblioteca._adicionar_livros(self, [Livro(*campos) for campos in argumentos[0]])
+        elif operacao == OP_IMPORTAR_USUARIOS:
+            Biblioteca._adicionar_usuarios(self, [Usuario(*campos) for campos in argumentos[0]])
+        else:
+            raise ValueError(f"Operação desconhecida no log: {operacao!r}")
+
+    # ------------------------- Registro -------------------------
+    def _registrar(self, operacao: str, *argumentos):
+        """
+        Anexa uma operação ao log e dispara um snapshot quando o intervalo é atingido.
+        """
+        self.lsn += 1
+        self.log.anexar([self.lsn, operacao, *argumentos])
+        self._desde_snapshot += 1
+        if self.intervalo_snapshot and self._desde_snapshot >= self.intervalo_snapshot:
+            self.snapshot()
+
+    def snapshot(self):
+        """
+        Grava um snapshot do estado atual e trunca o log.
+        """
+        self.log.sincronizar()
+        if self.snapshot_mapeado:
+            gravar_snapshot_mapeado(self, self.diretorio / self.NOME_SNAPSHOT_MAPEADO, self.lsn)
+            anterior = self.diretorio / self.NOME_SNAPSHOT
+        else:
+            gravar_snapshot(self, self.diretorio / self.NOME_SNAPSHOT, self.lsn)
+            anterior = self.diretorio / self.NOME_SNAPSHOT_MAPEADO
+        self.log.truncar()
+        # O snapshot do outro formato ficou desatualizado (o log já foi truncado)
+        if anterior.exists():
+            anterior.unlink()
+            _fsync_diretorio(self.diretorio)
+        self._desde_snapshot = 0
+
+    def fechar(self):
+        """
+        Sincroniza os registros pendentes e fecha o log.
+        """
+        self.log.fechar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    # ------------------------- Operações -------------------------
+    def cadastrar_livro(self, titulo: str, autor: str, ano: int, isbn: str, total_copias: int):
+        super().cadastrar_livro(titulo, autor, ano, isbn, total_copias)
+        self._registrar(OP_CADASTRAR_LIVRO, titulo, autor, ano, isbn, total_copias)
+
+    def cadastrar_usuario(self, nome: str, id_usuario: str, contato: str):
+        super().cadastrar_usuario(nome, id_usuario, contato)
+        self._registrar(OP_CADASTRAR_USUARIO, nome, id_usuario, contato)
+
+    # Cada lote da importação vira um único registro: um snapshot disparado no meio do
+    # lote já conteria os livros seguintes, que a recuperação tentaria cadastrar de novo
+    def _adicionar_livros(self, livros: List[Livro]):
+        super()._adicionar_livros(livros)
+        self._registrar(OP_IMPORTAR_LIVROS, [[livro.titulo, livro.autor, livro.ano, livro.isbn,
+                                              livro.total_copias] for livro in livros])
+
+    def _adicionar_usuarios(self, usuarios: List[Usuario]):
+        super()._adicionar_usuarios(usuarios)
+        self._registrar(OP_IMPORTAR_USUARIOS, [[usuario.nome, usuario.id_usuario, usuario.contato]
+                                               for usuario in usuarios])
+
+    def emprestar_livro(self, id_usuario: str, isbn: str, data_emprestimo: Optional[date] = None):
+        if data_emprestimo is None:
+            data_emprestimo = date.today()
+        super().emprestar_livro(id_usuario, isbn, data_emprestimo)
+        self._registrar(OP_EMPRESTAR, id_usuario, isbn, data_emprestimo.toordinal(), self.prazo_emprestimo)
+
+    def devolver_livro(self, id_usuario: str, isbn: str):
+        super().devolver_livro(id_usuario, isbn)
+        self._registrar(OP_DEVOLVER, id_usuario, isbn)
+
+    # Um lote vira um único registro no log, para que a recuperação também seja tudo-ou-nada
+    def emprestar_lote(self, pares, data_emprestimo: Optional[date] = None) -> projeto.ResultadoLote:
+        if data_emprestimo is None:
+            data_emprestimo = date.today()
+        pares = [(id_usuario, isbn) for id_usuario, isbn in pares]
+        resultado = super().emprestar_lote(pares, data_emprestimo)
+        if resultado.aplicado:
+            self._registrar(OP_EMPRESTAR_LOTE, pares, data_emprestimo.toordinal(), self.prazo_emprestimo)
+        return resultado
+
+    def devolver_lote(self, pares) -> projeto.ResultadoLote:
+        pares = [(id_usuario, isbn) for id_usuario, isbn in pares]
+        resultado = super().devolver_lote(pares)
+        if resultado.aplicado:
+            self._registrar(OP_DEVOLVER_LOTE, pares)
+        return resultado
+
+    def processar_atrasos(self, data_referencia: Optional[date] = None) -> projeto.RelatorioAtrasos:
+        if data_referencia is None:
+            data_referencia = date.today()
+        anterior = self.ultimo_processamento
+        relatorio = super().processar_atrasos(data_referencia)
+        if self.ultimo_processamento != anterior:
+            self._registrar(OP_PROCESSAR_ATRASOS, data_referencia.toordinal())
+        return relatorio
+
+
+def main():
+    """
+    Executa o menu de console sobre uma biblioteca persistida no diretório informado.
+    """
+    parser = argparse.ArgumentParser(description="Biblioteca com persistência em disco.")
+    parser.add_argument('diretorio', help="diretório dos arquivos de log e snapshot")
+    parser.add_argument('--snapshot-mapeado', action='store_true',
+                        help="grava os snapshots no formato binário mapeável (inicialização rápida)")
+    projeto.adicionar_argumentos_script(parser)
+    args = parser.parse_args()
+
+    with BibliotecaPersistente(args.diretorio, snapshot_mapeado=args.snapshot_mapeado) as bib:
+        projeto.main(bib, args.script, args.saida_script)
+
+
+if __name__ == '__main__':
+    main()
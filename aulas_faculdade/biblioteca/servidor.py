@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+servidor.py
+
+Servidor TCP assíncrono (asyncio) que expõe as operações e relatórios da Biblioteca
+por um protocolo simples de JSON delimitado por linhas, substituindo o menu de
+`input()` quando vários operadores precisam usar o sistema ao mesmo tempo.
+
+Protocolo (uma mensagem JSON por linha, em UTF-8):
+    requisição: {"id": 7, "op": "emprestar_livro", "args": {"id_usuario": "u1", "isbn": "123"}}
+    lote:       {"id": 8, "op": "emprestar_lote", "args": {"pares": [["u1", "123"], ["u1", "456"]]}}
+    resposta:   {"id": 7, "ok": true, "resultado": null}
+    erro:       {"id": 7, "ok": false, "erro": "LivroIndisponivelError", "mensagem": "..."}
+
+O cliente pode enviar várias requisições sem esperar as respostas (pipelining);
+as respostas de uma conexão saem na mesma ordem das requisições. Quando o cliente
+não lê as respostas e o buffer de saída passa do limite, o servidor para de ler
+novas requisições daquela conexão até o buffer esvaziar (backpressure).
+
+Datas trafegam no formato ISO (AAAA-MM-DD). Livros, usuários e empréstimos são
+serializados como objetos JSON com os mesmos nomes de atributos das classes. O
+resultado de um lote é {"aplicado": bool, "erros": [null | {"erro", "mensagem"}, ...]}, e o
+de processar_atrasos é {"data_referencia", "avisos": [...], "multas": {id_usuario: centavos}}.
+Uma falha inesperada numa operação vira a resposta de erro "ErroInterno", e a conexão
+continua aberta.
+
+Buscas e relatórios aceitam paginação por chave com "limite" e "apos" (o ISBN, o
+id_usuario ou o par [id_usuario, isbn] do último item recebido), por exemplo:
+    {"id": 9, "op": "gerar_relatorio_usuarios", "args": {"limite": 100, "apos": "u0099"}}
+
+Uso:
+    python -m aulas_faculdade.biblioteca.servidor --porta 8765 [--dados DIRETORIO [--snapshot-mapeado]]
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import date
+from typing import Any, Callable, Dict, Optional
+
+from . import (
+    Biblioteca,
+    DevolucaoInvalidaError,
+    DuplicidadeLivroError,
+    DuplicidadeUsuarioError,
+    EmprestimoDuplicadoError,
+    ExcecaoDevolucaoInvalida,
+    Livro,
+    LivroIndisponivelError,
+    LivroNaoEncontradoError,
+    Usuario,
+    UsuarioNaoEncontradoError,
+    projeto,
+)
+from .persistencia import BibliotecaPersistente
+
+# -----------------------------------------------------------
+# Operações Expostas
+# -----------------------------------------------------------
+OPERACOES = (
+    'cadastrar_livro',
+    'cadastrar_usuario',
+    'emprestar_livro',
+    'devolver_livro',
+    'emprestar_lote',
+    'devolver_lote',
+    'buscar_livros',
+    'buscar_livros_ranqueado',
+    'buscar_livros_por_periodo',
+    'gerar_relatorio_livros_disponiveis',
+    'gerar_relatorio_livros_emprestados',
+    'contar_livros_disponiveis',
+    'contar_livros_emprestados',
+    'gerar_relatorio_usuarios',
+    'contar_usuarios',
+    'gerar_relatorio_emprestimos_ativos',
+    'contar_emprestimos_ativos',
+    'emprestimos_do_livro',
+    'emprestimos_do_usuario',
+    'emprestimos_entre',
+    'data_vencimento',
+    'emprestimos_vencidos',
+    'processar_atrasos',
+)
+
+ARGUMENTOS_DATA = ('data_emprestimo', 'data_inicio', 'data_fim', 'data_referencia')
+
+# Operações cujas tuplas (Usuario, Livro, data) trazem o vencimento em vez da data do empréstimo
+OPERACOES_VENCIMENTO = ('emprestimos_vencidos',)
+
+# Exceções de negócio: viram respostas de erro com o nome da classe
+ERROS_NEGOCIO = (
+    DuplicidadeLivroError,
+    DuplicidadeUsuarioError,
+    LivroNaoEncontradoError,
+    UsuarioNaoEncontradoError,
+    LivroIndisponivelError,
+    EmprestimoDuplicadoError,
+    DevolucaoInvalidaError,
+    ExcecaoDevolucaoInvalida,
+)
+
+LIMITE_LINHA = 1024 * 1024
+LIMITE_BUFFER_SAIDA = 256 * 1024
+
+
+def serializar(valor: Any, campo_data: str = 'data_emprestimo') -> Any:
+    """
+    Converte o resultado de uma operação da Biblioteca em valores compatíveis com JSON.
+    A data das tuplas (Usuario, Livro, data) sai com o nome `campo_data`.
+    """
+    if valor is None or isinstance(valor, (bool, int, float, str)):
+        return valor
+    if isinstance(valor, Livro):
+        return {'titulo': valor.titulo, 'autor': valor.autor, 'ano': valor.ano, 'isbn': valor.isbn,
+                'total_copias': valor.total_copias, 'copias_disponiveis': valor.copias_disponiveis}
+    if isinstance(valor, Usuario):
+        return {'nome': valor.nome, 'id_usuario': valor.id_usuario, 'contato': valor.contato}
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, projeto.ResultadoLote):
+        return {'aplicado': valor.aplicado,
+                'erros': [None if erro is None else {'erro': type(erro).__name__, 'mensagem': str(erro)}
+                          for erro in valor.erros]}
+    if isinstance(valor, projeto.RelatorioAtrasos):
+        return {'data_referencia': valor.data_referencia.isoformat(),
+                'avisos': serializar(valor.avisos, 'data_vencimento'), 'multas': valor.multas}
+    if isinstance(valor, tuple) and len(valor) == 3 and isinstance(valor[0], Usuario):
+        usuario, livro, data = valor
+        return {'usuario': serializar(usuario), 'livro': serializar(livro), campo_data: data.isoformat()}
+    # Listas e geradores
+    return [serializar(item, campo_data) for item in valor]
+
+
+# -----------------------------------------------------------
+# Classe ServidorBiblioteca
+# -----------------------------------------------------------
+class ServidorBiblioteca:
+    """
+    Servidor asyncio de uma instância de Biblioteca.
+
+    Todas as operações rodam na thread do laço de eventos, uma de cada vez; por isso a
+    Biblioteca não precisa de travas, e cada operação individual é curta o bastante
+    para não atrasar as demais conexões.
+
+    Atributos:
+        bib (Biblioteca): biblioteca atendida pelo servidor
+        conexoes (int): quantidade de conexões abertas no momento
+        atendidas (int): quantidade total de requisições respondidas
+    """
+
+    def __init__(self, bib: Biblioteca):
+        self.bib = bib
+        self.conexoes = 0
+        self.atendidas = 0
+        self._metodos: Dict[str, Callable] = {op: getattr(bib, op) for op in OPERACOES}
+
+    def executar(self, requisicao: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Executa uma requisição já decodificada e monta a resposta.
+        """
+        id_requisicao = requisicao.get('id')
+        operacao = requisicao.get('op')
+        metodo = self._metodos.get(operacao) if isinstance(operacao, str) else None
+        if metodo is None:
+            return {'id': id_requisicao, 'ok': False, 'erro': 'OperacaoDesconhecida',
+                    'mensagem': f"Operação desconhecida: {requisicao.get('op')!r}"}
+        argumentos = requisicao.get('args') or {}
+        try:
+            for nome in ARGUMENTOS_DATA:
+                if isinstance(argumentos.get(nome), str):
+                    argumentos[nome] = date.fromisoformat(argumentos[nome])
+            campo_data = 'data_vencimento' if operacao in OPERACOES_VENCIMENTO else 'data_emprestimo'
+            resultado = serializar(metodo(**argumentos), campo_data)
+        except ERROS_NEGOCIO as e:
+            return {'id': id_requisicao, 'ok': False, 'erro': type(e).__name__, 'mensagem': str(e)}
+        except (TypeError, ValueError, AttributeError) as e:
+            return {'id': id_requisicao, 'ok': False, 'erro': 'ArgumentosInvalidos', 'mensagem': str(e)}
+        except Exception as e:
+            # Uma falha inesperada responde só a esta requisição; a conexão segue aberta
+            return {'id': id_requisicao, 'ok': False, 'erro': 'ErroInterno',
+                    'mensagem': f"{type(e).__name__}: {e}"}
+        return {'id': id_requisicao, 'ok': True, 'resultado': resultado}
+
+    def processar_linha(self, linha: bytes) -> bytes:
+        """
+        Decodifica uma linha de requisição e retorna a linha de resposta codificada.
+        """
+        try:
+            requisicao = json.loads(linha)
+            if not isinstance(requisicao, dict):
+                raise ValueError("a requisição deve ser um objeto JSON")
+        except ValueError as e:
+            resposta = {'id': None, 'ok': False, 'erro': 'JSONInvalido', 'mensagem': str(e)}
+        else:
+            resposta = self.executar(requisicao)
+        self.atendidas += 1
+        return json.dumps(resposta, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """
+        Atende uma conexão: lê requisições linha a linha e escreve as respostas em ordem.
+        """
+        self.conexoes += 1
+        escritor.transport.set_write_buffer_limits(high=LIMITE_BUFFER_SAIDA)
+        try:
+            while True:
+                try:
+                    linha = await leitor.readline()
+                except ValueError:
+                    # Linha maior que o limite: não há como ressincronizar o protocolo
+                    escritor.write(b'{"id":null,"ok":false,"erro":"LinhaMuitoLonga","mensagem":""}\n')
+                    break
+                if not linha:
+                    break
+                if not linha.strip():
+                    continue
+                escritor.write(self.processar_linha(linha))
+                # drain() só bloqueia quando o buffer de saída passa do limite: enquanto o
+                # cliente não consome as respostas, deixamos de ler novas requisições.
+                await escritor.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            self.conexoes -= 1
+            escritor.close()
+
+    async def iniciar(self, host: str = '127.0.0.1', porta: int = 8765) -> asyncio.AbstractServer:
+        """
+        Inicia o servidor e retorna o objeto asyncio.Server correspondente.
+        """
+        return await asyncio.start_server(self.atender, host, porta, limit=LIMITE_LINHA, backlog=4096)
+
+
+async def servir(bib: Biblioteca, host: str, porta: int, pronto: Optional[asyncio.Event] = None):
+    """
+    Executa o servidor até ser cancelado.
+    """
+    servidor = await ServidorBiblioteca(bib).iniciar(host, porta)
+    if pronto is not None:
+        pronto.set()
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor TCP (JSON por linha) da Biblioteca.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--dados', help="diretório de persistência (log + snapshot); sem ele, só memória")
+    parser.add_argument('--snapshot-mapeado', action='store_true',
+                        help="com --dados, grava os snapshots no formato binário mapeável")
+    args = parser.parse_args()
+
+    if args.dados:
+        bib = BibliotecaPersistente(args.dados, snapshot_mapeado=args.snapshot_mapeado)
+    else:
+        bib = Biblioteca()
+
+    print(f"Servidor da biblioteca ouvindo em {args.host}:{args.porta}")
+    try:
+        asyncio.run(servir(bib, args.host, args.porta))
+    except KeyboardInterrupt:
+        print("Encerrando o servidor.")
+    finally:
+        if args.dados:
+            bib.fechar()
+
+
+if __name__ == '__main__':
+    main()
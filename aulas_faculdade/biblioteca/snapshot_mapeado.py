@@ -0,0 +1,678 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+snapshot_mapeado.py
+
+Formato binário e versionado de snapshot da Biblioteca, lido por mapeamento em
+memória (mmap) para que a inicialização não precise reconstruir milhões de objetos.
+
+Ao carregar, nada é percorrido: o catálogo e o cadastro de usuários passam a ser
+mapeamentos preguiçosos sobre o arquivo. Um Livro é lido direto do buffer mapeado
+(busca binária na ordem de ISBN) e um Usuario, com os seus empréstimos, só é criado
+no primeiro acesso pelo id_usuario; daí em diante fica em memória, porque é ali que
+empréstimos e devoluções o alteram. Cadastros feitos depois da carga ficam apenas
+em memória, como na Biblioteca comum. Apenas o registro de empréstimos ativos é
+reconstruído na carga, e os índices de busca continuam preguiçosos: são montados na
+primeira busca, lendo os livros do mapeamento.
+
+Layout do arquivo (little-endian):
+    cabeçalho: mágico (8 bytes), versão (uint32), reservado (uint32), lsn (int64) e,
+               para cada seção de SECOES, o deslocamento e o tamanho em bytes (uint64)
+    textos:    UTF-8 de ISBN, título e autor dos livros e de nome, id e contato dos usuários
+    livros:    registros fixos (posição do texto, tamanhos, ano, total de cópias,
+               cópias disponíveis), na ordem de cadastro
+    usuarios:  registros fixos (posição do texto e tamanhos), na ordem de cadastro
+    vetores:   uint32/int32 com a ordem por ISBN e por id_usuario, os livros disponíveis
+               e emprestados, e os empréstimos ativos (usuário, livro, data, vencimento)
+               ordenados por usuário
+    extras:    multas e data do último processamento de atrasos (pickle)
+"""
+
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, MutableMapping, ValuesView
+from datetime import date
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import Biblioteca, Livro, Usuario, projeto
+
+# -----------------------------------------------------------
+# Formato
+# -----------------------------------------------------------
+MAGICO = b'BIBMAPA\x00'
+VERSAO_SNAPSHOT_MAPEADO = 1
+
+SECOES = (
+    'textos',
+    'livros',
+    'usuarios',
+    'livros_ordem',
+    'usuarios_ordem',
+    'disponiveis',
+    'emprestados',
+    'emprestimos_usuario',
+    'emprestimos_livro',
+    'emprestimos_data',
+    'emprestimos_vencimento',
+    'extras',
+)
+
+# Tipo (código do módulo array) de cada seção vetorial
+TIPOS_VETOR = {
+    'livros_ordem': 'I',
+    'usuarios_ordem': 'I',
+    'disponiveis': 'I',
+    'emprestados': 'I',
+    'emprestimos_usuario': 'I',
+    'emprestimos_livro': 'I',
+    'emprestimos_data': 'i',
+    'emprestimos_vencimento': 'i',
+}
+
+_CABECALHO = struct.Struct('<8sIIq' + 'QQ' * len(SECOES))
+# posição do texto, bytes do ISBN, do título e do autor, ano, total de cópias, cópias disponíveis
+_LIVRO = struct.Struct('<QIIIiII')
+# posição do texto, bytes do nome, do id e do contato
+_USUARIO = struct.Struct('<QIII4x')
+
+_TAMANHO_BLOCO_TEXTO = 1 << 20
+
+
+# -----------------------------------------------------------
+# Gravação
+# -----------------------------------------------------------
+def _alinhar(arquivo: BinaryIO, multiplo: int = 8):
+    """
+    Completa o arquivo com zeros até a posição ser múltipla de `multiplo`.
+    """
+    resto = arquivo.tell() % multiplo
+    if resto:
+        arquivo.write(bytes(multiplo - resto))
+
+
+def _vetor_em_bytes(vetor: array) -> bytes:
+    if sys.byteorder != 'little':
+        vetor = array(vetor.typecode, vetor)
+        vetor.byteswap()
+    return vetor.tobytes()
+
+
+def escrever_snapshot_mapeado(arquivo: BinaryIO,
+                              livros: Iterable[Tuple[str, str, int, str, int, int]],
+                              usuarios: Iterable[Tuple[str, str, str]],
+                              emprestimos: Iterable[Tuple[str, str, date, date]] = (),
+                              lsn: int = 0, multas: Optional[Dict[str, int]] = None,
+                              ultimo_processamento: Optional[date] = None):
+    """
+    Escreve um snapshot no formato mapeável em um arquivo binário aberto para escrita.
+
+    livros: tuplas (titulo, autor, ano, isbn, total_copias, copias_disponiveis), na ordem de cadastro
+    usuarios: tuplas (nome, id_usuario, contato), na ordem de cadastro
+    emprestimos: tuplas (id_usuario, isbn, data_emprestimo, data_vencimento) dos empréstimos ativos
+
+    Os livros e usuários são consumidos em um único passo; só as chaves ficam em
+    memória, para ordenar os índices.
+    """
+    secoes: Dict[str, Tuple[int, int]] = {}
+    arquivo.write(bytes(_CABECALHO.size))
+    _alinhar(arquivo)
+
+    inicio_textos = arquivo.tell()
+    bloco: List[bytes] = []
+    tamanho_bloco = 0
+    posicao = 0
+
+    registros_livros = bytearray()
+    isbns: List[bytes] = []
+    disponiveis = array('I')
+    emprestados = array('I')
+    empacotar = _LIVRO.pack
+    with projeto._sem_coleta_de_lixo():
+        for indice, (titulo, autor, ano, isbn, total_copias, copias_disponiveis) in enumerate(livros):
+            b_isbn, b_titulo, b_autor = isbn.encode('utf-8'), titulo.encode('utf-8'), autor.encode('utf-8')
+            registros_livros += empacotar(posicao, len(b_isbn), len(b_titulo), len(b_autor),
+                                          ano, total_copias, copias_disponiveis)
+            tamanho = len(b_isbn) + len(b_titulo) + len(b_autor)
+            bloco += (b_isbn, b_titulo, b_autor)
+            posicao += tamanho
+            tamanho_bloco += tamanho
+            if tamanho_bloco >= _TAMANHO_BLOCO_TEXTO:
+                arquivo.write(b''.join(bloco))
+                bloco.clear()
+                tamanho_bloco = 0
+            isbns.append(b_isbn)
+            if copias_disponiveis > 0:
+                disponiveis.append(indice)
+            if copias_disponiveis < total_copias:
+                emprestados.append(indice)
+
+        registros_usuarios = bytearray()
+        ids: List[bytes] = []
+        empacotar = _USUARIO.pack
+        for nome, id_usuario, contato in usuarios:
+            b_nome, b_id, b_contato = nome.encode('utf-8'), id_usuario.encode('utf-8'), contato.encode('utf-8')
+            registros_usuarios += empacotar(posicao, len(b_nome), len(b_id), len(b_contato))
+            tamanho = len(b_nome) + len(b_id) + len(b_contato)
+            bloco += (b_nome, b_id, b_contato)
+            posicao += tamanho
+            tamanho_bloco += tamanho
+            if tamanho_bloco >= _TAMANHO_BLOCO_TEXTO:
+                arquivo.write(b''.join(bloco))
+                bloco.clear()
+                tamanho_bloco = 0
+            ids.append(b_id)
+        arquivo.write(b''.join(bloco))
+        secoes['textos'] = (inicio_textos, posicao)
+
+        # Em UTF-8 a ordem dos bytes é a ordem dos caracteres, a mesma das chaves str
+        livros_ordem = array('I', sorted(range(len(isbns)), key=isbns.__getitem__))
+        usuarios_ordem = array('I', sorted(range(len(ids)), key=ids.__getitem__))
+
+        # Empréstimos agrupados por usuário (e, dentro do usuário, por data), para que
+        # os de um usuário sejam lidos com duas buscas binárias
+        isbns_ordenados = [isbns[i] for i in livros_ordem]
+        indice_usuario = {id_usuario: i for i, id_usuario in enumerate(ids)}
+        registros_emprestimos = []
+        for id_usuario, isbn, data_emprestimo, data_vencimento in emprestimos:
+            b_isbn = isbn.encode('utf-8')
+            posicao_isbn = bisect_left(isbns_ordenados, b_isbn)
+            if posicao_isbn == len(isbns_ordenados) or isbns_ordenados[posicao_isbn] != b_isbn:
+                raise ValueError(f"Empréstimo de ISBN fora do catálogo: {isbn}")
+            registros_emprestimos.append((indice_usuario[id_usuario.encode('utf-8')],
+                                          data_emprestimo.toordinal(), livros_ordem[posicao_isbn],
+                                          data_vencimento.toordinal()))
+        del isbns_ordenados, indice_usuario
+        registros_emprestimos.sort()
+
+    vetores = {
+        'livros_ordem': livros_ordem,
+        'usuarios_ordem': usuarios_ordem,
+        'disponiveis': disponiveis,
+        'emprestados': emprestados,
+        'emprestimos_usuario': array('I', [r[0] for r in registros_emprestimos]),
+        'emprestimos_livro': array('I', [r[2] for r in registros_emprestimos]),
+        'emprestimos_data': array('i', [r[1] for r in registros_emprestimos]),
+        'emprestimos_vencimento': array('i', [r[3] for r in registros_emprestimos]),
+    }
+    extras = pickle.dumps({'multas': dict(multas or {}), 'ultimo_processamento': ultimo_processamento},
+                          protocol=pickle.HIGHEST_PROTOCOL)
+    for nome in SECOES[1:]:
+        if nome == 'livros':
+            dados = registros_livros
+        elif nome == 'usuarios':
+            dados = registros_usuarios
+        elif nome == 'extras':
+            dados = extras
+        else:
+            dados = _vetor_em_bytes(vetores[nome])
+        _alinhar(arquivo)
+        secoes[nome] = (arquivo.tell(), len(dados))
+        arquivo.write(dados)
+
+    arquivo.seek(0)
+    arquivo.write(_CABECALHO.pack(MAGICO, VERSAO_SNAPSHOT_MAPEADO, 0, lsn,
+                                  *(valor for nome in SECOES for valor in secoes[nome])))
+    arquivo.seek(0, 2)
+
+
+def escrever_biblioteca_mapeada(arquivo: BinaryIO, bib: Biblioteca, lsn: int = 0):
+    """
+    Escreve o estado completo da biblioteca no formato mapeável.
+    """
+    vencimentos = bib.emprestimos.vencimentos
+    escrever_snapshot_mapeado(
+        arquivo,
+        ((l.titulo, l.autor, l.ano, l.isbn, l.total_copias, l.copias_disponiveis)
+         for l in bib.catalogo.values()),
+        ((u.nome, u.id_usuario, u.contato) for u in bib.usuarios.values()),
+        ((id_usuario, isbn, data_emprestimo, vencimentos[(id_usuario, isbn)])
+         for (id_usuario, isbn), data_emprestimo in bib.emprestimos.ativos.items()),
+        lsn, bib.multas, bib.ultimo_processamento)
+
+
+# -----------------------------------------------------------
+# Leitura
+# -----------------------------------------------------------
+class _ChavesMapeadas:
+    """
+    Sequência somente leitura das chaves (em bytes) dos registros, em ordem crescente,
+    para as buscas binárias com bisect.
+    """
+
+    def __init__(self, ordem, chave):
+        self._ordem = ordem
+        self._chave = chave
+
+    def __len__(self) -> int:
+        return len(self._ordem)
+
+    def __getitem__(self, posicao: int) -> bytes:
+        return self._chave(self._ordem[posicao])
+
+
+class SnapshotMapeado:
+    """
+    Snapshot mapeado em memória: lê livros, usuários e empréstimos direto do arquivo.
+
+    Atributos:
+        caminho (Path): arquivo do snapshot
+        lsn (int): último LSN contemplado pelo snapshot
+        n_livros (int): quantidade de livros gravados
+        n_usuarios (int): quantidade de usuários gravados
+    """
+
+    def __init__(self, caminho):
+        self.caminho = Path(caminho)
+        with open(self.caminho, 'rb') as arquivo:
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mapa) < _CABECALHO.size:
+            raise ValueError(f"Snapshot mapeado incompleto: {self.caminho}")
+        magico, versao, _, self.lsn, *posicoes = _CABECALHO.unpack_from(self._mapa, 0)
+        if magico != MAGICO:
+            raise ValueError(f"Arquivo não é um snapshot mapeado: {self.caminho}")
+        if versao != VERSAO_SNAPSHOT_MAPEADO:
+            raise ValueError(f"Versão de snapshot mapeado não suportada: {versao}")
+        self._secoes = {nome: (posicoes[2 * i], posicoes[2 * i + 1]) for i, nome in enumerate(SECOES)}
+
+        self._inicio_textos = self._secoes['textos'][0]
+        self._inicio_livros, tamanho = self._secoes['livros']
+        self.n_livros = tamanho // _LIVRO.size
+        self._inicio_usuarios, tamanho = self._secoes['usuarios']
+        self.n_usuarios = tamanho // _USUARIO.size
+        for nome in TIPOS_VETOR:
+            setattr(self, nome, self._vetor(nome))
+        self._isbns = _ChavesMapeadas(self.livros_ordem, self._isbn_bytes)
+        self._ids = _ChavesMapeadas(self.usuarios_ordem, self._id_bytes)
+
+    def _vetor(self, nome: str):
+        """
+        Vetor de uma seção, sem cópia (memoryview sobre o mapeamento).
+        """
+        inicio, tamanho = self._secoes[nome]
+        vetor = memoryview(self._mapa)[inicio:inicio + tamanho].cast(TIPOS_VETOR[nome])
+        if sys.byteorder != 'little':
+            vetor = array(TIPOS_VETOR[nome], vetor)
+            vetor.byteswap()
+        return vetor
+
+    def extras(self) -> dict:
+        inicio, tamanho = self._secoes['extras']
+        return pickle.loads(self._mapa[inicio:inicio + tamanho])
+
+    # ------------------------- Livros -------------------------
+    def _isbn_bytes(self, registro: int) -> bytes:
+        posicao, tamanho = _LIVRO.unpack_from(self._mapa, self._inicio_livros + registro * _LIVRO.size)[:2]
+        posicao += self._inicio_textos
+        return self._mapa[posicao:posicao + tamanho]
+
+    def isbn(self, registro: int) -> str:
+        return self._isbn_bytes(registro).decode('utf-8')
+
+    def livro(self, registro: int) -> Livro:
+        """
+        Cria o Livro gravado no registro informado (posição na ordem de cadastro).
+        """
+        posicao, t_isbn, t_titulo, t_autor, ano, total_copias, copias_disponiveis = _LIVRO.unpack_from(
+            self._mapa, self._inicio_livros + registro * _LIVRO.size)
+        inicio = self._inicio_textos + posicao
+        dados = self._mapa[inicio:inicio + t_isbn + t_titulo + t_autor]
+        isbn = dados[:t_isbn].decode('utf-8')
+        titulo = dados[t_isbn:t_isbn + t_titulo].decode('utf-8')
+        autor = dados[t_isbn + t_titulo:].decode('utf-8')
+        livro = Livro(titulo, autor, ano, isbn, total_copias)
+        livro.copias_disponiveis = copias_disponiveis
+        return livro
+
+    def registro_livro(self, isbn: str) -> Optional[int]:
+        """
+        Posição do livro com o ISBN informado, ou None se ele não estiver no snapshot.
+        """
+        chave = isbn.encode('utf-8')
+        posicao = bisect_left(self._isbns, chave)
+        if posicao < self.n_livros and self._isbns[posicao] == chave:
+            return self.livros_ordem[posicao]
+        return None
+
+    # ------------------------- Usuários -------------------------
+    def _campos_usuario(self, registro: int) -> Tuple[str, str, str]:
+        posicao, t_nome, t_id, t_contato = _USUARIO.unpack_from(
+            self._mapa, self._inicio_usuarios + registro * _USUARIO.size)
+        dados = self._mapa[self._inicio_textos + posicao:
+                           self._inicio_textos + posicao + t_nome + t_id + t_contato]
+        return (dados[:t_nome].decode('utf-8'), dados[t_nome:t_nome + t_id].decode('utf-8'),
+                dados[t_nome + t_id:].decode('utf-8'))
+
+    def _id_bytes(self, registro: int) -> bytes:
+        posicao, t_nome, t_id = _USUARIO.unpack_from(
+            self._mapa, self._inicio_usuarios + registro * _USUARIO.size)[:3]
+        posicao += self._inicio_textos + t_nome
+        return self._mapa[posicao:posicao + t_id]
+
+    def id_usuario(self, registro: int) -> str:
+        return self._id_bytes(registro).decode('utf-8')
+
+    def usuario(self, registro: int) -> Usuario:
+        """
+        Cria o Usuario gravado no registro informado, já com os seus empréstimos ativos.
+        """
+        usuario = Usuario(*self._campos_usuario(registro))
+        inicio = bisect_left(self.emprestimos_usuario, registro)
+        fim = bisect_right(self.emprestimos_usuario, registro, inicio)
+        if fim > inicio:
+            usuario.emprestimos_ativos = {self.isbn(self.emprestimos_livro[i]):
+                                          date.fromordinal(self.emprestimos_data[i])
+                                          for i in range(inicio, fim)}
+        return usuario
+
+    def registro_usuario(self, id_usuario: str) -> Optional[int]:
+        """
+        Posição do usuário com o id informado, ou None se ele não estiver no snapshot.
+        """
+        chave = id_usuario.encode('utf-8')
+        posicao = bisect_left(self._ids, chave)
+        if posicao < self.n_usuarios and self._ids[posicao] == chave:
+            return self.usuarios_ordem[posicao]
+        return None
+
+    # ------------------------- Empréstimos -------------------------
+    def emprestimos(self) -> Iterator[Tuple[str, str, int, int]]:
+        """
+        Gera (id_usuario, isbn, data, vencimento) dos empréstimos ativos, com as datas
+        como ordinais, agrupados por usuário.
+        """
+        anterior, id_usuario = None, None
+        for registro, livro, data_emprestimo, data_vencimento in zip(
+                self.emprestimos_usuario, self.emprestimos_livro,
+                self.emprestimos_data, self.emprestimos_vencimento):
+            if registro != anterior:
+                anterior, id_usuario = registro, self.id_usuario(registro)
+            yield id_usuario, self.isbn(livro), data_emprestimo, data_vencimento
+
+
+# -----------------------------------------------------------
+# Mapeamentos Preguiçosos
+# -----------------------------------------------------------
+class _ValoresMapeados(ValuesView):
+    def __iter__(self):
+        return self._mapping._valores()
+
+
+class CatalogoMapeado(Mapping):
+    """
+    Catálogo (ISBN -> Livro) sobre um snapshot mapeado.
+
+    Acessar um livro pela chave (catalogo[isbn], get) o cria a partir do mapeamento e o
+    guarda, de modo que empréstimos e devoluções alteram sempre o mesmo objeto. Percorrer
+    os valores (values) não guarda nada: devolve os livros já criados e lê os demais
+    do buffer. Livros cadastrados depois da carga ficam só em memória e vêm por último
+    na iteração, que segue a ordem de cadastro.
+
+    Atributos:
+        mapa (SnapshotMapeado): snapshot lido
+        registros (Dict[str, int]): posição no snapshot dos livros já criados
+    """
+
+    def __init__(self, mapa: SnapshotMapeado):
+        self.mapa = mapa
+        self.registros: Dict[str, int] = {}
+        self._livros: Dict[str, Livro] = {}
+        self._novos: List[str] = []
+
+    def __getitem__(self, isbn: str) -> Livro:
+        livro = self._livros.get(isbn)
+        if livro is None:
+            registro = self.mapa.registro_livro(isbn)
+            if registro is None:
+                raise KeyError(isbn)
+            livro = self._livros[isbn] = self.mapa.livro(registro)
+            self.registros[isbn] = registro
+        return livro
+
+    def __contains__(self, isbn) -> bool:
+        return isbn in self._livros or self.mapa.registro_livro(isbn) is not None
+
+    def __setitem__(self, isbn: str, livro: Livro):
+        if isbn not in self:
+            self._novos.append(isbn)
+        self._livros[isbn] = livro
+
+    def __len__(self) -> int:
+        return self.mapa.n_livros + len(self._novos)
+
+    def __iter__(self) -> Iterator[str]:
+        isbn = self.mapa.isbn
+        for registro in range(self.mapa.n_livros):
+            yield isbn(registro)
+        yield from self._novos
+
+    def __reversed__(self) -> Iterator[str]:
+        yield from reversed(self._novos)
+        isbn = self.mapa.isbn
+        for registro in range(self.mapa.n_livros - 1, -1, -1):
+            yield isbn(registro)
+
+    def registro(self, isbn: str) -> Optional[int]:
+        """
+        Posição do livro no snapshot, ou None se ele foi cadastrado depois da carga.
+        """
+        registro = self.registros.get(isbn)
+        if registro is None and isbn not in self._livros:
+            registro = self.mapa.registro_livro(isbn)
+        return registro
+
+    def ler(self, isbn: str) -> Livro:
+        """
+        Retorna o livro sem guardá-lo: o objeto já criado ou uma leitura do buffer.
+        """
+        livro = self._livros.get(isbn)
+        if livro is None:
+            registro = self.mapa.registro_livro(isbn)
+            if registro is None:
+                raise KeyError(isbn)
+            livro = self.mapa.livro(registro)
+        return livro
+
+    def values(self):
+        return _ValoresMapeados(self)
+
+    def _valores(self) -> Iterator[Livro]:
+        livros = self._livros
+        ler = self.mapa.livro
+        isbn = self.mapa.isbn
+        for registro in range(self.mapa.n_livros):
+            livro = livros.get(isbn(registro)) if livros else None
+            yield ler(registro) if livro is None else livro
+        for chave in self._novos:
+            yield livros[chave]
+
+
+class UsuariosMapeados(Mapping):
+    """
+    Cadastro de usuários (id_usuario -> Usuario) sobre um snapshot mapeado. Cada usuário
+    é criado, com os seus empréstimos ativos, no primeiro acesso pela chave e guardado;
+    a iteração dos valores lê os demais do buffer sem guardá-los.
+    """
+
+    def __init__(self, mapa: SnapshotMapeado):
+        self.mapa = mapa
+        self._usuarios: Dict[str, Usuario] = {}
+        self._novos: List[str] = []
+
+    def __getitem__(self, id_usuario: str) -> Usuario:
+        usuario = self._usuarios.get(id_usuario)
+        if usuario is None:
+            registro = self.mapa.registro_usuario(id_usuario)
+            if registro is None:
+                raise KeyError(id_usuario)
+            usuario = self._usuarios[id_usuario] = self.mapa.usuario(registro)
+        return usuario
+
+    def __contains__(self, id_usuario) -> bool:
+        return id_usuario in self._usuarios or self.mapa.registro_usuario(id_usuario) is not None
+
+    def __setitem__(self, id_usuario: str, usuario: Usuario):
+        if id_usuario not in self:
+            self._novos.append(id_usuario)
+        self._usuarios[id_usuario] = usuario
+
+    def __len__(self) -> int:
+        return self.mapa.n_usuarios + len(self._novos)
+
+    def __iter__(self) -> Iterator[str]:
+        id_usuario = self.mapa.id_usuario
+        for registro in range(self.mapa.n_usuarios):
+            yield id_usuario(registro)
+        yield from self._novos
+
+    def __reversed__(self) -> Iterator[str]:
+        yield from reversed(self._novos)
+        id_usuario = self.mapa.id_usuario
+        for registro in range(self.mapa.n_usuarios - 1, -1, -1):
+            yield id_usuario(registro)
+
+    def values(self):
+        return _ValoresMapeados(self)
+
+    def _valores(self) -> Iterator[Usuario]:
+        usuarios = self._usuarios
+        ler = self.mapa.usuario
+        id_usuario = self.mapa.id_usuario
+        for registro in range(self.mapa.n_usuarios):
+            usuario = usuarios.get(id_usuario(registro)) if usuarios else None
+            yield ler(registro) if usuario is None else usuario
+        for chave in self._novos:
+            yield usuarios[chave]
+
+
+class SubconjuntoMapeado(MutableMapping):
+    """
+    Conjunto de livros disponíveis (ou emprestados) de uma biblioteca mapeada: os
+    membros gravados no snapshot (posições em ordem crescente) mais as alterações
+    feitas desde a carga.
+    """
+
+    _AUSENTE = object()
+
+    def __init__(self, catalogo: CatalogoMapeado, base):
+        self.catalogo = catalogo
+        self._base = base
+        # isbn -> Livro (incluído desde a carga) ou None (retirado)
+        self._alterados: Dict[str, Optional[Livro]] = {}
+        self._tamanho = len(base)
+
+    def _na_base(self, isbn: str) -> bool:
+        registro = self.catalogo.registro(isbn)
+        if registro is None:
+            return False
+        posicao = bisect_left(self._base, registro)
+        return posicao < len(self._base) and self._base[posicao] == registro
+
+    def __contains__(self, isbn) -> bool:
+        alterado = self._alterados.get(isbn, self._AUSENTE)
+        if alterado is not self._AUSENTE:
+            return alterado is not None
+        return self._na_base(isbn)
+
+    def __getitem__(self, isbn: str) -> Livro:
+        if isbn not in self:
+            raise KeyError(isbn)
+        return self.catalogo[isbn]
+
+    def __setitem__(self, isbn: str, livro: Livro):
+        if isbn not in self:
+            self._tamanho += 1
+        self._alterados[isbn] = livro
+
+    def __delitem__(self, isbn: str):
+        if isbn not in self:
+            raise KeyError(isbn)
+        self._alterados[isbn] = None
+        self._tamanho -= 1
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def __iter__(self) -> Iterator[str]:
+        alterados = self._alterados
+        isbn = self.catalogo.mapa.isbn
+        for registro in self._base:
+            chave = isbn(registro)
+            if chave not in alterados:
+                yield chave
+        for chave, livro in list(alterados.items()):
+            if livro is not None:
+                yield chave
+
+    def values(self):
+        return _ValoresMapeados(self)
+
+    def _valores(self) -> Iterator[Livro]:
+        ler = self.catalogo.ler
+        for isbn in self:
+            yield ler(isbn)
+
+
+class _PendentesMapeados:
+    """
+    Fila de livros pendentes de indexação de uma biblioteca mapeada: os livros do
+    snapshot, lidos do buffer a cada passagem, seguidos dos cadastrados depois da carga.
+    """
+
+    def __init__(self, mapa: SnapshotMapeado):
+        self.mapa = mapa
+        self._novos: List[Livro] = []
+
+    def append(self, livro: Livro):
+        self._novos.append(livro)
+
+    def extend(self, livros: Iterable[Livro]):
+        self._novos.extend(livros)
+
+    def __len__(self) -> int:
+        return self.mapa.n_livros + len(self._novos)
+
+    def __iter__(self) -> Iterator[Livro]:
+        ler = self.mapa.livro
+        for registro in range(self.mapa.n_livros):
+            yield ler(registro)
+        yield from self._novos
+
+
+# -----------------------------------------------------------
+# Carga
+# -----------------------------------------------------------
+def carregar_snapshot_mapeado(bib: Biblioteca, caminho) -> int:
+    """
+    Instala um snapshot mapeado em uma biblioteca vazia, sem ler livros e usuários.
+    Retorna o LSN contemplado pelo snapshot (0 se não houver snapshot).
+    """
+    caminho = Path(caminho)
+    if not caminho.exists():
+        return 0
+    mapa = SnapshotMapeado(caminho)
+    bib.catalogo = CatalogoMapeado(mapa)
+    bib.usuarios = UsuariosMapeados(mapa)
+    bib._disponiveis = SubconjuntoMapeado(bib.catalogo, mapa.disponiveis)
+    bib._emprestados = SubconjuntoMapeado(bib.catalogo, mapa.emprestados)
+    bib._pendentes_indice = _PendentesMapeados(mapa)
+    bib._isbns_ordenados = projeto.ChavesOrdenadas(bib.catalogo)
+    bib._ids_ordenados = projeto.ChavesOrdenadas(bib.usuarios)
+
+    # O registro central é o único índice reconstruído: um lote por (data, vencimento)
+    lotes: Dict[Tuple[int, int], List[Tuple[str, str]]] = {}
+    with projeto._sem_coleta_de_lixo():
+        for id_usuario, isbn, data_emprestimo, data_vencimento in mapa.emprestimos():
+            lotes.setdefault((data_emprestimo, data_vencimento), []).append((id_usuario, isbn))
+        for (data_emprestimo, data_vencimento), pares in sorted(lotes.items()):
+            bib.emprestimos.registrar_lote(pares, date.fromordinal(data_emprestimo),
+                                           date.fromordinal(data_vencimento))
+    extras = mapa.extras()
+    bib.multas.update(extras['multas'])
+    bib.ultimo_processamento = extras['ultimo_processamento']
+    return mapa.lsn
@@ -0,0 +1,23 @@
+"""
+Extensões dos exemplos de contas, carteiras e cartões da UNIDADE 2.
+
+As classes desses exemplos estão em notebooks ("UNIDADE 2/AULA 1.ipynb" e
+"AULA 3.2.ipynb"), que não podem ser importados. Os módulos `contas`, `carteira`
+e `cartoes` reproduzem as classes dos notebooks como código importável, e este
+pacote as reexporta para os módulos de extensão.
+"""
+
+from .contas import Conta, ContaCorrente, ContaPoupanca
+from .carteira import Carteira
+from .cartoes import CartaoBase, CartaoDiamond, CartaoGold, CartaoPlatinum
+
+__all__ = [
+    'Conta',
+    'ContaCorrente',
+    'ContaPoupanca',
+    'Carteira',
+    'CartaoBase',
+    'CartaoGold',
+    'CartaoPlatinum',
+    'CartaoDiamond',
+]
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+banco_vetorizado.py
+
+Motor de contas vetorizado: em vez de um objeto Python por conta, o BancoVetorizado
+guarda número, saldo, tipo e limite de todas as contas em vetores do NumPy, e aplica
+rendimentos, tarifas, depósitos e saques em lote como operações sobre os vetores.
+
+As regras são as das classes de contas.py: a poupança só permite saques que deixem
+saldo positivo (saldo - valor > 0) e a corrente pode usar até o limite
+(saldo + limite - valor > 0). Como a poupança é guardada com limite 0, as duas regras
+são a mesma expressão, avaliada para o lote inteiro. Saques de um lote que repetem
+uma conta são aplicados em rodadas (a k-ésima operação de cada conta na rodada k),
+para que cada saque veja o saldo deixado pelos anteriores, como nas chamadas uma a uma.
+
+As contas continuam disponíveis como objetos, sob demanda: `conta(numero)` retorna uma
+ContaPoupanca ou ContaCorrente cujo saldo (e limite) são lidos e gravados nos vetores,
+de modo que depositar, sacar e calcular_rendimentos das classes originais funcionam
+sem alteração.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Type
+
+import numpy as np
+
+from .contas import Conta, ContaCorrente, ContaPoupanca
+
+# -----------------------------------------------------------
+# Configuração
+# -----------------------------------------------------------
+TIPO_POUPANCA = 0
+TIPO_CORRENTE = 1
+
+CLASSES_POR_TIPO: Dict[int, Type[Conta]] = {
+    TIPO_POUPANCA: ContaPoupanca,
+    TIPO_CORRENTE: ContaCorrente,
+}
+TIPOS_POR_CLASSE: Dict[Type[Conta], int] = {classe: tipo for tipo, classe in CLASSES_POR_TIPO.items()}
+
+CAPACIDADE_INICIAL = 1024
+
+# Contas abertas depois da última ordenação do índice de números que são procuradas
+# por busca direta; acima disso elas são intercaladas no índice
+CAUDA_MAXIMA_INDICE = 4096
+
+# Lotes de números maiores que isto são ordenados antes da busca binária
+LOTE_BUSCA_ORDENADA = 4096
+
+
+# -----------------------------------------------------------
+# Contas sob Demanda
+# -----------------------------------------------------------
+class _ContaNosVetores:
+    """
+    Base das contas entregues pelo BancoVetorizado: número e saldo ficam nos vetores
+    do banco, na posição da conta.
+    """
+
+    def __init__(self, banco: 'BancoVetorizado', posicao: int):
+        self._banco = banco
+        self._posicao = posicao
+
+    @property
+    def numero_da_conta(self) -> int:
+        return int(self._banco._numeros[self._posicao])
+
+    @property
+    def saldo(self) -> float:
+        return float(self._banco._saldos[self._posicao])
+
+    @saldo.setter
+    def saldo(self, valor: float):
+        self._banco._saldos[self._posicao] = valor
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(numero_da_conta={self.numero_da_conta}, saldo={self.saldo})"
+
+
+class ContaPoupancaVetorizada(_ContaNosVetores, ContaPoupanca):
+    pass
+
+
+class ContaCorrenteVetorizada(_ContaNosVetores, ContaCorrente):
+    @property
+    def limite(self) -> float:
+        return float(self._banco._limites[self._posicao])
+
+    @limite.setter
+    def limite(self, valor: float):
+        self._banco._limites[self._posicao] = valor
+
+
+CLASSES_VETORIZADAS = {
+    TIPO_POUPANCA: ContaPoupancaVetorizada,
+    TIPO_CORRENTE: ContaCorrenteVetorizada,
+}
+
+
+# -----------------------------------------------------------
+# Classe BancoVetorizado
+# -----------------------------------------------------------
+class BancoVetorizado:
+    """
+    Livro de contas com os dados em vetores do NumPy (uma posição por conta, na ordem
+    de abertura). Os números de conta são inteiros e únicos.
+
+    Atributos (visões dos vetores, só as posições ocupadas):
+        numeros (np.ndarray[int64]): número de cada conta
+        saldos (np.ndarray[float64]): saldo de cada conta
+        tipos (np.ndarray[int8]): TIPO_POUPANCA ou TIPO_CORRENTE
+        limites (np.ndarray[float64]): limite de cada conta (0 na poupança)
+    """
+
+    def __init__(self, capacidade: int = CAPACIDADE_INICIAL):
+        capacidade = max(1, capacidade)
+        self._numeros = np.empty(capacidade, dtype=np.int64)
+        self._saldos = np.empty(capacidade, dtype=np.float64)
+        self._tipos = np.empty(capacidade, dtype=np.int8)
+        self._limites = np.empty(capacidade, dtype=np.float64)
+        self._tamanho = 0
+        # Índice de números: posições em ordem de número e os números ordenados,
+        # cobrindo as contas abertas até _indexadas
+        self._ordem = np.empty(0, dtype=np.int64)
+        self._ordenados = np.empty(0, dtype=np.int64)
+        self._indexadas = 0
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    @property
+    def numeros(self) -> np.ndarray:
+        return self._numeros[:self._tamanho]
+
+    @property
+    def saldos(self) -> np.ndarray:
+        return self._saldos[:self._tamanho]
+
+    @property
+    def tipos(self) -> np.ndarray:
+        return self._tipos[:self._tamanho]
+
+    @property
+    def limites(self) -> np.ndarray:
+        return self._limites[:self._tamanho]
+
+    # ---- Abertura de Contas ----
+    def _reservar(self, quantidade: int):
+        """
+        Garante espaço para mais `quantidade` contas (a capacidade dobra, no mínimo).
+        """
+        necessario = self._tamanho + quantidade
+        if necessario <= len(self._saldos):
+            return
+        capacidade = max(necessario, 2 * len(self._saldos))
+        for nome in ('_numeros', '_saldos', '_tipos', '_limites'):
+            antigo = getattr(self, nome)
+            novo = np.empty(capacidade, dtype=antigo.dtype)
+            novo[:self._tamanho] = antigo[:self._tamanho]
+            setattr(self, nome, novo)
+
+    def abrir_contas(self, numeros, saldos, tipo: int) -> np.ndarray:
+        """
+        Abre várias contas do mesmo tipo. `saldos` pode ser um valor único para todas.
+        O limite das contas correntes é o ContaCorrente.limite. Retorna as posições.
+        Levanta ValueError se algum número repetir (no lote ou no banco).
+        """
+        if tipo not in CLASSES_POR_TIPO:
+            raise ValueError(f"Tipo de conta desconhecido: {tipo!r}")
+        numeros = np.asarray(numeros, dtype=np.int64).ravel()
+        saldos = np.broadcast_to(np.asarray(saldos, dtype=np.float64), numeros.shape)
+        ordenados = np.sort(numeros)
+        repetidos = ordenados[1:][ordenados[1:] == ordenados[:-1]]
+        if len(repetidos):
+            raise ValueError(f"Número de conta repetido no lote: {int(repetidos[0])}")
+        existentes = self._localizar(numeros) >= 0
+        if existentes.any():
+            raise ValueError(f"Já existe uma conta com o número {int(numeros[existentes][0])}")
+
+        self._reservar(len(numeros))
+        inicio, fim = self._tamanho, self._tamanho + len(numeros)
+        self._numeros[inicio:fim] = numeros
+        self._saldos[inicio:fim] = saldos
+        self._tipos[inicio:fim] = tipo
+        self._limites[inicio:fim] = getattr(CLASSES_POR_TIPO[tipo], 'limite', 0)
+        self._tamanho = fim
+        return np.arange(inicio, fim)
+
+    def abrir_conta(self, classe: Type[Conta], numero_da_conta: int, saldo: float) -> Conta:
+        """
+        Abre uma conta, com a mesma assinatura do construtor da classe, e a retorna.
+        Para muitas contas, prefira abrir_contas.
+        """
+        tipo = TIPOS_POR_CLASSE.get(classe)
+        if tipo is None:
+            raise TypeError(f"Classe de conta não suportada: {classe.__name__}")
+        posicao = int(self.abrir_contas([numero_da_conta], [saldo], tipo)[0])
+        return CLASSES_VETORIZADAS[tipo](self, posicao)
+
+    def importar(self, contas: Iterable[Conta]) -> int:
+        """
+        Copia objetos ContaPoupanca / ContaCorrente para o banco (com o limite de cada
+        conta corrente). Retorna a quantidade importada.
+        """
+        grupos: Dict[int, List[Conta]] = {tipo: [] for tipo in CLASSES_POR_TIPO}
+        for conta in contas:
+            tipo = TIPOS_POR_CLASSE.get(type(conta))
+            if tipo is None:
+                raise TypeError(f"Classe de conta não suportada: {type(conta).__name__}")
+            grupos[tipo].append(conta)
+        total = 0
+        for tipo, grupo in grupos.items():
+            if not grupo:
+                continue
+            posicoes = self.abrir_contas([c.numero_da_conta for c in grupo], [c.saldo for c in grupo], tipo)
+            if tipo == TIPO_CORRENTE:
+                self._limites[posicoes] = [c.limite for c in grupo]
+            total += len(grupo)
+        return total
+
+    # ---- Localização por Número ----
+    def _atualizar_indice(self):
+        """
+        Intercala no índice as contas abertas depois da última atualização, quando
+        passam de CAUDA_MAXIMA_INDICE.
+        """
+        if self._tamanho - self._indexadas <= CAUDA_MAXIMA_INDICE:
+            return
+        novos = self._numeros[self._indexadas:self._tamanho]
+        ordem_novos = np.argsort(novos, kind='stable')
+        pontos = np.searchsorted(self._ordenados, novos[ordem_novos])
+        self._ordenados = np.insert(self._ordenados, pontos, novos[ordem_novos])
+        self._ordem = np.insert(self._ordem, pontos, self._indexadas + ordem_novos)
+        self._indexadas = self._tamanho
+
+    @staticmethod
+    def _procurar(ordenados: np.ndarray, numeros: np.ndarray):
+        """
+        Busca binária de `numeros` em `ordenados`. Retorna (índices, encontrados).
+        """
+        if not len(ordenados):
+            return np.zeros(len(numeros), dtype=np.int64), np.zeros(len(numeros), dtype=bool)
+        if len(numeros) > LOTE_BUSCA_ORDENADA:
+            # Buscas em ordem percorrem `ordenados` de forma sequencial (bem menos
+            # faltas de cache que buscas aleatórias), o que compensa ordenar o lote
+            ordem = np.argsort(numeros)
+            indices = np.empty(len(numeros), dtype=np.int64)
+            indices[ordem] = np.searchsorted(ordenados, numeros[ordem])
+        else:
+            indices = np.searchsorted(ordenados, numeros)
+        np.minimum(indices, len(ordenados) - 1, out=indices)
+        return indices, ordenados[indices] == numeros
+
+    def _localizar(self, numeros: np.ndarray) -> np.ndarray:
+        """
+        Retorna a posição de cada número, ou -1 se não houver conta com ele.
+        """
+        self._atualizar_indice()
+        posicoes = np.full(len(numeros), -1, dtype=np.int64)
+        indices, encontrados = self._procurar(self._ordenados, numeros)
+        posicoes[encontrados] = self._ordem[indices[encontrados]]
+        if self._indexadas < self._tamanho:
+            faltam = np.flatnonzero(~encontrados)
+            cauda = self._numeros[self._indexadas:self._tamanho]
+            ordem_cauda = np.argsort(cauda, kind='stable')
+            indices, encontrados = self._procurar(cauda[ordem_cauda], numeros[faltam])
+            posicoes[faltam[encontrados]] = self._indexadas + ordem_cauda[indices[encontrados]]
+        return posicoes
+
+    def posicoes(self, numeros) -> np.ndarray:
+        """
+        Retorna a posição nos vetores de cada número de conta. Levanta KeyError se
+        algum não existir.
+        """
+        numeros = np.asarray(numeros, dtype=np.int64).ravel()
+        posicoes = self._localizar(numeros)
+        if (posicoes < 0).any():
+            raise KeyError(f"Conta inexistente: {int(numeros[posicoes < 0][0])}")
+        return posicoes
+
+    def conta(self, numero_da_conta: int) -> Conta:
+        """
+        Retorna a conta como objeto (ContaPoupanca ou ContaCorrente) ligado aos vetores.
+        """
+        posicao = int(self.posicoes([numero_da_conta])[0])
+        return CLASSES_VETORIZADAS[int(self._tipos[posicao])](self, posicao)
+
+    def contas(self) -> Iterator[Conta]:
+        """
+        Percorre as contas como objetos, na ordem de abertura.
+        """
+        for posicao in range(self._tamanho):
+            yield CLASSES_VETORIZADAS[int(self._tipos[posicao])](self, posicao)
+
+    # ---- Operações em Lote ----
+    @staticmethod
+    def _rodadas(posicoes: np.ndarray) -> List[np.ndarray]:
+        """
+        Divide as operações de um lote em rodadas sem contas repetidas: a k-ésima
+        operação de cada conta (na ordem do lote) vai para a rodada k. Retorna os
+        índices das operações de cada rodada.
+        """
+        if not len(posicoes):
+            return []
+        ordem = np.argsort(posicoes, kind='stable')
+        ordenadas = posicoes[ordem]
+        inicios = np.flatnonzero(np.r_[True, ordenadas[1:] != ordenadas[:-1]])
+        if len(inicios) == len(posicoes):
+            return [np.arange(len(posicoes))]
+        ocorrencia = np.arange(len(posicoes)) - np.repeat(inicios, np.diff(np.r_[inicios, len(posicoes)]))
+        por_rodada = np.argsort(ocorrencia, kind='stable')
+        cortes = np.searchsorted(ocorrencia[por_rodada], np.arange(1, int(ocorrencia.max()) + 1))
+        return np.split(ordem[por_rodada], cortes)
+
+    def depositar_lote(self, numeros, valores):
+        """
+        Deposita valores[i] na conta numeros[i] (`valores` pode ser um valor único).
+        Os depósitos na mesma conta são somados na ordem do lote.
+        """
+        posicoes = self.posicoes(numeros)
+        valores = np.broadcast_to(np.asarray(valores, dtype=np.float64), posicoes.shape)
+        np.add.at(self._saldos, posicoes, valores)
+
+    def sacar_lote(self, numeros, valores) -> np.ndarray:
+        """
+        Saca valores[i] da conta numeros[i], com a regra do `sacar` de cada tipo de
+        conta; saques recusados não alteram o saldo. Retorna um vetor booleano com os
+        saques realizados.
+        """
+        posicoes = self.posicoes(numeros)
+        valores = np.broadcast_to(np.asarray(valores, dtype=np.float64), posicoes.shape)
+        realizados = np.zeros(len(posicoes), dtype=bool)
+        saldos, limites = self._saldos, self._limites
+        for rodada in self._rodadas(posicoes):
+            contas, valor = posicoes[rodada], valores[rodada]
+            permitidos = saldos[contas] + limites[contas] - valor > 0
+            saldos[contas[permitidos]] -= valor[permitidos]
+            realizados[rodada] = permitidos
+        return realizados
+
+    def aplicar_rendimentos(self, taxa: float = ContaPoupanca.taxa_rendimento) -> int:
+        """
+        Aplica o rendimento a todas as contas poupança, como calcular_rendimentos
+        (saldo += saldo * taxa). Retorna a quantidade de contas.
+        """
+        poupancas = np.flatnonzero(self.tipos == TIPO_POUPANCA)
+        saldos = self._saldos[poupancas]
+        self._saldos[poupancas] = saldos + saldos * taxa
+        return len(poupancas)
+
+    def cobrar_tarifa(self, valor: float, tipo: Optional[int] = None) -> int:
+        """
+        Debita uma tarifa de todas as contas do tipo informado (ou de todas as contas),
+        mesmo que o saldo fique negativo. Retorna a quantidade de contas.
+        """
+        if tipo is None:
+            self.saldos[:] -= valor
+            return self._tamanho
+        contas = np.flatnonzero(self.tipos == tipo)
+        self._saldos[contas] -= valor
+        return len(contas)
+
+    def saldo_total(self) -> float:
+        return float(self.saldos.sum())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_carteira.py
+
+Benchmark da CarteiraRegistrada com milhões de microtransações: mede o custo de cada
+movimentação registrada e a latência de "saldo no momento T" e "fluxo líquido entre
+T1 e T2", e compara as respostas (e o tempo) com uma varredura linear do histórico.
+
+Uso:
+    python -m aulas_faculdade.financeiro.bench_carteira --movimentacoes 5000000
+"""
+
+import argparse
+import random
+import time
+from itertools import accumulate, islice
+
+from .carteira import CarteiraRegistrada
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consultas no tempo da CarteiraRegistrada.")
+    parser.add_argument('--movimentacoes', type=int, default=5_000_000)
+    parser.add_argument('--consultas', type=int, default=100_000)
+    parser.add_argument('--consultas-lineares', type=int, default=20)
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.semente)
+    carteira = CarteiraRegistrada()
+    momento = 1_700_000_000.0
+    valores = []
+    inicio = time.perf_counter()
+    for _ in range(args.movimentacoes):
+        momento += rng.expovariate(10.0)
+        centavos = rng.randrange(1, 500)
+        if rng.random() < 0.45:
+            if carteira.remover_fundos(centavos / 100, momento):
+                valores.append(-centavos)
+        else:
+            carteira.adicionar_fundos(centavos / 100, momento)
+            valores.append(centavos)
+    t_registro = time.perf_counter() - inicio
+    primeiro, ultimo = carteira.momentos[0], carteira.momentos[-1]
+    print(f"{len(carteira):,} movimentações registradas em {t_registro:.1f} s "
+          f"({t_registro / len(carteira) * 1e6:.2f} µs cada, com o laço do gerador) | "
+          f"saldo final: {carteira.saldo:,.2f}")
+
+    momentos = [rng.uniform(primeiro, ultimo) for _ in range(args.consultas)]
+    inicio = time.perf_counter()
+    for t in momentos:
+        carteira.saldo_em(t)
+    t_saldo = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for t1, t2 in zip(momentos, momentos[1:]):
+        carteira.fluxo_liquido(min(t1, t2), max(t1, t2))
+    t_fluxo = time.perf_counter() - inicio
+    print(f"saldo_em: {t_saldo / args.consultas * 1e6:.2f} µs | "
+          f"fluxo_liquido: {t_fluxo / (args.consultas - 1) * 1e6:.2f} µs por consulta")
+
+    inicio = time.perf_counter()
+    divergencias = 0
+    for t in momentos[:args.consultas_lineares]:
+        quantidade = sum(1 for m in carteira.momentos if m <= t)
+        linear = sum(islice(valores, quantidade))
+        divergencias += linear != carteira.saldo_centavos_em(t)
+    t_linear = (time.perf_counter() - inicio) / args.consultas_lineares
+    prefixos = list(accumulate(valores))
+    divergencias += prefixos[-1] != carteira.saldo_centavos_em(ultimo)
+    print(f"varredura linear: {t_linear * 1000:.1f} ms por consulta | divergências: {divergencias}")
+
+
+if __name__ == '__main__':
+    main()
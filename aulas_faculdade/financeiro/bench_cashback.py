@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_cashback.py
+
+Benchmark do cash back em lote (CalculadoraCashback) contra o cálculo por objeto (um
+cartão novo e uma chamada de calcular_cash_back por transação). As transações
+sintéticas incluem uma categoria personalizada, com teto, que passa pelo caminho
+item a item. Com --arquivo, mede também o processamento em blocos de um CSV
+(leitura, cálculo e gravação).
+
+Uso:
+    python -m aulas_faculdade.financeiro.bench_cashback --transacoes 10000000 --arquivo
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from .cartoes import CartaoBase
+from .cashback_lote import CATEGORIAS, CalculadoraCashback
+
+
+class CartaoBlack(CartaoBase):
+    """
+    Categoria personalizada: 10% com teto de 50 por compra (não é uma taxa fixa).
+    """
+
+    def calcular_cash_back(self, valor):
+        return min(valor * 0.10, 50.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cash back em lote x por objeto.")
+    parser.add_argument('--transacoes', type=int, default=10_000_000)
+    parser.add_argument('--fracao-personalizada', type=float, default=0.01,
+                        help="fração das transações na categoria com teto (caminho item a item)")
+    parser.add_argument('--tamanho-bloco', type=int, default=1_000_000)
+    parser.add_argument('--arquivo', action='store_true', help="mede também o processamento de um CSV")
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    categorias = dict(CATEGORIAS, Black=CartaoBlack)
+    nomes = np.array(list(categorias), dtype=object)
+    rng = np.random.default_rng(args.semente)
+    restante = (1 - args.fracao_personalizada) / 3
+    codigos = rng.choice(len(nomes), args.transacoes, p=[restante] * 3 + [args.fracao_personalizada])
+    cartoes = nomes[codigos]
+    valores = np.round(rng.lognormal(4, 1.2, args.transacoes), 2)
+    print(f"{args.transacoes:,} transações | {args.fracao_personalizada:.0%} na categoria com teto")
+
+    inicio = time.perf_counter()
+    por_objeto = [categorias[cartao]().calcular_cash_back(valor)
+                  for cartao, valor in zip(cartoes.tolist(), valores.tolist())]
+    t_objeto = time.perf_counter() - inicio
+
+    calculadora = CalculadoraCashback(categorias)
+    inicio = time.perf_counter()
+    em_lote = np.concatenate([calculadora.calcular(cartoes[i:i + args.tamanho_bloco],
+                                                   valores[i:i + args.tamanho_bloco])
+                              for i in range(0, args.transacoes, args.tamanho_bloco)])
+    t_lote = time.perf_counter() - inicio
+    iguais = np.array_equal(np.array(por_objeto), em_lote)
+    print(f"por objeto: {t_objeto:.2f} s ({args.transacoes / t_objeto:,.0f}/s) | "
+          f"em lote: {t_lote:.2f} s ({args.transacoes / t_lote:,.0f}/s) | "
+          f"{t_objeto / t_lote:.1f}x | resultados iguais: {iguais}")
+
+    # Com a categoria já codificada (como na leitura do CSV com dtype 'category')
+    categoricos = pd.Series(pd.Categorical.from_codes(codigos, categories=list(nomes)))
+    inicio = time.perf_counter()
+    for i in range(0, args.transacoes, args.tamanho_bloco):
+        calculadora.calcular(categoricos[i:i + args.tamanho_bloco], valores[i:i + args.tamanho_bloco])
+    t_categorico = time.perf_counter() - inicio
+    print(f"em lote, categoria codificada: {t_categorico:.2f} s "
+          f"({args.transacoes / t_categorico:,.0f}/s) | {t_objeto / t_categorico:.1f}x")
+
+    if args.arquivo:
+        with tempfile.TemporaryDirectory() as diretorio:
+            entrada = os.path.join(diretorio, 'transacoes.csv')
+            saida = os.path.join(diretorio, 'cashback.csv')
+            pd.DataFrame({'cartao': cartoes, 'valor': valores}).to_csv(entrada, index=False)
+            calculadora = CalculadoraCashback(categorias)
+            inicio = time.perf_counter()
+            resumo = calculadora.processar_arquivo(entrada, saida, args.tamanho_bloco)
+            t_arquivo = time.perf_counter() - inicio
+            print(f"\narquivo de {os.path.getsize(entrada) / 2 ** 20:,.0f} MiB em blocos de "
+                  f"{args.tamanho_bloco:,}: {t_arquivo:.2f} s ({args.transacoes / t_arquivo:,.0f}/s)")
+            print(resumo.to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_contas.py
+
+Benchmark do BancoVetorizado contra um objeto por conta: mede a rodada noturna de
+rendimentos das poupanças, uma tarifa nas contas correntes e um lote de saques
+(com contas repetidas), e confere que os saldos finais são iguais nas duas versões.
+
+Uso:
+    python -m aulas_faculdade.financeiro.bench_contas --contas 5000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from .banco_vetorizado import TIPO_CORRENTE, TIPO_POUPANCA, BancoVetorizado
+from .contas import ContaCorrente, ContaPoupanca
+
+
+def cronometrar(funcao, *args) -> float:
+    inicio = time.perf_counter()
+    funcao(*args)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Contas como objetos x BancoVetorizado.")
+    parser.add_argument('--contas', type=int, default=5_000_000)
+    parser.add_argument('--fracao-poupanca', type=float, default=0.7)
+    parser.add_argument('--saques', type=int, default=1_000_000)
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semente)
+    numeros = rng.permutation(args.contas * 2)[:args.contas] + 100_000
+    saldos = np.round(rng.uniform(0, 5000, args.contas), 2)
+    poupanca = rng.random(args.contas) < args.fracao_poupanca
+    saques_contas = numeros[rng.integers(0, args.contas, args.saques)]
+    saques_valores = np.round(rng.uniform(1, 3000, args.saques), 2)
+
+    inicio = time.perf_counter()
+    objetos = {}
+    for numero, saldo, eh_poupanca in zip(numeros.tolist(), saldos.tolist(), poupanca.tolist()):
+        objetos[numero] = (ContaPoupanca if eh_poupanca else ContaCorrente)(numero, saldo)
+    t_objetos = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    banco = BancoVetorizado(args.contas)
+    banco.abrir_contas(numeros[poupanca], saldos[poupanca], TIPO_POUPANCA)
+    banco.abrir_contas(numeros[~poupanca], saldos[~poupanca], TIPO_CORRENTE)
+    t_banco = time.perf_counter() - inicio
+    print(f"{args.contas:,} contas ({poupanca.sum():,} poupanças) | {args.saques:,} saques")
+    print(f"\n{'operação':<24}{'objetos':>12}{'vetorizado':>14}{'ganho':>9}")
+    medidas = [('abertura', t_objetos, t_banco)]
+
+    def rendimentos_objetos():
+        for conta in objetos.values():
+            if isinstance(conta, ContaPoupanca):
+                conta.calcular_rendimentos()
+
+    def tarifa_objetos():
+        for conta in objetos.values():
+            if isinstance(conta, ContaCorrente):
+                conta.saldo -= 12.5
+
+    def saques_objetos():
+        for numero, valor in zip(saques_contas.tolist(), saques_valores.tolist()):
+            objetos[numero].sacar(valor)
+
+    medidas.append(('rendimentos', cronometrar(rendimentos_objetos), cronometrar(banco.aplicar_rendimentos)))
+    medidas.append(('tarifa (correntes)', cronometrar(tarifa_objetos),
+                    cronometrar(banco.cobrar_tarifa, 12.5, TIPO_CORRENTE)))
+    medidas.append(('saques em lote', cronometrar(saques_objetos),
+                    cronometrar(banco.sacar_lote, saques_contas, saques_valores)))
+    for nome, t_obj, t_vet in medidas:
+        print(f"{nome:<24}{t_obj * 1000:>10.0f}ms{t_vet * 1000:>12.0f}ms{t_obj / t_vet:>8.1f}x")
+
+    esperados = np.array([objetos[numero].saldo for numero in banco.numeros.tolist()])
+    print(f"\nsaldos iguais: {bool(np.array_equal(esperados, banco.saldos))}")
+
+
+if __name__ == '__main__':
+    main()
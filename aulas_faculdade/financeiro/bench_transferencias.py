@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_transferencias.py
+
+Benchmark de vazão do BancoComDiario com várias threads: cada thread faz
+transferências entre contas sorteadas, depósitos e saques que forçam os limites.
+Poucas contas concentram a disputa pelas travas.
+
+Durante a execução, uma thread de conferência tira retratos do banco (todas as contas
+travadas) e confere que os saldos são exatamente os reconstruídos pelo diário até
+aquele ponto. No final são conferidos:
+- conservação: saldo total = saldo inicial + depósitos - saques registrados no diário;
+- limites: refazendo o diário em ordem, nenhum débito deixou uma conta com
+  saldo + limite <= 0 (poupança abaixo de zero ou corrente além do limite).
+
+Uso:
+    python -m aulas_faculdade.financeiro.bench_transferencias --contas 100 --threads 1 2 4 8
+"""
+
+import argparse
+import random
+import threading
+import time
+from decimal import Decimal
+
+from .contas import ContaCorrente, ContaPoupanca
+from .diario import DEPOSITO, SAQUE, BancoComDiario, para_centavos
+
+
+def montar_banco(n_contas: int, rng: random.Random) -> BancoComDiario:
+    banco = BancoComDiario()
+    for numero in range(1, n_contas + 1):
+        classe = ContaPoupanca if numero % 2 else ContaCorrente
+        banco.abrir_conta(classe, numero, Decimal(rng.randrange(0, 500_000)).scaleb(-2))
+    return banco
+
+
+def trabalhar(banco: BancoComDiario, n_contas: int, operacoes: int, fracao_saques: float,
+              fracao_depositos: float, semente: int, resultado: list):
+    rng = random.Random(semente)
+    realizadas = 0
+    for _ in range(operacoes):
+        valor = Decimal(rng.randrange(1, 100_000)).scaleb(-2)
+        origem = rng.randrange(1, n_contas + 1)
+        sorteio = rng.random()
+        if sorteio < fracao_saques:
+            realizadas += banco.sacar(origem, valor) is not None
+        elif sorteio < fracao_saques + fracao_depositos:
+            banco.depositar(origem, valor)
+            realizadas += 1
+        else:
+            destino = rng.randrange(1, n_contas)
+            destino += destino >= origem
+            realizadas += banco.transferir(origem, destino, valor) is not None
+    resultado.append(realizadas)
+
+
+def conferir_em_andamento(banco: BancoComDiario, parar: threading.Event, intervalo: float, falhas: list):
+    while not parar.wait(intervalo):
+        saldos, tamanho = banco.retrato()
+        falhas.append(banco.diario.reconstruir_saldos(tamanho) != saldos)
+
+
+def conferir_limites(banco: BancoComDiario) -> int:
+    """
+    Refaz o diário em ordem e conta os débitos que deixaram saldo + limite <= 0.
+    """
+    limites = {numero: para_centavos(banco.conta(numero).limite) for numero in banco.numeros()}
+    saldos = dict.fromkeys(limites, 0)
+    violacoes = 0
+    for lancamento in banco.diario:
+        if lancamento.destino is not None:
+            saldos[lancamento.destino] += lancamento.centavos
+        if lancamento.origem is not None:
+            saldos[lancamento.origem] -= lancamento.centavos
+            violacoes += saldos[lancamento.origem] + limites[lancamento.origem] <= 0
+    return violacoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vazão e invariantes das transferências concorrentes.")
+    parser.add_argument('--contas', type=int, default=100)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--operacoes', type=int, default=200_000, help="operações por rodada (divididas entre as threads)")
+    parser.add_argument('--fracao-saques', type=float, default=0.1)
+    parser.add_argument('--fracao-depositos', type=float, default=0.1)
+    parser.add_argument('--intervalo-conferencia', type=float, default=0.25)
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{args.contas} contas | {args.operacoes:,} operações por rodada | "
+          f"{args.fracao_saques:.0%} saques | {args.fracao_depositos:.0%} depósitos\n")
+    print(f"{'threads':>7}{'op/s':>12}{'realizadas':>12}{'retratos':>10}{'total ok':>10}{'limites ok':>12}")
+    for n_threads in args.threads:
+        banco = montar_banco(args.contas, random.Random(args.semente))
+        inicial = banco.total_centavos()
+        resultados, falhas = [], []
+        parar = threading.Event()
+        conferente = threading.Thread(target=conferir_em_andamento,
+                                      args=(banco, parar, args.intervalo_conferencia, falhas))
+        trabalhadores = [threading.Thread(target=trabalhar,
+                                          args=(banco, args.contas, args.operacoes // n_threads,
+                                                args.fracao_saques, args.fracao_depositos,
+                                                args.semente + i, resultados))
+                         for i in range(n_threads)]
+        conferente.start()
+        inicio = time.perf_counter()
+        for trabalhador in trabalhadores:
+            trabalhador.start()
+        for trabalhador in trabalhadores:
+            trabalhador.join()
+        duracao = time.perf_counter() - inicio
+        parar.set()
+        conferente.join()
+
+        movimentado = {SAQUE: 0, DEPOSITO: 0}
+        for lancamento in banco.diario:
+            if lancamento.tipo in movimentado:
+                movimentado[lancamento.tipo] += lancamento.centavos
+        esperado = inicial + movimentado[DEPOSITO] - movimentado[SAQUE]
+        total_ok = banco.total_centavos() == esperado and banco.conferir_diario() and not any(falhas)
+        limites_ok = conferir_limites(banco) == 0
+        operacoes = (args.operacoes // n_threads) * n_threads
+        print(f"{n_threads:>7}{operacoes / duracao:>12,.0f}{sum(resultados):>12,}{len(falhas):>10}"
+              f"{'sim' if total_ok else 'NÃO':>10}{'sim' if limites_ok else 'NÃO':>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+carteira.py
+
+Carteira da "UNIDADE 2/AULA 1.ipynb" e uma versão com histórico consultável no tempo.
+
+A Carteira do notebook guarda só o saldo atual (declarado como atributo de classe) e
+imprime uma mensagem a cada operação. A CarteiraRegistrada mantém as mesmas operações
+e regras, mas registra cada movimentação com o seu momento em uma árvore de Fenwick
+(somas de prefixo), de modo que "saldo no momento T" e "fluxo líquido entre T1 e T2"
+são respondidos em O(log n), e cada nova movimentação também custa O(log n). As
+mensagens são opcionais.
+
+Os valores são guardados em centavos inteiros (ver diario.para_centavos), e os momentos
+das movimentações não podem voltar no tempo: o histórico é somente de acréscimo.
+"""
+
+import time
+from array import array
+from bisect import bisect_right
+from typing import Optional
+
+from .diario import para_centavos, para_reais
+
+MENSAGEM_SUCESSO = 'Operação realizada com sucesso'
+MENSAGEM_SALDO_INSUFICIENTE = 'Operação não realizada. Saldo Insuficiente!'
+
+
+# -----------------------------------------------------------
+# Classe Carteira (notebook)
+# -----------------------------------------------------------
+class Carteira():
+    saldo = 0
+
+    def adicionar_fundos(self, valor):
+        self.saldo += valor
+        print('Operação realizada com sucesso')
+
+    def remover_fundos(self, valor):
+        if self.saldo >= valor:
+            self.saldo -= valor
+            print('Operação realizada com sucesso')
+        else:
+            print('Operação não realizada. Saldo Insuficiente!')
+
+
+# -----------------------------------------------------------
+# Classe ArvoreFenwick
+# -----------------------------------------------------------
+class ArvoreFenwick:
+    """
+    Árvore de Fenwick (binary indexed tree) somente de acréscimo, sobre inteiros de
+    64 bits. O nó i (a partir de 1) guarda a soma dos valores (i - lsb(i), i], em que
+    lsb(i) = i & -i.
+    """
+
+    def __init__(self):
+        self._nos = array('q', [0])  # posição 0 não usada
+
+    def __len__(self) -> int:
+        return len(self._nos) - 1
+
+    def acrescentar(self, valor: int):
+        """
+        Acrescenta um valor no fim, em O(log n): o novo nó soma o valor e os nós que
+        cobrem o restante do seu intervalo.
+        """
+        i = len(self._nos)
+        inicio = i - (i & -i)
+        nos = self._nos
+        soma = valor
+        j = i - 1
+        while j > inicio:
+            soma += nos[j]
+            j -= j & -j
+        nos.append(soma)
+
+    def prefixo(self, quantidade: int) -> int:
+        """
+        Soma dos primeiros `quantidade` valores, em O(log n).
+        """
+        nos = self._nos
+        soma = 0
+        while quantidade > 0:
+            soma += nos[quantidade]
+            quantidade -= quantidade & -quantidade
+        return soma
+
+
+# -----------------------------------------------------------
+# Classe CarteiraRegistrada
+# -----------------------------------------------------------
+class CarteiraRegistrada(Carteira):
+    """
+    Carteira com histórico de movimentações no tempo.
+
+    Atributos:
+        imprimir (bool): exibe as mensagens da Carteira original a cada operação
+        momentos (array[float]): momento de cada movimentação (time.time(), não decrescente)
+        movimentos (ArvoreFenwick): valor de cada movimentação em centavos (negativo nas retiradas)
+    """
+
+    def __init__(self, imprimir: bool = False):
+        self.imprimir = imprimir
+        self.momentos = array('d')
+        self.movimentos = ArvoreFenwick()
+        self._saldo_centavos = 0
+
+    @property
+    def saldo(self) -> float:
+        return para_reais(self._saldo_centavos)
+
+    def __len__(self) -> int:
+        return len(self.momentos)
+
+    def _registrar(self, centavos: int, momento: Optional[float]):
+        if momento is None:
+            momento = time.time()
+        if self.momentos and momento < self.momentos[-1]:
+            raise ValueError(f"Movimentação anterior à última registrada ({momento} < {self.momentos[-1]}).")
+        self.momentos.append(momento)
+        self.movimentos.acrescentar(centavos)
+        self._saldo_centavos += centavos
+
+    def _avisar(self, mensagem: str):
+        if self.imprimir:
+            print(mensagem)
+
+    def adicionar_fundos(self, valor, momento: Optional[float] = None):
+        self._registrar(para_centavos(valor), momento)
+        self._avisar(MENSAGEM_SUCESSO)
+
+    def remover_fundos(self, valor, momento: Optional[float] = None) -> bool:
+        """
+        Retira o valor se houver saldo suficiente (mesma regra da Carteira). Retorna se
+        a retirada foi feita; retiradas recusadas não entram no histórico.
+        """
+        centavos = para_centavos(valor)
+        if self._saldo_centavos >= centavos:
+            self._registrar(-centavos, momento)
+            self._avisar(MENSAGEM_SUCESSO)
+            return True
+        self._avisar(MENSAGEM_SALDO_INSUFICIENTE)
+        return False
+
+    # ---- Consultas no Tempo ----
+    def saldo_centavos_em(self, momento: float) -> int:
+        """
+        Saldo em centavos logo depois das movimentações com momento <= `momento`.
+        """
+        return self.movimentos.prefixo(bisect_right(self.momentos, momento))
+
+    def saldo_em(self, momento: float) -> float:
+        return para_reais(self.saldo_centavos_em(momento))
+
+    def fluxo_liquido(self, inicio: float, fim: float) -> float:
+        """
+        Soma das movimentações com inicio < momento <= fim (entradas menos retiradas).
+        """
+        if fim < inicio:
+            raise ValueError("O fim do período deve ser posterior ao início.")
+        return para_reais(self.saldo_centavos_em(fim) - self.saldo_centavos_em(inicio))
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+cartoes.py
+
+Cartões da "UNIDADE 2/AULA 1.ipynb" (classe abstrata e classes concretas): cada
+categoria calcula o cash back de uma compra.
+
+As categorias cujo cash back é uma taxa fixa sobre o valor declaram essa taxa no
+atributo de classe `taxa`, usado pelo cálculo em lote (cashback_lote); nas demais,
+`taxa` é None.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class CartaoBase(ABC):
+    taxa: Optional[float] = None
+
+    @abstractmethod
+    def calcular_cash_back(self, valor):
+        pass
+
+
+class CartaoGold(CartaoBase):
+    taxa = 0.03
+
+    def calcular_cash_back(self, valor):
+        return valor * self.taxa
+
+
+class CartaoPlatinum(CartaoBase):
+    taxa = 0.05
+
+    def calcular_cash_back(self, valor):
+        return valor * self.taxa
+
+
+class CartaoDiamond(CartaoBase):
+    taxa = 0.08
+
+    def calcular_cash_back(self, valor):
+        return valor * self.taxa
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+cashback_lote.py
+
+Cálculo de cash back em lote sobre a hierarquia CartaoBase: em vez de criar um cartão
+e chamar calcular_cash_back para cada compra, as transações são lidas em blocos,
+agrupadas por categoria de cartão e calculadas como operações vetoriais do NumPy.
+
+As taxas vêm das próprias classes: uma categoria que declara o atributo de classe
+`taxa` (calcular_cash_back(valor) == valor * taxa) usa a taxa no caminho vetorial, e
+o resultado é o mesmo, bit a bit, da chamada por objeto. Nenhum cartão é chamado para
+descobrir a regra. Subclasses de CartaoBase sem taxa declarada (faixas, tetos,
+acumulados etc.) continuam funcionando pelo caminho item a item, com uma única
+instância do cartão por categoria.
+
+Formato do arquivo de transações (CSV com cabeçalho): uma coluna com a categoria do
+cartão (os nomes de CATEGORIAS, ou outros registrados) e uma com o valor da compra;
+as demais colunas são copiadas para a saída, acrescida da coluna do cash back.
+
+Uso:
+    python -m aulas_faculdade.financeiro.cashback_lote transacoes.csv --saida cashback.csv
+"""
+
+import argparse
+from typing import Dict, Iterable, Optional, Type
+
+import numpy as np
+import pandas as pd
+
+from .cartoes import CartaoBase, CartaoDiamond, CartaoGold, CartaoPlatinum
+
+# -----------------------------------------------------------
+# Configuração
+# -----------------------------------------------------------
+CATEGORIAS: Dict[str, Type[CartaoBase]] = {
+    'Gold': CartaoGold,
+    'Platinum': CartaoPlatinum,
+    'Diamond': CartaoDiamond,
+}
+
+TAMANHO_BLOCO = 1_000_000
+
+
+def taxa_declarada(classe: Type[CartaoBase]) -> Optional[float]:
+    """
+    Retorna a taxa fixa declarada pela classe do cartão, ou None se ela não declara
+    uma. A taxa só vale se for declarada na classe que define calcular_cash_back ou em
+    uma subclasse dela: uma subclasse que redefine calcular_cash_back (um teto sobre o
+    CartaoGold, por exemplo) sem redeclarar a taxa segue pelo caminho item a item.
+    """
+    taxa = classe.taxa
+    if taxa is None:
+        return None
+    mro = classe.__mro__
+    dona_da_taxa = next(i for i, c in enumerate(mro) if 'taxa' in vars(c))
+    dona_da_regra = next(i for i, c in enumerate(mro) if 'calcular_cash_back' in vars(c))
+    if dona_da_taxa > dona_da_regra:
+        return None
+    return float(taxa)
+
+
+# -----------------------------------------------------------
+# Classe CalculadoraCashback
+# -----------------------------------------------------------
+class CalculadoraCashback:
+    """
+    Calcula o cash back de lotes de transações.
+
+    Atributos:
+        nomes (List[str]): categorias registradas, na ordem dos códigos
+        cartoes (List[CartaoBase]): uma instância por categoria
+        taxas (np.ndarray[float64]): taxa de cada categoria (NaN nas que usam o caminho item a item)
+        totais (Dict[str, List[float]]): por categoria, [transações, soma dos valores, soma do cash back]
+    """
+
+    def __init__(self, categorias: Optional[Dict[str, Type[CartaoBase]]] = None):
+        self.nomes = []
+        self.cartoes = []
+        self.taxas = np.empty(0, dtype=np.float64)
+        self.totais: Dict[str, list] = {}
+        for nome, classe in (categorias or CATEGORIAS).items():
+            self.registrar(nome, classe)
+
+    def registrar(self, nome: str, classe: Type[CartaoBase]):
+        """
+        Registra (ou substitui) uma categoria de cartão.
+        """
+        if not issubclass(classe, CartaoBase):
+            raise TypeError(f"{classe.__name__} não é uma subclasse de CartaoBase.")
+        taxa = taxa_declarada(classe)
+        cartao = classe()
+        if nome in self.nomes:
+            i = self.nomes.index(nome)
+            self.cartoes[i] = cartao
+            self.taxas[i] = np.nan if taxa is None else taxa
+        else:
+            self.nomes.append(nome)
+            self.cartoes.append(cartao)
+            self.taxas = np.append(self.taxas, np.nan if taxa is None else taxa)
+            self.totais[nome] = [0, 0.0, 0.0]
+
+    def codigos(self, categorias) -> np.ndarray:
+        """
+        Converte os nomes das categorias (sequência ou Series, inclusive categórica) em
+        códigos (posições em `nomes`). Levanta ValueError se houver categoria não
+        registrada.
+        """
+        codigos = pd.Categorical(categorias, categories=self.nomes).codes
+        if (codigos < 0).any():
+            desconhecida = pd.Series(categorias)[codigos < 0].iloc[0]
+            raise ValueError(f"Categoria de cartão não registrada: {desconhecida!r}")
+        return codigos
+
+    def calcular(self, categorias, valores) -> np.ndarray:
+        """
+        Calcula o cash back de cada transação (categorias[i], valores[i]) e acumula os
+        totais por categoria.
+        """
+        codigos = self.codigos(categorias)
+        valores = np.asarray(valores, dtype=np.float64)
+        taxas = self.taxas[codigos]
+        cashback = valores * taxas
+        contagens = np.bincount(codigos, minlength=len(self.nomes))
+        for i in np.flatnonzero(np.isnan(self.taxas) & (contagens > 0)):
+            # Caminho item a item: a regra da subclasse, com uma instância por categoria
+            selecionadas = np.flatnonzero(codigos == i)
+            calcular = self.cartoes[i].calcular_cash_back
+            cashback[selecionadas] = [calcular(valor) for valor in valores[selecionadas].tolist()]
+        somas_valores = np.bincount(codigos, weights=valores, minlength=len(self.nomes))
+        somas_cashback = np.bincount(codigos, weights=cashback, minlength=len(self.nomes))
+        for i in np.flatnonzero(contagens):
+            total = self.totais[self.nomes[i]]
+            total[0] += int(contagens[i])
+            total[1] += float(somas_valores[i])
+            total[2] += float(somas_cashback[i])
+        return cashback
+
+    def processar_blocos(self, blocos: Iterable[pd.DataFrame], coluna_cartao: str = 'cartao',
+                         coluna_valor: str = 'valor', coluna_cashback: str = 'cashback'):
+        """
+        Acrescenta a coluna de cash back a cada bloco de transações e o devolve.
+        """
+        for bloco in blocos:
+            bloco[coluna_cashback] = self.calcular(bloco[coluna_cartao], bloco[coluna_valor].to_numpy())
+            yield bloco
+
+    def processar_arquivo(self, entrada: str, saida: Optional[str] = None,
+                          tamanho_bloco: int = TAMANHO_BLOCO, coluna_cartao: str = 'cartao',
+                          coluna_valor: str = 'valor') -> pd.DataFrame:
+        """
+        Lê o CSV de transações em blocos de `tamanho_bloco` linhas, calcula o cash back
+        e, com `saida`, grava as transações com a coluna do cash back (bloco a bloco,
+        sem carregar o arquivo inteiro). Retorna os totais por categoria.
+        """
+        # A coluna do cartão é lida como categórica: os códigos saem da leitura, sem
+        # comparar cada nome de categoria de novo
+        blocos = pd.read_csv(entrada, chunksize=tamanho_bloco, dtype={coluna_cartao: 'category'})
+        primeiro = True
+        for bloco in self.processar_blocos(blocos, coluna_cartao, coluna_valor):
+            if saida is not None:
+                bloco.to_csv(saida, mode='w' if primeiro else 'a', header=primeiro, index=False)
+            primeiro = False
+        return self.resumo()
+
+    def resumo(self) -> pd.DataFrame:
+        """
+        Totais acumulados por categoria: transações, valor e cash back.
+        """
+        return pd.DataFrame.from_dict(self.totais, orient='index',
+                                      columns=['transacoes', 'valor', 'cashback']).rename_axis('cartao')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cash back em lote de um arquivo de transações.")
+    parser.add_argument('entrada', help="CSV com as colunas do cartão e do valor")
+    parser.add_argument('--saida', help="CSV de saída, com a coluna do cash back")
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO)
+    parser.add_argument('--coluna-cartao', default='cartao')
+    parser.add_argument('--coluna-valor', default='valor')
+    args = parser.parse_args()
+
+    calculadora = CalculadoraCashback()
+    resumo = calculadora.processar_arquivo(args.entrada, args.saida, args.tamanho_bloco,
+                                           coluna_cartao=args.coluna_cartao, coluna_valor=args.coluna_valor)
+    print(resumo.to_string())
+
+
+if __name__ == '__main__':
+    main()
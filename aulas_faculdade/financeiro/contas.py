@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+contas.py
+
+Classes de conta da "UNIDADE 2/AULA 3.2.ipynb" (classe abstrata e polimorfismo),
+com o mesmo comportamento do notebook: ContaPoupanca rende 5% e só permite saques
+que deixem saldo positivo; ContaCorrente permite usar até `limite`.
+"""
+
+from abc import ABC, abstractmethod
+
+
+class Conta(ABC):
+    def __init__(self, numero_da_conta, saldo):
+        self.numero_da_conta = numero_da_conta
+        self.saldo = saldo
+
+    def depositar(self, valor):
+        self.saldo += valor
+
+    @abstractmethod
+    def sacar(self, valor):
+        raise NotImplementedError
+
+
+class ContaPoupanca(Conta):
+    taxa_rendimento = 0.05
+
+    def sacar(self, valor):
+        if self.saldo - valor > 0:
+            self.saldo -= valor
+
+    def calcular_rendimentos(self):
+        self.saldo += self.saldo * self.taxa_rendimento
+
+
+class ContaCorrente(Conta):
+    limite = 1000
+
+    def sacar(self, valor):
+        if self.saldo + self.limite - valor > 0:
+            self.saldo -= valor
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+diario.py
+
+Banco com diário de transações: os saldos são inteiros em centavos (sem erros de
+arredondamento de float), cada movimentação é registrada em um diário somente de
+acréscimo, e a transferência entre contas é atômica e segura para múltiplas threads.
+
+Cada conta tem a sua trava. Uma transferência trava as duas contas sempre em ordem
+crescente de número, de modo que duas transferências em sentidos opostos não entram
+em deadlock; a regra de saque (a mesma do `sacar` de cada classe de conta, ver
+contas.py) é conferida e aplicada com a trava da conta de origem, e por isso saques
+concorrentes não ultrapassam o limite. O lançamento entra no diário antes de as
+travas serem liberadas: para cada conta, a ordem do diário é a ordem em que as
+movimentações foram aplicadas, e o diário basta para reconstruir os saldos.
+
+As contas também são entregues como objetos ContaPoupanca / ContaCorrente, cujos
+depositar, sacar e calcular_rendimentos passam pelo banco.
+"""
+
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from decimal import ROUND_HALF_EVEN, Decimal
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from .contas import Conta, ContaCorrente, ContaPoupanca
+
+# -----------------------------------------------------------
+# Configuração
+# -----------------------------------------------------------
+ABERTURA = 'abertura'
+DEPOSITO = 'deposito'
+SAQUE = 'saque'
+TRANSFERENCIA = 'transferencia'
+RENDIMENTO = 'rendimento'
+
+CLASSES_SUPORTADAS = (ContaPoupanca, ContaCorrente)
+
+
+def para_centavos(valor) -> int:
+    """
+    Converte um valor em reais (int, float, str ou Decimal) para centavos, sem passar
+    por aritmética de float. Levanta ValueError se o valor tiver frações de centavo.
+    """
+    centavos = Decimal(str(valor)) * 100
+    if centavos != centavos.to_integral_value():
+        raise ValueError(f"Valor com frações de centavo: {valor!r}")
+    return int(centavos)
+
+
+def para_reais(centavos: int) -> float:
+    return centavos / 100
+
+
+# -----------------------------------------------------------
+# Classe Lancamento
+# -----------------------------------------------------------
+class Lancamento:
+    """
+    Uma movimentação registrada no diário.
+
+    Atributos:
+        sequencia (int): posição no diário (começa em 1)
+        tipo (str): ABERTURA, DEPOSITO, SAQUE, TRANSFERENCIA ou RENDIMENTO
+        origem (Optional[int]): conta debitada (saque e transferência)
+        destino (Optional[int]): conta creditada (abertura, depósito, transferência, rendimento)
+        centavos (int): valor movimentado
+        momento (float): time.time() do registro
+    """
+
+    __slots__ = ('sequencia', 'tipo', 'origem', 'destino', 'centavos', 'momento')
+
+    def __init__(self, sequencia: int, tipo: str, origem: Optional[int], destino: Optional[int],
+                 centavos: int, momento: float):
+        self.sequencia = sequencia
+        self.tipo = tipo
+        self.origem = origem
+        self.destino = destino
+        self.centavos = centavos
+        self.momento = momento
+
+    def __repr__(self) -> str:
+        return (f"Lancamento({self.sequencia}, {self.tipo!r}, origem={self.origem}, "
+                f"destino={self.destino}, centavos={self.centavos})")
+
+
+# -----------------------------------------------------------
+# Classe DiarioTransacoes
+# -----------------------------------------------------------
+class DiarioTransacoes:
+    """
+    Diário somente de acréscimo. A sequência é atribuída sob uma trava própria, com
+    seção crítica curta (um append).
+    """
+
+    def __init__(self):
+        self._lancamentos: List[Lancamento] = []
+        self._trava = threading.Lock()
+
+    def registrar(self, tipo: str, origem: Optional[int], destino: Optional[int], centavos: int) -> Lancamento:
+        with self._trava:
+            lancamento = Lancamento(len(self._lancamentos) + 1, tipo, origem, destino, centavos, time.time())
+            self._lancamentos.append(lancamento)
+        return lancamento
+
+    def __len__(self) -> int:
+        return len(self._lancamentos)
+
+    def __iter__(self) -> Iterator[Lancamento]:
+        # Cópia da lista de referências: o diário pode crescer durante a iteração
+        with self._trava:
+            lancamentos = list(self._lancamentos)
+        return iter(lancamentos)
+
+    def da_conta(self, numero_da_conta: int) -> Iterator[Lancamento]:
+        """
+        Percorre os lançamentos que debitam ou creditam a conta, em ordem.
+        """
+        return (lancamento for lancamento in self
+                if lancamento.origem == numero_da_conta or lancamento.destino == numero_da_conta)
+
+    def reconstruir_saldos(self, ate: Optional[int] = None) -> Dict[int, int]:
+        """
+        Refaz os saldos (em centavos) a partir do diário, opcionalmente só com os
+        primeiros `ate` lançamentos.
+        """
+        saldos: Dict[int, int] = {}
+        for lancamento in islice(self, ate):
+            if lancamento.origem is not None:
+                saldos[lancamento.origem] = saldos.get(lancamento.origem, 0) - lancamento.centavos
+            if lancamento.destino is not None:
+                saldos[lancamento.destino] = saldos.get(lancamento.destino, 0) + lancamento.centavos
+        return saldos
+
+
+# -----------------------------------------------------------
+# Contas Ligadas ao Banco
+# -----------------------------------------------------------
+class _ContaNoBanco:
+    """
+    Base das contas entregues pelo BancoComDiario: o saldo fica no banco, e as
+    operações passam pela trava da conta e pelo diário.
+    """
+
+    def __init__(self, banco: 'BancoComDiario', numero_da_conta: int):
+        self._banco = banco
+        self.numero_da_conta = numero_da_conta
+
+    @property
+    def saldo(self) -> float:
+        return para_reais(self._banco.saldo_centavos(self.numero_da_conta))
+
+    @property
+    def limite(self) -> float:
+        return para_reais(self._banco._limites[self.numero_da_conta])
+
+    def depositar(self, valor):
+        self._banco.depositar(self.numero_da_conta, valor)
+
+    def sacar(self, valor):
+        self._banco.sacar(self.numero_da_conta, valor)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(numero_da_conta={self.numero_da_conta}, saldo={self.saldo})"
+
+
+class ContaPoupancaDiario(_ContaNoBanco, ContaPoupanca):
+    def calcular_rendimentos(self):
+        self._banco.creditar_rendimentos(self.numero_da_conta)
+
+
+class ContaCorrenteDiario(_ContaNoBanco, ContaCorrente):
+    pass
+
+
+CLASSES_DIARIO = {
+    ContaPoupanca: ContaPoupancaDiario,
+    ContaCorrente: ContaCorrenteDiario,
+}
+
+
+# -----------------------------------------------------------
+# Classe BancoComDiario
+# -----------------------------------------------------------
+class BancoComDiario:
+    """
+    Contas com saldo em centavos, uma trava por conta e um diário de transações.
+
+    Atributos:
+        diario (DiarioTransacoes): todas as movimentações, em ordem
+    """
+
+    def __init__(self):
+        self.diario = DiarioTransacoes()
+        self._saldos: Dict[int, int] = {}
+        self._limites: Dict[int, int] = {}
+        self._classes: Dict[int, Type[Conta]] = {}
+        self._travas: Dict[int, threading.Lock] = {}
+        self._trava_cadastro = threading.Lock()
+
+    # ---- Contas ----
+    def abrir_conta(self, classe: Type[Conta], numero_da_conta: int, saldo=0) -> Conta:
+        """
+        Abre uma conta (ContaPoupanca ou ContaCorrente) com o saldo inicial e a retorna.
+        O limite da conta corrente é o ContaCorrente.limite.
+        """
+        if classe not in CLASSES_SUPORTADAS:
+            raise TypeError(f"Classe de conta não suportada: {classe.__name__}")
+        centavos = para_centavos(saldo)
+        with self._trava_cadastro:
+            if numero_da_conta in self._saldos:
+                raise ValueError(f"Já existe uma conta com o número {numero_da_conta}")
+            self._travas[numero_da_conta] = threading.Lock()
+            self._limites[numero_da_conta] = para_centavos(getattr(classe, 'limite', 0))
+            self._classes[numero_da_conta] = classe
+            self._saldos[numero_da_conta] = centavos
+            self.diario.registrar(ABERTURA, None, numero_da_conta, centavos)
+        return self.conta(numero_da_conta)
+
+    def conta(self, numero_da_conta: int) -> Conta:
+        """
+        Retorna a conta como objeto ContaPoupanca / ContaCorrente ligado ao banco.
+        """
+        return CLASSES_DIARIO[self._classe(numero_da_conta)](self, numero_da_conta)
+
+    def _classe(self, numero_da_conta: int) -> Type[Conta]:
+        try:
+            return self._classes[numero_da_conta]
+        except KeyError:
+            raise KeyError(f"Conta inexistente: {numero_da_conta}") from None
+
+    def numeros(self) -> List[int]:
+        with self._trava_cadastro:
+            return list(self._saldos)
+
+    @contextmanager
+    def _travar(self, *numeros: int):
+        """
+        Adquire as travas das contas em ordem crescente de número, sem repetições.
+        """
+        for numero in numeros:
+            self._classe(numero)
+        with ExitStack() as pilha:
+            for numero in sorted(set(numeros)):
+                pilha.enter_context(self._travas[numero])
+            yield
+
+    # ---- Movimentações ----
+    def _pode_debitar(self, numero_da_conta: int, centavos: int) -> bool:
+        # Regra do `sacar` das classes: saldo + limite - valor > 0 (limite 0 na poupança)
+        return self._saldos[numero_da_conta] + self._limites[numero_da_conta] - centavos > 0
+
+    @staticmethod
+    def _valor_positivo(valor) -> int:
+        centavos = para_centavos(valor)
+        if centavos <= 0:
+            raise ValueError(f"O valor deve ser positivo: {valor!r}")
+        return centavos
+
+    def depositar(self, numero_da_conta: int, valor) -> Lancamento:
+        centavos = self._valor_positivo(valor)
+        with self._travar(numero_da_conta):
+            self._saldos[numero_da_conta] += centavos
+            return self.diario.registrar(DEPOSITO, None, numero_da_conta, centavos)
+
+    def sacar(self, numero_da_conta: int, valor) -> Optional[Lancamento]:
+        """
+        Saca com a regra da classe da conta. Retorna o lançamento, ou None se o saque
+        não for permitido (como no `sacar` original, o saldo não muda).
+        """
+        centavos = self._valor_positivo(valor)
+        with self._travar(numero_da_conta):
+            if not self._pode_debitar(numero_da_conta, centavos):
+                return None
+            self._saldos[numero_da_conta] -= centavos
+            return self.diario.registrar(SAQUE, numero_da_conta, None, centavos)
+
+    def transferir(self, origem: int, destino: int, valor) -> Optional[Lancamento]:
+        """
+        Transfere de `origem` para `destino` de forma atômica: o débito segue a regra
+        de saque da conta de origem, e débito, crédito e lançamento acontecem com as
+        duas contas travadas. Retorna o lançamento, ou None se o saque não for permitido.
+        """
+        if origem == destino:
+            raise ValueError("A conta de origem e a de destino devem ser diferentes.")
+        centavos = self._valor_positivo(valor)
+        with self._travar(origem, destino):
+            if not self._pode_debitar(origem, centavos):
+                return None
+            self._saldos[origem] -= centavos
+            self._saldos[destino] += centavos
+            return self.diario.registrar(TRANSFERENCIA, origem, destino, centavos)
+
+    def creditar_rendimentos(self, numero_da_conta: int, taxa: float = ContaPoupanca.taxa_rendimento) -> Lancamento:
+        """
+        Credita o rendimento de uma poupança (saldo * taxa, arredondado ao centavo pela
+        regra do banqueiro).
+        """
+        if self._classe(numero_da_conta) is not ContaPoupanca:
+            raise TypeError(f"A conta {numero_da_conta} não é uma conta poupança.")
+        with self._travar(numero_da_conta):
+            centavos = int((self._saldos[numero_da_conta] * Decimal(str(taxa)))
+                           .quantize(Decimal(1), rounding=ROUND_HALF_EVEN))
+            self._saldos[numero_da_conta] += centavos
+            return self.diario.registrar(RENDIMENTO, None, numero_da_conta, centavos)
+
+    # ---- Consultas ----
+    def saldo_centavos(self, numero_da_conta: int) -> int:
+        with self._travar(numero_da_conta):
+            return self._saldos[numero_da_conta]
+
+    def total_centavos(self) -> int:
+        """
+        Soma dos saldos com todas as contas travadas (um retrato consistente, mesmo com
+        transferências em andamento).
+        """
+        with self._trava_cadastro, self._travar(*self._saldos):
+            return sum(self._saldos.values())
+
+    def retrato(self) -> Tuple[Dict[int, int], int]:
+        """
+        Retorna (saldos em centavos, tamanho do diário) com todas as contas travadas:
+        nenhuma movimentação está pela metade, e os saldos são exatamente os que
+        resultam dos lançamentos até esse tamanho.
+        """
+        with self._trava_cadastro, self._travar(*self._saldos):
+            return dict(self._saldos), len(self.diario)
+
+    def conferir_diario(self) -> bool:
+        """
+        Confere se os saldos atuais são os reconstruídos a partir do diário.
+        """
+        saldos, tamanho = self.retrato()
+        return self.diario.reconstruir_saldos(tamanho) == saldos
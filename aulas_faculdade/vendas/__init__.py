@@ -0,0 +1,7 @@
+"""
+Extensões das análises de vendas da UNIDADE 1 ("AULA 3.ipynb" e "AULA 4.ipynb").
+
+Os notebooks montam os DataFrames de vendas a partir de dicionários em memória; o
+módulo `agregacao` produz as mesmas tabelas (vendas por vendedor e por ano) a partir
+de arquivos CSV maiores que a memória.
+"""
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+agregacao.py
+
+Agregação de vendas fora da memória: lê um CSV de vendas (uma venda por linha) em
+blocos e mantém, por vendedor e por ano, acumuladores combináveis (soma, contagem,
+mínimo e máximo). A memória usada depende do número de grupos e do tamanho do bloco,
+não do tamanho do arquivo.
+
+Os acumuladores de dois trechos do arquivo se combinam somando somas e contagens e
+tomando o menor mínimo e o maior máximo, por isso o arquivo pode ser dividido em
+faixas de bytes (alinhadas no início de linha) e agregado em paralelo por um pool de
+processos; cada processo lê só a sua faixa. Cada grupo guarda também a posição da sua
+primeira venda no arquivo, e os resultados saem na ordem em que os grupos aparecem,
+como os DataFrames dos notebooks:
+
+    vendas_por_vendedor(agregado)  ->  colunas 'Vendedores' e 'Vendas' (soma)
+    vendas_por_ano(agregado)       ->  colunas 'Ano' e 'Vendas' (soma)
+
+O CSV tem cabeçalho, com as colunas COLUNA_VENDEDOR, COLUNA_ANO e COLUNA_VALOR (outras
+colunas são ignoradas), e não pode ter quebras de linha dentro de campos entre aspas
+(a divisão em faixas procura o fim da linha).
+
+Uso:
+    python -m aulas_faculdade.vendas.agregacao vendas.csv --processos 4
+"""
+
+import argparse
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+# -----------------------------------------------------------
+# Configuração
+# -----------------------------------------------------------
+COLUNA_VENDEDOR = 'Vendedores'
+COLUNA_ANO = 'Ano'
+COLUNA_VALOR = 'Vendas'
+
+TAMANHO_BLOCO = 1_000_000          # linhas por bloco na leitura sequencial
+BYTES_POR_BLOCO = 64 * 2 ** 20     # bytes por bloco na leitura de uma faixa
+FAIXAS_POR_PROCESSO = 4            # faixas menores equilibram a carga entre os processos
+
+# A posição de uma venda é (número da faixa << BITS_POSICAO) + linha dentro da faixa,
+# o que preserva a ordem do arquivo sem precisar contar as linhas das faixas anteriores
+BITS_POSICAO = 40
+
+# Como cada acumulador se combina
+COMBINACAO = {'soma': 'sum', 'contagem': 'sum', 'minimo': 'min', 'maximo': 'max', 'primeira': 'min'}
+
+
+# -----------------------------------------------------------
+# Acumuladores
+# -----------------------------------------------------------
+def _combinar(a: Optional[pd.DataFrame], b: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return pd.concat([a, b]).groupby(level=0, sort=False).agg(COMBINACAO)
+
+
+class AgregadoVendas:
+    """
+    Acumuladores por grupo de cada chave de agrupamento.
+
+    Atributos:
+        chaves (Tuple[str, ...]): colunas de agrupamento
+        coluna_valor (str): coluna agregada
+        grupos (Dict[str, pd.DataFrame]): por chave, um DataFrame indexado pelo grupo, com
+            as colunas soma, contagem, minimo, maximo e primeira (posição da primeira venda)
+        linhas (int): vendas lidas
+    """
+
+    def __init__(self, chaves: Iterable[str] = (COLUNA_VENDEDOR, COLUNA_ANO),
+                 coluna_valor: str = COLUNA_VALOR):
+        self.chaves = tuple(chaves)
+        self.coluna_valor = coluna_valor
+        self.grupos: Dict[str, Optional[pd.DataFrame]] = dict.fromkeys(self.chaves)
+        self.linhas = 0
+
+    def acrescentar(self, bloco: pd.DataFrame, posicao_inicial: int):
+        """
+        Agrega um bloco de vendas cuja primeira linha está em `posicao_inicial`.
+        """
+        valores = bloco[self.coluna_valor].reset_index(drop=True)
+        posicoes = pd.Series(range(posicao_inicial, posicao_inicial + len(bloco)))
+        for chave in self.chaves:
+            grupos = bloco[chave].to_numpy()
+            parcial = valores.groupby(grupos, sort=False).agg(['sum', 'count', 'min', 'max'])
+            parcial.columns = ['soma', 'contagem', 'minimo', 'maximo']
+            parcial['primeira'] = posicoes.groupby(grupos, sort=False).min()
+            self.grupos[chave] = _combinar(self.grupos[chave], parcial)
+        self.linhas += len(bloco)
+
+    def combinar(self, outro: 'AgregadoVendas') -> 'AgregadoVendas':
+        """
+        Incorpora os acumuladores de outro agregado (de outro trecho do arquivo).
+        """
+        for chave in self.chaves:
+            self.grupos[chave] = _combinar(self.grupos[chave], outro.grupos[chave])
+        self.linhas += outro.linhas
+        return self
+
+    def estatisticas(self, chave: str) -> pd.DataFrame:
+        """
+        Soma, contagem, mínimo, máximo e média por grupo, na ordem de aparição.
+        """
+        grupos = self.grupos[chave]
+        if grupos is None:
+            return pd.DataFrame(columns=['soma', 'contagem', 'minimo', 'maximo', 'media']).rename_axis(chave)
+        grupos = grupos.sort_values('primeira', kind='stable').drop(columns='primeira')
+        grupos['media'] = grupos['soma'] / grupos['contagem']
+        return grupos.rename_axis(chave)
+
+    def tabela(self, chave: str) -> pd.DataFrame:
+        """
+        DataFrame no formato dos notebooks: a coluna do grupo e a soma na coluna do valor.
+        """
+        soma = self.estatisticas(chave)['soma']
+        return pd.DataFrame({chave: soma.index.to_numpy(), self.coluna_valor: soma.to_numpy()})
+
+
+def vendas_por_vendedor(agregado: AgregadoVendas) -> pd.DataFrame:
+    return agregado.tabela(COLUNA_VENDEDOR)
+
+
+def vendas_por_ano(agregado: AgregadoVendas) -> pd.DataFrame:
+    return agregado.tabela(COLUNA_ANO)
+
+
+# -----------------------------------------------------------
+# Leitura Sequencial e em Paralelo
+# -----------------------------------------------------------
+def _colunas_usadas(chaves: Iterable[str], coluna_valor: str) -> List[str]:
+    return list(dict.fromkeys([*chaves, coluna_valor]))
+
+
+def agregar_sequencial(caminho: str, chaves: Iterable[str] = (COLUNA_VENDEDOR, COLUNA_ANO),
+                       coluna_valor: str = COLUNA_VALOR, tamanho_bloco: int = TAMANHO_BLOCO) -> AgregadoVendas:
+    """
+    Agrega o arquivo em um único processo, em blocos de `tamanho_bloco` linhas.
+    """
+    agregado = AgregadoVendas(chaves, coluna_valor)
+    for bloco in pd.read_csv(caminho, usecols=_colunas_usadas(agregado.chaves, coluna_valor),
+                             chunksize=tamanho_bloco):
+        agregado.acrescentar(bloco, agregado.linhas)
+    return agregado
+
+
+def dividir_arquivo(caminho: str, partes: int) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """
+    Divide o corpo do CSV em até `partes` faixas de bytes [inicio, fim) que começam no
+    início de uma linha. Retorna (linha de cabeçalho, faixas).
+    """
+    tamanho = os.path.getsize(caminho)
+    with open(caminho, 'rb') as arquivo:
+        cabecalho = arquivo.readline()
+        corpo = arquivo.tell()
+        limites = [corpo]
+        for i in range(1, partes):
+            arquivo.seek(max(limites[-1], corpo + (tamanho - corpo) * i // partes))
+            if arquivo.tell() > corpo:
+                arquivo.seek(arquivo.tell() - 1)
+                arquivo.readline()  # avança até o início da próxima linha
+            posicao = arquivo.tell()
+            if posicao > limites[-1] and posicao < tamanho:
+                limites.append(posicao)
+    limites.append(tamanho)
+    return cabecalho, list(zip(limites, limites[1:]))
+
+
+def _blocos_da_faixa(caminho: str, inicio: int, fim: int, bytes_por_bloco: int) -> Iterable[bytes]:
+    """
+    Lê a faixa em blocos de cerca de `bytes_por_bloco` bytes, terminados em fim de linha.
+    """
+    with open(caminho, 'rb') as arquivo:
+        arquivo.seek(inicio)
+        restante = fim - inicio
+        while restante > 0:
+            dados = arquivo.read(min(bytes_por_bloco, restante))
+            restante -= len(dados)
+            if restante > 0 and not dados.endswith(b'\n'):
+                complemento = arquivo.readline()
+                restante -= len(complemento)
+                dados += complemento
+            yield dados
+
+
+def _agregar_faixa(caminho: str, numero: int, inicio: int, fim: int, cabecalho: bytes,
+                   chaves: Tuple[str, ...], coluna_valor: str, bytes_por_bloco: int) -> AgregadoVendas:
+    """
+    Agrega uma faixa do arquivo (executada nos processos do pool).
+    """
+    agregado = AgregadoVendas(chaves, coluna_valor)
+    base = numero << BITS_POSICAO
+    for dados in _blocos_da_faixa(caminho, inicio, fim, bytes_por_bloco):
+        bloco = pd.read_csv(io.BytesIO(cabecalho + dados), usecols=_colunas_usadas(chaves, coluna_valor))
+        agregado.acrescentar(bloco, base + agregado.linhas)
+    return agregado
+
+
+def agregar_arquivo(caminho: str, processos: int = 1, chaves: Iterable[str] = (COLUNA_VENDEDOR, COLUNA_ANO),
+                    coluna_valor: str = COLUNA_VALOR, tamanho_bloco: int = TAMANHO_BLOCO,
+                    bytes_por_bloco: int = BYTES_POR_BLOCO) -> AgregadoVendas:
+    """
+    Agrega o arquivo de vendas. Com mais de um processo, o arquivo é dividido em
+    faixas de bytes agregadas por um pool de processos, e os resultados parciais são
+    combinados na ordem das faixas.
+    """
+    chaves = tuple(chaves)
+    if processos <= 1:
+        return agregar_sequencial(caminho, chaves, coluna_valor, tamanho_bloco)
+    cabecalho, faixas = dividir_arquivo(caminho, processos * FAIXAS_POR_PROCESSO)
+    with ProcessPoolExecutor(processos) as pool:
+        parciais = pool.map(_agregar_faixa, *zip(*[
+            (caminho, numero, inicio, fim, cabecalho, chaves, coluna_valor, bytes_por_bloco)
+            for numero, (inicio, fim) in enumerate(faixas)
+        ]))
+        return reduce(AgregadoVendas.combinar, parciais, AgregadoVendas(chaves, coluna_valor))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vendas por vendedor e por ano de um CSV grande.")
+    parser.add_argument('arquivo', help="CSV de vendas, uma venda por linha")
+    parser.add_argument('--processos', type=int, default=os.cpu_count())
+    parser.add_argument('--coluna-vendedor', default=COLUNA_VENDEDOR)
+    parser.add_argument('--coluna-ano', default=COLUNA_ANO)
+    parser.add_argument('--coluna-valor', default=COLUNA_VALOR)
+    parser.add_argument('--estatisticas', action='store_true',
+                        help="exibe soma, contagem, mínimo, máximo e média em vez só da soma")
+    args = parser.parse_args()
+
+    chaves = (args.coluna_vendedor, args.coluna_ano)
+    agregado = agregar_arquivo(args.arquivo, args.processos, chaves, args.coluna_valor)
+    print(f"{agregado.linhas:,} vendas\n")
+    for chave in chaves:
+        tabela = agregado.estatisticas(chave) if args.estatisticas else agregado.tabela(chave)
+        print(tabela.to_string(), end="\n\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_agregacao.py
+
+Benchmark da agregação de vendas fora da memória: gera um CSV sintético (vendedores
+e anos dos notebooks, mais vendedores sintéticos) e compara a leitura inteira com
+pd.read_csv + groupby, a agregação em blocos num processo e a agregação em paralelo
+por faixas do arquivo, conferindo se as tabelas são iguais. O pico de memória de cada
+variante é medido num processo separado.
+
+Uso:
+    python -m aulas_faculdade.vendas.bench_agregacao --vendas 20000000 --processos 4
+"""
+
+import argparse
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .agregacao import COLUNA_ANO, COLUNA_VALOR, COLUNA_VENDEDOR, agregar_arquivo
+
+VENDEDORES = ['Marcos', 'João', 'Pedro', 'Lucas', 'mateus']
+ANOS = [1974, 1982, 2002, 2006, 2011, 2014, 2025]
+
+
+def gerar_arquivo(caminho: str, vendas: int, vendedores: int, semente: int, tamanho_bloco: int = 1_000_000):
+    """
+    Grava `vendas` linhas (Vendedores, Ano, Vendas) em blocos, com valores inteiros.
+    """
+    rng = np.random.default_rng(semente)
+    nomes = np.array(VENDEDORES + [f'Vendedor {i}' for i in range(vendedores - len(VENDEDORES))], dtype=object)
+    anos = np.array(ANOS)
+    for inicio in range(0, vendas, tamanho_bloco):
+        n = min(tamanho_bloco, vendas - inicio)
+        pd.DataFrame({
+            COLUNA_VENDEDOR: nomes[rng.integers(0, len(nomes), n)],
+            COLUNA_ANO: anos[rng.integers(0, len(anos), n)],
+            COLUNA_VALOR: rng.integers(1, 10_000, n),
+        }).to_csv(caminho, mode='w' if inicio == 0 else 'a', header=inicio == 0, index=False)
+
+
+def _tabelas_em_memoria(caminho: str):
+    vendas = pd.read_csv(caminho)
+    return [vendas.groupby(chave, sort=False)[COLUNA_VALOR].sum().reset_index()
+            for chave in (COLUNA_VENDEDOR, COLUNA_ANO)]
+
+
+def _executar(variante: str, caminho: str, processos: int):
+    """
+    Executa uma variante e retorna (tabelas, segundos, pico de memória em MiB).
+    """
+    inicio = time.perf_counter()
+    if variante == 'memoria':
+        tabelas = _tabelas_em_memoria(caminho)
+    else:
+        agregado = agregar_arquivo(caminho, processos)
+        tabelas = [agregado.tabela(chave) for chave in (COLUNA_VENDEDOR, COLUNA_ANO)]
+    segundos = time.perf_counter() - inicio
+    pico = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024
+    return tabelas, segundos, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agregação de vendas: em memória x em blocos x em paralelo.")
+    parser.add_argument('--vendas', type=int, default=20_000_000)
+    parser.add_argument('--vendedores', type=int, default=1_000)
+    parser.add_argument('--processos', type=int, default=os.cpu_count())
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'vendas.csv')
+        gerar_arquivo(caminho, args.vendas, args.vendedores, args.semente)
+        print(f"{args.vendas:,} vendas | {args.vendedores:,} vendedores | "
+              f"arquivo de {os.path.getsize(caminho) / 2 ** 20:,.0f} MiB")
+
+        referencia = None
+        for variante, processos in (('memoria', 1), ('blocos', 1), ('paralelo', args.processos)):
+            # Um processo novo por variante, para o pico de memória ser só dela
+            with ProcessPoolExecutor(1) as executor:
+                tabelas, segundos, pico = executor.submit(_executar, variante, caminho, processos).result()
+            if referencia is None:
+                referencia = tabelas
+            iguais = all(tabela.equals(esperada) for tabela, esperada in zip(tabelas, referencia))
+            print(f"{variante:>8} ({processos} proc.): {segundos:6.2f} s "
+                  f"({args.vendas / segundos:,.0f} vendas/s) | pico {pico:,.0f} MiB | tabelas iguais: {iguais}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+"""
+Testes da BibliotecaSQLite: importação em lote com as regras da Biblioteca em memória.
+"""
+
+from aulas_faculdade.biblioteca import Biblioteca
+from aulas_faculdade.biblioteca.armazenamento_sqlite import BibliotecaSQLite
+
+
+def test_importacao_igual_a_biblioteca(tmp_path):
+    livros = tmp_path / 'livros.csv'
+    linhas = ["titulo,autor,ano,isbn,total_copias"]
+    linhas += [f"Ação {i},Zé,{1990 + i % 5}, {i % 12} ,{i % 3}" for i in range(16)]
+    linhas += ["Inválido,Autor,2000,x,-1", "curta"]
+    livros.write_text("\n".join(linhas) + "\n", encoding='utf-8')
+    usuarios = tmp_path / 'usuarios.jsonl'
+    usuarios.write_text("".join(f'{{"nome": "N{i}", "id_usuario": "u{i % 5}", "contato": "c"}}\n' for i in range(7))
+                        + '{"nome": "sem id"}\n{"nome": "N", "id_usuario": 7, "contato": "c"}\n', encoding='utf-8')
+
+    referencia, sqlite = Biblioteca(), BibliotecaSQLite()
+    for bib in (referencia, sqlite):
+        bib.cadastrar_livro("Já cadastrado", "Autor", 2000, "3", 1)
+        bib.cadastrar_usuario("Já cadastrado", "u1", "c")
+    for metodo, caminho in (('importar_livros', livros), ('importar_usuarios', usuarios)):
+        esperado = getattr(referencia, metodo)(caminho, tamanho_lote=5)
+        obtido = getattr(sqlite, metodo)(caminho, tamanho_lote=5)
+        assert (obtido.lidos, obtido.importados, obtido.erros) == (esperado.lidos, esperado.importados, esperado.erros)
+
+    def livros_de(bib):
+        return [(livro.isbn, livro.titulo, livro.ano, livro.copias_disponiveis)
+                for livro in bib.gerar_relatorio_livros_disponiveis()]
+
+    assert livros_de(sqlite) == livros_de(referencia)
+    assert [usuario.id_usuario for usuario in sqlite.gerar_relatorio_usuarios()] == \
+        [usuario.id_usuario for usuario in referencia.gerar_relatorio_usuarios()]
+    assert [livro.isbn for livro in sqlite.buscar_livros('titulo', 'acao 1')] == \
+        [livro.isbn for livro in referencia.buscar_livros('titulo', 'acao 1')]
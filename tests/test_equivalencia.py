@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+"""
+Equivalência entre os motores: a mesma sequência aleatória de operações na Biblioteca
+em memória, na BibliotecaConcorrente, na BibliotecaSQLite e na BibliotecaParticionada
+produz os mesmos erros, consultas e relatórios.
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from aulas_faculdade.biblioteca import Biblioteca
+from aulas_faculdade.biblioteca.armazenamento_sqlite import BibliotecaSQLite
+from aulas_faculdade.biblioteca.concorrencia import BibliotecaConcorrente
+from aulas_faculdade.biblioteca.particionado import BibliotecaParticionada
+
+N_LIVROS = 40
+N_USUARIOS = 12
+N_OPERACOES = 600
+INICIO = date(2026, 1, 1)
+PALAVRAS = ("Dom", "Casmurro", "Memórias", "Póstumas", "Iracema", "Sertões", "Macunaíma")
+
+
+def _livro(livro):
+    return livro.isbn, livro.titulo, livro.autor, livro.ano, livro.total_copias, livro.copias_disponiveis
+
+
+def _emprestimo(emprestimo):
+    usuario, livro, data = emprestimo
+    return usuario.id_usuario, livro.isbn, data
+
+
+def _erro(excecao):
+    return None if excecao is None else (type(excecao).__name__, str(excecao))
+
+
+def _executar(bib, operacao):
+    """
+    Executa uma operação e devolve o resultado normalizado (sem objetos), ou o erro.
+    """
+    nome, argumentos = operacao
+    try:
+        resultado = getattr(bib, nome)(*argumentos)
+    except Exception as e:
+        return _erro(e)
+    if nome in ('emprestar_lote', 'devolver_lote'):
+        return resultado.aplicado, [_erro(erro) for erro in resultado.erros]
+    if nome == 'processar_atrasos':
+        # Avisos com o mesmo vencimento podem sair em ordens diferentes em cada motor
+        return sorted(map(_emprestimo, resultado.avisos), key=lambda aviso: (aviso[2], aviso)), resultado.multas
+    return resultado
+
+
+def _operacoes(semente):
+    aleatorio = random.Random(semente)
+    operacoes = []
+    for i in range(N_LIVROS):
+        titulo = " ".join(aleatorio.sample(PALAVRAS, 2))
+        copias = aleatorio.randint(0, 3)
+        operacoes.append(('cadastrar_livro', (titulo, f"Autor {i % 5}", 1990 + i % 8, f"{i:03d}", copias)))
+    for i in range(N_USUARIOS):
+        operacoes.append(('cadastrar_usuario', (f"Usuário {i}", f"u{i:02d}", f"u{i}@exemplo")))
+    # Repetidos também devem falhar do mesmo jeito
+    operacoes.append(('cadastrar_livro', ("Outro", "Autor", 2000, "000", 1)))
+    operacoes.append(('cadastrar_usuario', ("Outro", "u00", "contato")))
+
+    # Devoluções sorteiam, na maioria das vezes, pares já pedidos em empréstimo
+    pedidos = [("u00", "000")]
+
+    def par_de_devolucao():
+        if aleatorio.random() < 0.8:
+            return aleatorio.choice(pedidos)
+        return f"u{aleatorio.randrange(N_USUARIOS):02d}", f"{aleatorio.randrange(N_LIVROS):03d}"
+
+    dia = INICIO
+    for _ in range(N_OPERACOES):
+        dia += timedelta(days=aleatorio.randrange(2))
+        sorteio = aleatorio.random()
+        if sorteio < 0.35:
+            # Inclui ids e ISBNs inexistentes
+            par = f"u{aleatorio.randrange(N_USUARIOS + 1):02d}", f"{aleatorio.randrange(N_LIVROS + 1):03d}"
+            pedidos.append(par)
+            operacoes.append(('emprestar_livro', (*par, dia)))
+        elif sorteio < 0.6:
+            operacoes.append(('devolver_livro', par_de_devolucao()))
+        elif sorteio < 0.8:
+            pares = [(f"u{aleatorio.randrange(N_USUARIOS):02d}", f"{aleatorio.randrange(N_LIVROS):03d}")
+                     for _ in range(aleatorio.randint(1, 3))]
+            pedidos.extend(pares)
+            operacoes.append(('emprestar_lote', (pares, dia)))
+        else:
+            pares = [par_de_devolucao() for _ in range(aleatorio.randint(1, 3))]
+            operacoes.append(('devolver_lote', (pares,)))
+        if aleatorio.random() < 0.03:
+            operacoes.append(('processar_atrasos', (dia,)))
+    return operacoes
+
+
+def _consultas(bib):
+    return (
+        sorted(map(_livro, bib.gerar_relatorio_livros_disponiveis())),
+        sorted(map(_livro, bib.gerar_relatorio_livros_emprestados())),
+        [_livro(livro) for livro in bib.gerar_relatorio_livros_disponiveis(limite=7, apos="010")],
+        list(map(_livro, bib.cursor_livros_emprestados())),
+        [usuario.id_usuario for usuario in bib.cursor_usuarios()],
+        bib.contar_livros_disponiveis(),
+        bib.contar_livros_emprestados(),
+        bib.contar_usuarios(),
+        bib.contar_emprestimos_ativos(),
+        list(map(_emprestimo, bib.cursor_emprestimos_ativos())),
+        list(map(_emprestimo, bib.gerar_relatorio_emprestimos_ativos(limite=5, apos=("u03", "000")))),
+        sorted(map(_emprestimo, bib.emprestimos_do_usuario("u01"))),
+        sorted(map(_emprestimo, bib.emprestimos_do_livro("001"))),
+        sorted(map(_emprestimo, bib.emprestimos_entre(INICIO + timedelta(days=30), INICIO + timedelta(days=90)))),
+        sorted(map(_emprestimo, bib.emprestimos_vencidos(INICIO + timedelta(days=200)))),
+        sorted(_livro(livro) for livro in bib.buscar_livros('titulo', 'memorias')),
+        sorted(_livro(livro) for livro in bib.buscar_livros('autor', 'autor 3')),
+        sorted(_livro(livro) for livro in bib.buscar_livros_por_periodo(1992, 1994)),
+        bib.multas,
+        bib.ultimo_processamento,
+    )
+
+
+@pytest.fixture
+def particionada():
+    with BibliotecaParticionada(3) as bib:
+        yield bib
+
+
+@pytest.mark.parametrize('semente', [1, 2, 3])
+def test_motores_equivalentes(semente, particionada):
+    motores = [Biblioteca(), BibliotecaConcorrente(), BibliotecaSQLite(), particionada]
+    for operacao in _operacoes(semente):
+        referencia, *outros = (_executar(bib, operacao) for bib in motores)
+        for resultado in outros:
+            assert resultado == referencia, operacao
+    referencia, *outros = map(_consultas, motores)
+    for consultas in outros:
+        assert consultas == referencia
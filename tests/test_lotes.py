@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+"""
+Testes dos empréstimos e devoluções em lote: resultado por par e rollback tudo-ou-nada.
+"""
+
+from datetime import date
+
+import pytest
+
+from aulas_faculdade.biblioteca import (
+    Biblioteca,
+    DevolucaoInvalidaError,
+    EmprestimoDuplicadoError,
+    LivroIndisponivelError,
+    LivroNaoEncontradoError,
+    UsuarioNaoEncontradoError,
+    projeto,
+)
+from aulas_faculdade.biblioteca.armazenamento_sqlite import BibliotecaSQLite
+from aulas_faculdade.biblioteca.persistencia import BibliotecaPersistente
+
+
+class FalhaInjetada(Exception):
+    pass
+
+
+def _preparar(bib):
+    for i in range(6):
+        bib.cadastrar_livro(f"Livro {i}", "Autor", 2000, str(i), 1 + i % 2)
+    for i in range(4):
+        bib.cadastrar_usuario(f"Usuário {i}", f"u{i}", "contato")
+    bib.emprestar_livro("u0", "1", date(2026, 1, 1))
+    bib.emprestar_livro("u1", "3", date(2026, 1, 2))
+    return bib
+
+
+def _estado(bib):
+    registro = bib.emprestimos
+    return (
+        sorted((livro.isbn, livro.copias_disponiveis) for livro in bib.catalogo.values()),
+        sorted((usuario.id_usuario, sorted(usuario.emprestimos_ativos.items())) for usuario in bib.usuarios.values()),
+        sorted(registro.ativos.items()),
+        sorted(registro.vencimentos.items()),
+        sorted((isbn, sorted(por_usuario.items())) for isbn, por_usuario in registro.por_isbn.items()),
+        [livro.isbn for livro in bib.gerar_relatorio_livros_disponiveis()],
+        [livro.isbn for livro in bib.gerar_relatorio_livros_emprestados()],
+        _chaves(bib.emprestimos_entre(date(2026, 1, 1), date(2026, 12, 31))),
+        _chaves(bib.emprestimos_vencidos(date(2026, 12, 31))),
+    )
+
+
+def _chaves(emprestimos):
+    return [(usuario.id_usuario, livro.isbn, data) for usuario, livro, data in emprestimos]
+
+
+def _tipos(resultado):
+    return [None if erro is None else type(erro) for erro in resultado.erros]
+
+
+def test_lote_invalido_nao_altera_nada():
+    bib = _preparar(Biblioteca())
+    antes = _estado(bib)
+    resultado = bib.emprestar_lote([("u2", "0"), ("u3", "0"), ("u0", "1"), ("x", "2"), ("u2", "x"), ("u2", "2")],
+                                   date(2026, 2, 1))
+    assert not resultado.aplicado
+    assert _tipos(resultado) == [None, LivroIndisponivelError, EmprestimoDuplicadoError,
+                                 UsuarioNaoEncontradoError, LivroNaoEncontradoError, None]
+    assert _estado(bib) == antes
+
+    resultado = bib.devolver_lote([("u0", "1"), ("u0", "1"), ("u2", "3")])
+    assert not resultado.aplicado
+    assert _tipos(resultado) == [None, DevolucaoInvalidaError, DevolucaoInvalidaError]
+    assert _estado(bib) == antes
+
+
+def test_falha_no_registro_central_desfaz_emprestimo(monkeypatch):
+    bib = _preparar(Biblioteca())
+    antes = _estado(bib)
+
+    def registrar_e_falhar(registro, pares, data_emprestimo, data_vencimento=None):
+        registro.registrar(*pares[0], data_emprestimo, data_vencimento)
+        raise FalhaInjetada
+
+    monkeypatch.setattr(projeto.RegistroEmprestimos, 'registrar_lote', registrar_e_falhar)
+    with pytest.raises(FalhaInjetada):
+        bib.emprestar_lote([("u2", "0"), ("u2", "1"), ("u3", "5")], date(2026, 2, 1))
+    assert _estado(bib) == antes
+
+
+def test_falha_no_registro_central_desfaz_devolucao(monkeypatch):
+    bib = _preparar(Biblioteca())
+    antes = _estado(bib)
+
+    def remover_e_falhar(registro, pares):
+        registro.remover(*pares[0])
+        raise FalhaInjetada
+
+    monkeypatch.setattr(projeto.RegistroEmprestimos, 'remover_lote', remover_e_falhar)
+    with pytest.raises(FalhaInjetada):
+        bib.devolver_lote([("u0", "1"), ("u1", "3")])
+    assert _estado(bib) == antes
+
+
+def test_sqlite_lote_invalido_nao_altera_nada():
+    bib = _preparar(BibliotecaSQLite())
+
+    def estado():
+        return ([(livro.isbn, livro.copias_disponiveis) for livro in bib.gerar_relatorio_livros_disponiveis()],
+                _chaves(bib.iterar_emprestimos_ativos()))
+
+    antes = estado()
+    resultado = bib.emprestar_lote([("u2", "0"), ("u3", "0")], date(2026, 2, 1))
+    assert _tipos(resultado) == [None, LivroIndisponivelError]
+    assert estado() == antes
+    resultado = bib.devolver_lote([("u0", "1"), ("u2", "3")])
+    assert _tipos(resultado) == [None, DevolucaoInvalidaError]
+    assert estado() == antes
+
+
+def test_persistente_recupera_so_os_lotes_aplicados(tmp_path):
+    with BibliotecaPersistente(tmp_path) as bib:
+        _preparar(bib)
+        assert not bib.emprestar_lote([("u2", "0"), ("u3", "0")], date(2026, 2, 1)).aplicado
+        assert bib.emprestar_lote([("u2", "0"), ("u3", "5")], date(2026, 2, 1)).aplicado
+        assert bib.devolver_lote([("u0", "1"), ("u2", "0")]).aplicado
+        esperado = _estado(bib)
+    with BibliotecaPersistente(tmp_path) as bib:
+        assert _estado(bib) == esperado
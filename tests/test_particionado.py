@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+"""
+Testes da BibliotecaParticionada: importação e lotes tudo-ou-nada entre partições.
+"""
+
+from datetime import date
+
+import pytest
+
+from aulas_faculdade.biblioteca import Biblioteca
+from aulas_faculdade.biblioteca.particionado import BibliotecaParticionada
+
+
+def _quebrar_aplicacao(particao, indice, n_particoes):
+    def falhar(*argumentos):
+        raise RuntimeError("falha ao aplicar")
+    if indice == 1:
+        particao.aplicar_lote = falhar
+
+
+def _estado(bib):
+    return (sorted((livro.isbn, livro.copias_disponiveis) for livro in bib.gerar_relatorio_livros_disponiveis()),
+            sorted((usuario.id_usuario, livro.isbn, data) for usuario, livro, data in bib.iterar_emprestimos_ativos()))
+
+
+@pytest.fixture
+def arquivos(tmp_path):
+    livros = tmp_path / 'livros.csv'
+    linhas = ["titulo,autor,ano,isbn,total_copias"]
+    linhas += [f"Livro {i},Autor,{1990 + i % 5}, {i % 12} ,{i % 3}" for i in range(16)]
+    linhas += ["Sem cópias,Autor,2000,x,-1", "curta"]
+    livros.write_text("\n".join(linhas) + "\n", encoding='utf-8')
+    usuarios = tmp_path / 'usuarios.jsonl'
+    usuarios.write_text("".join(f'{{"nome": "N{i}", "id_usuario": "u{i % 5}", "contato": "c"}}\n' for i in range(7))
+                        + '{"nome": "sem id"}\n', encoding='utf-8')
+    return livros, usuarios
+
+
+@pytest.fixture
+def particionada():
+    with BibliotecaParticionada(3) as bib:
+        yield bib
+
+
+def test_importacao_igual_a_biblioteca(arquivos, particionada):
+    livros, usuarios = arquivos
+    referencia = Biblioteca()
+    for metodo, caminho in (('importar_livros', livros), ('importar_usuarios', usuarios)):
+        esperado = getattr(referencia, metodo)(caminho, tamanho_lote=5)
+        obtido = getattr(particionada, metodo)(caminho, tamanho_lote=5)
+        assert (obtido.lidos, obtido.importados, obtido.erros) == (esperado.lidos, esperado.importados, esperado.erros)
+    assert _estado(particionada) == _estado(referencia)
+    assert particionada.contar_usuarios() == len(referencia.usuarios)
+
+
+def test_lote_com_erro_nao_altera_nenhuma_particao(arquivos, particionada):
+    livros, usuarios = arquivos
+    particionada.importar_livros(livros)
+    particionada.importar_usuarios(usuarios)
+    antes = _estado(particionada)
+    resultado = particionada.emprestar_lote([("u0", "1"), ("u1", "2"), ("u2", "0"), ("nada", "4")], date(2026, 1, 1))
+    assert not resultado.aplicado
+    assert [type(erro).__name__ if erro else None for erro in resultado.erros] == \
+        [None, None, 'LivroIndisponivelError', 'UsuarioNaoEncontradoError']
+    assert _estado(particionada) == antes
+
+
+def test_falha_ao_aplicar_desfaz_as_outras_particoes(arquivos, particionada):
+    livros, usuarios = arquivos
+    particionada.importar_livros(livros)
+    particionada.importar_usuarios(usuarios)
+    pares = [("u0", isbn) for isbn in ("1", "2", "4", "5", "7", "8")]
+    assert len({particionada.particao(isbn) for _, isbn in pares}) == 3
+    assert particionada.emprestar_lote(pares[:3], date(2026, 1, 1)).aplicado
+    antes = _estado(particionada)
+
+    particionada.em_todas(_quebrar_aplicacao)
+    with pytest.raises(RuntimeError):
+        particionada.emprestar_lote(pares[3:], date(2026, 1, 2))
+    assert _estado(particionada) == antes
+    with pytest.raises(RuntimeError):
+        particionada.devolver_lote(pares[:3])
+    assert _estado(particionada) == antes
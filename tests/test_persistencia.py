@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""
+Testes da recuperação da BibliotecaPersistente (log + snapshot).
+"""
+
+from datetime import date
+
+import pytest
+
+from aulas_faculdade.biblioteca import Biblioteca
+from aulas_faculdade.biblioteca.persistencia import BibliotecaPersistente
+
+
+def _operar(bib):
+    """
+    24 operações registradas no log, de todos os tipos.
+    """
+    for i in range(12):
+        bib.cadastrar_livro(f"Livro {i}", "Autor", 1990 + i % 4, f"{i:03d}", 2)
+    for i in range(5):
+        bib.cadastrar_usuario(f"Usuário {i}", f"u{i}", "contato")
+    bib.emprestar_livro("u0", "000", date(2026, 1, 1))
+    bib.emprestar_livro("u1", "000", date(2026, 1, 2))
+    bib.emprestar_lote([("u2", "001"), ("u2", "002"), ("u3", "001")], date(2026, 1, 3))
+    bib.devolver_livro("u1", "000")
+    bib.processar_atrasos(date(2026, 2, 1))
+    bib.devolver_lote([("u2", "002")])
+    bib.emprestar_livro("u4", "005", date(2026, 2, 2))
+
+
+def _estado(bib):
+    return (
+        sorted((livro.isbn, livro.titulo, livro.ano, livro.total_copias, livro.copias_disponiveis)
+               for livro in bib.catalogo.values()),
+        sorted((usuario.id_usuario, usuario.nome, sorted(usuario.emprestimos_ativos.items()))
+               for usuario in bib.usuarios.values()),
+        sorted((usuario.id_usuario, livro.isbn, data, bib.data_vencimento(usuario.id_usuario, livro.isbn))
+               for usuario, livro, data in bib.iterar_emprestimos_ativos()),
+        bib.multas,
+        bib.ultimo_processamento,
+        [livro.isbn for livro in bib.gerar_relatorio_livros_disponiveis()],
+        [livro.isbn for livro in bib.buscar_livros_por_periodo(1990, 1991)],
+        [livro.isbn for livro in bib.buscar_livros('titulo', 'livro 1')],
+    )
+
+
+@pytest.mark.parametrize('snapshot_mapeado', [False, True])
+def test_recuperacao_com_snapshot_e_cauda_do_log(tmp_path, snapshot_mapeado):
+    referencia = Biblioteca()
+    _operar(referencia)
+    with BibliotecaPersistente(tmp_path, intervalo_snapshot=10, snapshot_mapeado=snapshot_mapeado) as bib:
+        _operar(bib)
+
+    snapshot = BibliotecaPersistente.NOME_SNAPSHOT_MAPEADO if snapshot_mapeado else BibliotecaPersistente.NOME_SNAPSHOT
+    assert (tmp_path / snapshot).exists()
+    # Os snapshots saem a cada 10 registros: os 4 últimos são reexecutados do log
+    assert (tmp_path / BibliotecaPersistente.NOME_LOG).stat().st_size > 0
+
+    with BibliotecaPersistente(tmp_path, intervalo_snapshot=10, snapshot_mapeado=snapshot_mapeado) as bib:
+        assert bib.lsn == 24
+        assert _estado(bib) == _estado(referencia)
+        bib.devolver_livro("u4", "005")
+        referencia.devolver_livro("u4", "005")
+    with BibliotecaPersistente(tmp_path, snapshot_mapeado=snapshot_mapeado) as bib:
+        assert _estado(bib) == _estado(referencia)
+
+
+@pytest.mark.parametrize('snapshot_mapeado', [False, True])
+def test_cauda_rasgada_e_descartada(tmp_path, snapshot_mapeado):
+    referencia = Biblioteca()
+    _operar(referencia)
+    with BibliotecaPersistente(tmp_path, intervalo_snapshot=10, snapshot_mapeado=snapshot_mapeado) as bib:
+        _operar(bib)
+    log = tmp_path / BibliotecaPersistente.NOME_LOG
+    tamanho = log.stat().st_size
+    with open(log, 'ab') as arquivo:
+        arquivo.write(b"\x40\x00\x00\x00registro interrompido")
+
+    with BibliotecaPersistente(tmp_path, intervalo_snapshot=10, snapshot_mapeado=snapshot_mapeado) as bib:
+        assert log.stat().st_size == tamanho
+        assert _estado(bib) == _estado(referencia)
+
+
+@pytest.mark.parametrize('snapshot_mapeado', [False, True])
+def test_importacao_atravessando_snapshot(tmp_path, snapshot_mapeado):
+    arquivo = tmp_path / 'livros.csv'
+    linhas = ["titulo,autor,ano,isbn,total_copias"]
+    linhas += [f"Livro {i},Autor,2000,{i},2" for i in range(10)]
+    arquivo.write_text("\n".join(linhas) + "\n", encoding='utf-8')
+    diretorio = tmp_path / 'dados'
+
+    with BibliotecaPersistente(diretorio, intervalo_snapshot=4, snapshot_mapeado=snapshot_mapeado) as bib:
+        relatorio = bib.importar_livros(arquivo, tamanho_lote=6)
+        bib.cadastrar_usuario("Ana", "u1", "ana@x")
+    assert relatorio.lidos == 10 and not relatorio.erros
+
+    with BibliotecaPersistente(diretorio, intervalo_snapshot=4, snapshot_mapeado=snapshot_mapeado) as bib:
+        assert sorted(bib.catalogo) == [str(i) for i in range(10)]
+        assert list(bib.usuarios) == ["u1"]
+        bib.emprestar_livro("u1", "7")
+        assert bib.catalogo["7"].copias_disponiveis == 1